@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Pool of the connections to the servers, one per host and port.
+"""
+
+import time
+
+from .qt import QtCore
+from .websocket_client import WebSocketClient
+
+import logging
+log = logging.getLogger(__name__)
+
+# seconds an unused connection is kept open
+# in case the same server is used again
+IDLE_TIMEOUT = 30
+
+
+class ConnectionPool(QtCore.QObject):
+    """
+    Shares the connections to the servers: whoever needs a server
+    gets the same WebSocketClient instance for the same host and port.
+
+    A connection no longer used is kept open for a while, a server
+    removed and added back (e.g. when editing the preferences) keeps
+    its session, pending requests and cached version.
+
+    :param idle_timeout: seconds an unused connection is kept open
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT):
+
+        super(ConnectionPool, self).__init__()
+        self._idle_timeout = idle_timeout
+        self._connections = {}
+        self._references = {}
+        # release time of the connections no longer used
+        self._idle = {}
+
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setInterval(5000)
+        self._idle_timer.timeout.connect(self._closeIdleSlot)
+
+    @staticmethod
+    def key(host, port):
+        """
+        Returns the key of a server in the pool.
+
+        :param host: host or address of the server
+        :param port: port of the server (integer)
+
+        :returns: "host:port" string
+        """
+
+        return "{host}:{port}".format(host=host, port=port)
+
+    def get(self, host, port):
+        """
+        Returns the connection to a server if there is one.
+
+        :param host: host or address of the server
+        :param port: port of the server (integer)
+
+        :returns: WebSocketClient instance or None
+        """
+
+        return self._connections.get(self.key(host, port))
+
+    def acquire(self, host, port):
+        """
+        Returns the connection to a server, created if needed.
+        Each call must be matched by a call to release().
+
+        :param host: host or address of the server
+        :param port: port of the server (integer)
+
+        :returns: WebSocketClient instance
+        """
+
+        key = self.key(host, port)
+        server = self._connections.get(key)
+        if server is None:
+            server = WebSocketClient("ws://{}".format(key))
+            self._connections[key] = server
+            self._references[key] = 0
+            log.debug("new connection {} in the pool".format(key))
+        elif key in self._idle:
+            del self._idle[key]
+            log.debug("reusing idle connection {}".format(key))
+        self._references[key] += 1
+        return server
+
+    def release(self, server):
+        """
+        Releases a connection returned by acquire().
+
+        :param server: WebSocketClient instance
+
+        :returns: True if the connection is no longer used
+        """
+
+        key = self.key(server.host, server.port)
+        if self._connections.get(key) is not server:
+            return True
+
+        self._references[key] -= 1
+        if self._references[key] > 0:
+            return False
+
+        if server.connected() or server.isConnecting():
+            self._idle[key] = time.time()
+            if not self._idle_timer.isActive():
+                self._idle_timer.start()
+        else:
+            self._remove(key)
+        return True
+
+    def connections(self):
+        """
+        Returns all the connections, used or idle.
+
+        :returns: list of WebSocketClient instances
+        """
+
+        return list(self._connections.values())
+
+    def references(self, server):
+        """
+        Returns the number of users of a connection.
+
+        :param server: WebSocketClient instance
+
+        :returns: integer
+        """
+
+        return self._references.get(self.key(server.host, server.port), 0)
+
+    def _remove(self, key):
+        """
+        Closes and forgets a connection.
+
+        :param key: "host:port" string
+        """
+
+        server = self._connections.pop(key)
+        del self._references[key]
+        self._idle.pop(key, None)
+        if server.connected():
+            server.close_connection()
+        log.debug("connection {} removed from the pool".format(key))
+
+    def _closeIdleSlot(self):
+        """
+        Slot called regularly to close the connections unused for too long.
+        """
+
+        now = time.time()
+        for key, released in list(self._idle.items()):
+            if now - released >= self._idle_timeout:
+                log.info("closing unused connection {}".format(key))
+                self._remove(key)
+        if not self._idle:
+            self._idle_timer.stop()
@@ -19,7 +19,7 @@
 Dialog to change the topology symbol of NodeItems
 """
 
-from ..qt import QtSvg, QtCore, QtGui
+from ..qt import QtCore, QtGui
 from ..ui.symbol_selection_dialog_ui import Ui_SymbolSelectionDialog
 
 
@@ -59,15 +59,9 @@ class SymbolSelectionDialog(QtGui.QDialog, Ui_SymbolSelectionDialog):
         current = self.uiSymbolListWidget.currentItem()
         if current:
             name = current.text()
-            path = ":/symbols/{}.normal.svg".format(name)
-            default_renderer = QtSvg.QSvgRenderer(path)
-            default_renderer.setObjectName(path)
-            path = ":/symbols/{}.selected.svg".format(name)
-            hover_renderer = QtSvg.QSvgRenderer(path)
-            hover_renderer.setObjectName(path)
             for item in self._items:
-                item.setDefaultRenderer(default_renderer)
-                item.setHoverRenderer(hover_renderer)
+                item.setDefaultSymbol(":/symbols/{}.normal.svg".format(name))
+                item.setHoverSymbol(":/symbols/{}.selected.svg".format(name))
 
     def getSymbols(self):
 
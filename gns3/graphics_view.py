@@ -51,6 +51,7 @@ from .items.shape_item import ShapeItem
 from .items.rectangle_item import RectangleItem
 from .items.ellipse_item import EllipseItem
 from .items.image_item import ImageItem
+from .items.level_of_detail import setThresholds
 
 
 class GraphicsView(QtGui.QGraphicsView):
@@ -79,6 +80,13 @@ class GraphicsView(QtGui.QGraphicsView):
         self._last_mouse_position = None
         self._topology = Topology.instance()
 
+        # geometry of the selected items when the mouse button was pressed,
+        # to record the moved or resized items to the journal
+        self._pressed_items = {}
+
+        # node items on the scene indexed by node identifier
+        self._node_items = {}
+
         # set the scene
         scene = QtGui.QGraphicsScene(parent=self)
         width = self._settings["scene_width"]
@@ -119,7 +127,50 @@ class GraphicsView(QtGui.QGraphicsView):
         self._main_window.uiTopologySummaryTreeWidget.clear()
 
         # clear all objects on the scene
+        for node_item in self._node_items.values():
+            node_item.releaseSymbols()
         self.scene().clear()
+        self._node_items.clear()
+
+    def registerNodeItem(self, node_item):
+        """
+        Registers a node item added to the scene.
+
+        :param node_item: NodeItem instance
+        """
+
+        self._node_items[node_item.node().id()] = node_item
+
+    def unregisterNodeItem(self, node_item):
+        """
+        Unregisters a node item removed from the scene.
+
+        :param node_item: NodeItem instance
+        """
+
+        node_id = node_item.node().id()
+        if self._node_items.get(node_id) is node_item:
+            del self._node_items[node_id]
+
+    def nodeItem(self, node_id):
+        """
+        Lookups for a node item on the scene using its node identifier.
+
+        :param node_id: node identifier
+
+        :returns: NodeItem instance or None
+        """
+
+        return self._node_items.get(node_id)
+
+    def nodeItems(self):
+        """
+        Returns all the node items on the scene.
+
+        :returns: list of NodeItem instances
+        """
+
+        return list(self._node_items.values())
 
     def updateProjectFilesDir(self, path):
         """
@@ -160,6 +211,7 @@ class GraphicsView(QtGui.QGraphicsView):
         for name, value in GRAPHICS_VIEW_SETTINGS.items():
             self._settings[name] = settings.value(name, value, type=GRAPHICS_VIEW_SETTING_TYPES[name])
         settings.endGroup()
+        setThresholds(self._settings["lod_pixmap_threshold"], self._settings["lod_shape_threshold"])
 
     def settings(self):
         """
@@ -179,6 +231,7 @@ class GraphicsView(QtGui.QGraphicsView):
 
         # save the settings
         self._settings.update(new_settings)
+        setThresholds(self._settings["lod_pixmap_threshold"], self._settings["lod_shape_threshold"])
         settings = QtCore.QSettings()
         settings.beginGroup(self.__class__.__name__)
         for name, value in self._settings.items():
@@ -268,6 +321,8 @@ class GraphicsView(QtGui.QGraphicsView):
         :param source_port: source Port instance
         :param destination_node: destination Node instance
         :param destination_port: destination Port instance
+
+        :returns: Link instance
         """
 
         link = Link(source_node, source_port, destination_node, destination_port)
@@ -277,6 +332,7 @@ class GraphicsView(QtGui.QGraphicsView):
         link.add_link_signal.connect(self.addLinkSlot)
         link.delete_link_signal.connect(self.deleteLinkSlot)
         self._topology.addLink(link)
+        return link
 
     def addLinkSlot(self, link_id):
         """
@@ -287,20 +343,12 @@ class GraphicsView(QtGui.QGraphicsView):
         """
 
         link = self._topology.getLink(link_id)
-        source_item = None
-        destination_item = None
         source_port = link.sourcePort()
         destination_port = link.destinationPort()
 
         # find the correct source and destination node items
-        for item in self.scene().items():
-            if isinstance(item, NodeItem):
-                if item.node().id() == link.sourceNode().id():
-                    source_item = item
-                if item.node().id() == link.destinationNode().id():
-                    destination_item = item
-            if source_item and destination_item:
-                break
+        source_item = self.nodeItem(link.sourceNode().id())
+        destination_item = self.nodeItem(link.destinationNode().id())
 
         if not source_item or not destination_item:
             print("Could not find a source or destination item for the link!")
@@ -506,6 +554,7 @@ class GraphicsView(QtGui.QGraphicsView):
             self._adding_ellipse = False
         else:
             QtGui.QGraphicsView.mousePressEvent(self, event)
+            self._pressed_items = {it: self._itemGeometry(it) for it in self.scene().selectedItems()}
 
     def mouseReleaseEvent(self, event):
         """
@@ -524,6 +573,25 @@ class GraphicsView(QtGui.QGraphicsView):
             if item is not None and not event.modifiers() & QtCore.Qt.ControlModifier:
                 item.setSelected(True)
             QtGui.QGraphicsView.mouseReleaseEvent(self, event)
+            for pressed_item, geometry in self._pressed_items.items():
+                if pressed_item.scene() and self._itemGeometry(pressed_item) != geometry:
+                    self._topology.recordItem(pressed_item)
+        self._pressed_items = {}
+
+    @staticmethod
+    def _itemGeometry(item):
+        """
+        Returns the position and size of an item,
+        to know if it has been moved or resized.
+
+        :param item: QGraphicsItem instance
+
+        :returns: tuple
+        """
+
+        if isinstance(item, ShapeItem):
+            return item.pos(), item.rect()
+        return item.pos(), None
 
     def wheelEvent(self, event):
         """
@@ -1019,6 +1087,8 @@ class GraphicsView(QtGui.QGraphicsView):
             style_dialog = StyleEditorDialog(self._main_window, items)
             style_dialog.show()
             style_dialog.exec_()
+            for item in items:
+                self._topology.recordItem(item)
 
     def textEditActionSlot(self):
         """
@@ -1034,6 +1104,8 @@ class GraphicsView(QtGui.QGraphicsView):
             text_edit_dialog = TextEditorDialog(self._main_window, items)
             text_edit_dialog.show()
             text_edit_dialog.exec_()
+            for item in items:
+                self._topology.recordItem(item)
 
     def raiseLayerActionSlot(self):
         """
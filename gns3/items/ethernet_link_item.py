@@ -105,7 +105,8 @@ class EthernetLinkItem(LinkItem):
         :param widget: QWidget instance.
         """
 
-        QtGui.QGraphicsPathItem.paint(self, painter, option, widget)
+        if not self.paintSimplified(painter, option, widget):
+            return
         if not self._adding_flag and self._settings["draw_link_status_points"]:
 
             # points disappears if nodes are too close to each others.
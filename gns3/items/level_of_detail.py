@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Level of detail of the items, from the scale they are drawn at:
+the more the view is zoomed out, the simpler the items are drawn.
+"""
+
+# levels of detail
+LOD_SHAPE = 0  # simple shapes: plain rectangles for nodes, thin lines for links
+LOD_PIXMAP = 1  # node symbols from cached pixmaps, no labels and no link status points
+LOD_FULL = 2
+
+# scales of the view below which the items are drawn as pixmaps, as shapes
+# (set from the graphics view settings)
+_thresholds = {"pixmap": 0.5, "shape": 0.2}
+
+
+def setThresholds(pixmap_threshold, shape_threshold):
+    """
+    Sets the scales of the view below which the items are simplified.
+
+    :param pixmap_threshold: scale below which LOD_PIXMAP is used (float)
+    :param shape_threshold: scale below which LOD_SHAPE is used (float)
+    """
+
+    _thresholds["pixmap"] = pixmap_threshold
+    _thresholds["shape"] = shape_threshold
+
+
+def levelOfDetail(painter, option):
+    """
+    Returns how detailed an item must be painted.
+
+    :param painter: QPainter instance
+    :param option: QStyleOptionGraphicsItem instance
+
+    :returns: LOD_SHAPE, LOD_PIXMAP or LOD_FULL
+    """
+
+    scale = option.levelOfDetailFromTransform(painter.worldTransform())
+    if scale < _thresholds["shape"]:
+        return LOD_SHAPE
+    if scale < _thresholds["pixmap"]:
+        return LOD_PIXMAP
+    return LOD_FULL
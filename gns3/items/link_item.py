@@ -24,6 +24,7 @@ import math
 import struct
 import sys
 from ..qt import QtCore, QtGui
+from .level_of_detail import levelOfDetail, LOD_SHAPE, LOD_FULL
 
 
 class LinkItem(QtGui.QGraphicsPathItem):
@@ -405,6 +406,28 @@ class LinkItem(QtGui.QGraphicsPathItem):
             self.source = QtCore.QPointF(self.source + offset)
             self.destination = QtCore.QPointF(self.destination + offset)
 
+    def paintSimplified(self, painter, option, widget):
+        """
+        Paints the link according to the level of detail.
+
+        :param painter: QPainter instance
+        :param option: QStyleOptionGraphicsItem instance
+        :param widget: QWidget instance
+
+        :returns: True if the details (status points, port labels) must be painted too
+        """
+
+        detail = levelOfDetail(painter, option)
+        if detail == LOD_SHAPE:
+            # a thin straight line, whatever the link type
+            painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+            painter.setPen(QtGui.QPen(self.pen().color(), 0))
+            painter.drawLine(self.source, self.destination)
+            return False
+
+        QtGui.QGraphicsPathItem.paint(self, painter, option, widget)
+        return detail == LOD_FULL
+
     def setMousePoint(self, scene_point):
         """
         Sets new mouse point coordinates.
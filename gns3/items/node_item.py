@@ -19,8 +19,12 @@
 Graphical representation of a node on the QGraphicsScene.
 """
 
+import math
+
 from ..qt import QtCore, QtGui, QtSvg
+from ..utils.svg_renderer_cache import SvgRendererCache
 from .note_item import NoteItem
+from .level_of_detail import levelOfDetail, LOD_SHAPE, LOD_PIXMAP
 
 
 class NodeItem(QtSvg.QGraphicsSvgItem):
@@ -55,19 +59,13 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         self.setAcceptsHoverEvents(True)
         self.setZValue(1)
 
-        # create renderers using symbols paths/resources
-        if default_symbol:
-            self._default_renderer = QtSvg.QSvgRenderer(default_symbol)
-            if default_symbol != node.defaultSymbol():
-                self._default_renderer.setObjectName(default_symbol)
-        else:
-            self._default_renderer = QtSvg.QSvgRenderer(node.defaultSymbol())
-        if hover_symbol:
-            self._hover_renderer = QtSvg.QSvgRenderer(hover_symbol)
-            if hover_symbol != node.hoverSymbol():
-                self._hover_renderer.setObjectName(hover_symbol)
-        else:
-            self._hover_renderer = QtSvg.QSvgRenderer(node.hoverSymbol())
+        # renderers shared with the other node items using the same symbols
+        cache = SvgRendererCache.instance()
+        self._default_symbol = default_symbol or node.defaultSymbol()
+        self._hover_symbol = hover_symbol or node.hoverSymbol()
+        self._default_renderer = cache.acquire(self._default_symbol)
+        self._hover_renderer = cache.acquire(self._hover_symbol)
+        self._symbols_released = False
         self.setSharedRenderer(self._default_renderer)
 
         # connect signals to know about some events
@@ -102,15 +100,36 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
         return self._default_renderer
 
-    def setDefaultRenderer(self, default_renderer):
+    def defaultSymbol(self):
         """
-        Sets new default QSvgRenderer.
+        Returns the path to the default symbol.
 
-        :param default_renderer: QSvgRenderer instance
+        :return: path (file or resource)
         """
 
-        self._default_renderer = default_renderer
-        self.setSharedRenderer(self._default_renderer)
+        return self._default_symbol
+
+    def setDefaultSymbol(self, path):
+        """
+        Sets a new default symbol.
+
+        :param path: path to the symbol (file or resource)
+
+        :returns: True if the symbol is valid
+        """
+
+        cache = SvgRendererCache.instance()
+        renderer = cache.acquire(path)
+        if not renderer.isValid():
+            cache.release(path)
+            return False
+        if self.renderer() is self._default_renderer:
+            # the released renderer may be deleted while still drawn
+            self.setSharedRenderer(renderer)
+        cache.release(self._default_symbol)
+        self._default_symbol = path
+        self._default_renderer = renderer
+        return True
 
     def hoverRenderer(self):
         """
@@ -121,14 +140,48 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
         return self._hover_renderer
 
-    def setHoverRenderer(self, hover_renderer):
+    def hoverSymbol(self):
+        """
+        Returns the path to the hover symbol.
+
+        :return: path (file or resource)
+        """
+
+        return self._hover_symbol
+
+    def setHoverSymbol(self, path):
         """
-        Sets new hover QSvgRenderer.
+        Sets a new hover symbol.
 
-        :param hover_renderer: QSvgRenderer instance
+        :param path: path to the symbol (file or resource)
+
+        :returns: True if the symbol is valid
         """
 
-        self._hover_renderer = hover_renderer
+        cache = SvgRendererCache.instance()
+        renderer = cache.acquire(path)
+        if not renderer.isValid():
+            cache.release(path)
+            return False
+        if self.renderer() is self._hover_renderer:
+            # the released renderer may be deleted while still drawn
+            self.setSharedRenderer(renderer)
+        cache.release(self._hover_symbol)
+        self._hover_symbol = path
+        self._hover_renderer = renderer
+        return True
+
+    def releaseSymbols(self):
+        """
+        Gives the symbols back to the renderer cache
+        when this node item is removed for good.
+        """
+
+        if not self._symbols_released:
+            self._symbols_released = True
+            cache = SvgRendererCache.instance()
+            cache.release(self._default_symbol)
+            cache.release(self._hover_symbol)
 
     def setUnsavedState(self):
         """
@@ -248,8 +301,9 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
         """
 
         self._node.removeAllocatedName()
-        if self in self.scene().items():
+        if self.scene():
             self.scene().removeItem(self)
+        self.releaseSymbols()
         self.setUnsavedState()
 
     def serverErrorSlot(self, node_id, code, message):
@@ -399,6 +453,15 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
             else:
                 self.setSharedRenderer(self._default_renderer)
 
+        # keep the node item registry of the views up to date.
+        if change == QtSvg.QGraphicsSvgItem.ItemSceneChange:
+            if self.scene():
+                for view in self.scene().views():
+                    view.unregisterNodeItem(self)
+            if value:
+                for view in value.views():
+                    view.registerNodeItem(self)
+
         # adjust link item positions when this node is moving or has changed.
         if change == QtSvg.QGraphicsSvgItem.ItemPositionChange or change == QtSvg.QGraphicsSvgItem.ItemPositionHasChanged:
             self.setUnsavedState()
@@ -418,6 +481,20 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
 
         # don't show the selection rectangle
         option.state = QtGui.QStyle.State_None
+
+        detail = levelOfDetail(painter, option)
+        if detail == LOD_SHAPE:
+            # too small to recognize the symbol
+            painter.fillRect(self.boundingRect(), QtCore.Qt.darkGray if self._initialized else QtCore.Qt.red)
+            return
+
+        if detail == LOD_PIXMAP:
+            self._paintPixmap(painter, option)
+            if not self._initialized:
+                brect = self.boundingRect()
+                painter.fillRect(QtCore.QRectF((brect.width() / 2.0) - 10, (brect.height() / 2.0) - 10, 20, 20), QtCore.Qt.red)
+            return
+
         QtSvg.QGraphicsSvgItem.paint(self, painter, option, widget)
 
         if not self._initialized or self.show_layer:
@@ -435,6 +512,28 @@ class NodeItem(QtSvg.QGraphicsSvgItem):
                 text = "S"  # initialization
             painter.drawText(QtCore.QPointF(center.x() - 4, center.y() + 4), text)
 
+    def _paintPixmap(self, painter, option):
+        """
+        Paints the symbol from a pixmap rasterized at about the
+        current scale, shared by the node items with the same symbol.
+
+        :param painter: QPainter instance
+        :param option: QStyleOptionGraphicsItem instance
+        """
+
+        if self.renderer() is self._hover_renderer:
+            symbol = self._hover_symbol
+        else:
+            symbol = self._default_symbol
+
+        # one pixmap per eighth of scale, not one per zoom step
+        scale = math.ceil(option.levelOfDetailFromTransform(painter.worldTransform()) * 8) / 8
+        brect = self.boundingRect()
+        size = QtCore.QSize(max(1, math.ceil(brect.width() * scale)), max(1, math.ceil(brect.height() * scale)))
+        pixmap = SvgRendererCache.instance().pixmap(symbol, size)
+        if pixmap is not None:
+            painter.drawPixmap(brect, pixmap, QtCore.QRectF(pixmap.rect()))
+
     def setZValue(self, value):
         """
         Sets a new Z value.
@@ -20,6 +20,7 @@ Graphical representation of a note on the QGraphicsScene.
 """
 
 from ..qt import QtCore, QtGui
+from .level_of_detail import levelOfDetail, LOD_FULL
 
 
 class NoteItem(QtGui.QGraphicsTextItem):
@@ -141,6 +142,8 @@ class NoteItem(QtGui.QGraphicsTextItem):
             # delete the note if empty
             self.delete()
             return
+        from ..topology import Topology
+        Topology.instance().recordItem(self)
         return QtGui.QGraphicsTextItem.focusOutEvent(self, event)
 
     def paint(self, painter, option, widget=None):
@@ -152,6 +155,10 @@ class NoteItem(QtGui.QGraphicsTextItem):
         :param widget: QWidget instance
         """
 
+        if self.parentItem() and levelOfDetail(painter, option) != LOD_FULL:
+            # node and port labels cannot be read at this scale
+            return
+
         QtGui.QGraphicsTextItem.paint(self, painter, option, widget)
 
         if self.show_layer is False or self.parentItem():
@@ -21,23 +21,33 @@ http://www.jsonrpc.org/specification
 """
 
 import json
-import uuid
+import itertools
+
+# request IDs used when none is given,
+# connections use their own sequence (see WebSocketClient)
+_request_ids = itertools.count(1)
 
 
 class JSONRPCObject(object):
     """
     Base object for JSON-RPC requests, responses,
     notifications and errors.
+
+    The message members are the fields listed by each class,
+    messages are built without introspection.
     """
 
-    def __init__(self):
-        return JSONRPCEncoder().default(self)
+    __slots__ = ()
+    _fields = ()
 
     def __str__(self, *args, **kwargs):
-        return json.dumps(self, cls=JSONRPCEncoder)
+        return json.dumps(self())
 
     def __call__(self):
-        return JSONRPCEncoder().default(self)
+        message = {"jsonrpc": 2.0}
+        for field in self._fields:
+            message[field] = getattr(self, field)
+        return message
 
 
 class JSONRPCEncoder(json.JSONEncoder):
@@ -51,77 +61,86 @@ class JSONRPCEncoder(json.JSONEncoder):
         """
 
         if isinstance(obj, JSONRPCObject):
-            message = {"jsonrpc": 2.0}
-            for field in dir(obj):
-                if not field.startswith('_'):
-                    value = getattr(obj, field)
-                    message[field] = value
-            return message
+            return obj()
         return json.JSONEncoder.default(self, obj)
 
 
-class JSONRPCInvalidRequest(JSONRPCObject):
+class JSONRPCError(JSONRPCObject):
+    """
+    Base object for JSON-RPC error responses.
+    """
+
+    __slots__ = ("id", "error")
+    _fields = ("id", "error")
+
+
+class JSONRPCInvalidRequest(JSONRPCError):
     """
     Error response for an invalid request.
     """
 
+    __slots__ = ()
+
     def __init__(self):
-        JSONRPCObject.__init__(self)
         self.id = None
         self.error = {"code": -32600, "message": "Invalid Request"}
 
 
-class JSONRPCMethodNotFound(JSONRPCObject):
+class JSONRPCMethodNotFound(JSONRPCError):
     """
     Error response for an method not found.
 
     :param request_id: JSON-RPC identifier
     """
 
+    __slots__ = ()
+
     def __init__(self, request_id):
-        JSONRPCObject.__init__(self)
         self.id = request_id
         self.error = {"code": -32601, "message": "Method not found"}
 
 
-class JSONRPCInvalidParams(JSONRPCObject):
+class JSONRPCInvalidParams(JSONRPCError):
     """
     Error response for invalid parameters.
 
     :param request_id: JSON-RPC identifier
     """
 
+    __slots__ = ()
+
     def __init__(self, request_id):
-        JSONRPCObject.__init__(self)
         self.id = request_id
         self.error = {"code": -32602, "message": "Invalid params"}
 
 
-class JSONRPCInternalError(JSONRPCObject):
+class JSONRPCInternalError(JSONRPCError):
     """
     Error response for an internal error.
 
     :param request_id: JSON-RPC identifier (optional)
     """
 
+    __slots__ = ()
+
     def __init__(self, request_id=None):
-        JSONRPCObject.__init__(self)
         self.id = request_id
         self.error = {"code": -32603, "message": "Internal error"}
 
 
-class JSONRPCParseError(JSONRPCObject):
+class JSONRPCParseError(JSONRPCError):
     """
     Error response for parsing error.
     """
 
+    __slots__ = ()
+
     def __init__(self):
-        JSONRPCObject.__init__(self)
         self.id = None
         self.error = {"code": -32700, "message": "Parse error"}
 
 
-class JSONRPCCustomError(JSONRPCObject):
+class JSONRPCCustomError(JSONRPCError):
     """
     Error response for an custom error.
 
@@ -130,8 +149,9 @@ class JSONRPCCustomError(JSONRPCObject):
     :param request_id: JSON-RPC identifier (optional)
     """
 
+    __slots__ = ()
+
     def __init__(self, code, message, request_id=None):
-        JSONRPCObject.__init__(self)
         self.id = request_id
         self.error = {"code": code, "message": message}
 
@@ -144,8 +164,10 @@ class JSONRPCResponse(JSONRPCObject):
     :param request_id: JSON-RPC identifier
     """
 
+    __slots__ = ("id", "result")
+    _fields = ("id", "result")
+
     def __init__(self, result, request_id):
-        JSONRPCObject.__init__(self)
         self.id = request_id
         self.result = result
 
@@ -159,14 +181,19 @@ class JSONRPCRequest(JSONRPCObject):
     :param request_id: JSON-RPC identifier (generated by default)
     """
 
+    __slots__ = ("id", "method", "params")
+
     def __init__(self, method, params=None, request_id=None):
-        JSONRPCObject.__init__(self)
-        if request_id == None:
-            request_id = str(uuid.uuid4())
+        if request_id is None:
+            request_id = next(_request_ids)
         self.id = request_id
         self.method = method
-        if params:
-            self.params = params
+        self.params = params or None
+
+    def __call__(self):
+        if self.params is None:
+            return {"jsonrpc": 2.0, "id": self.id, "method": self.method}
+        return {"jsonrpc": 2.0, "id": self.id, "method": self.method, "params": self.params}
 
 
 class JSONRPCNotification(JSONRPCObject):
@@ -177,8 +204,13 @@ class JSONRPCNotification(JSONRPCObject):
     :param params: JSON-RPC params for the corresponding method (optional)
     """
 
+    __slots__ = ("method", "params")
+
     def __init__(self, method, params=None):
-        JSONRPCObject.__init__(self)
         self.method = method
-        if params:
-            self.params = params
+        self.params = params or None
+
+    def __call__(self):
+        if self.params is None:
+            return {"jsonrpc": 2.0, "method": self.method}
+        return {"jsonrpc": 2.0, "method": self.method, "params": self.params}
@@ -22,6 +22,7 @@ Manages and stores everything needed for a connection between 2 devices.
 
 from .qt import QtCore
 from .nios.nio_udp import NIOUDP
+from .link_provisioner import LinkProvisioner
 
 import logging
 log = logging.getLogger(__name__)
@@ -39,9 +40,10 @@ class Link(QtCore.QObject):
     """
 
     # signals used to let the GUI view know about link
-    # additions and deletions.
+    # additions, deletions and cancellations.
     add_link_signal = QtCore.Signal(int)
     delete_link_signal = QtCore.Signal(int)
+    cancel_link_signal = QtCore.Signal(int)
 
     _instance_count = 1
 
@@ -76,11 +78,6 @@ class Link(QtCore.QObject):
         # it can be created.
         if not self._stub:
 
-            # connect signals used when a NIO has been created by a node
-            # and this NIO need to be attached to a port connected to this link
-            source_node.nio_signal.connect(self.newNIOSlot)
-            destination_node.nio_signal.connect(self.newNIOSlot)
-
             # currently, we support only NIO_UDP for normal connections (non-stub).
             if not source_port.defaultNio() == NIOUDP:
                 raise NotImplementedError()
@@ -88,13 +85,9 @@ class Link(QtCore.QObject):
             self._source_udp = None
             self._destination_udp = None
 
-            # connect signals used to receive a UDP port and host allocated by a node
-            source_node.allocate_udp_nio_signal.connect(self.UDPPortAllocatedSlot)
-            destination_node.allocate_udp_nio_signal.connect(self.UDPPortAllocatedSlot)
-
-            # request the UDP info for each node
-            source_node.allocateUDPPort(self._source_port.id())
-            destination_node.allocateUDPPort(self._destination_port.id())
+            # the UDP ports are allocated and the NIOs added
+            # in batches with the other new links
+            LinkProvisioner.instance().add(self)
         else:
             # handle stub connections (to a cloud for instance).
             if not source_port.isStub() and destination_port.isStub():
@@ -135,6 +128,9 @@ class Link(QtCore.QObject):
                                                             self._destination_node.name(),
                                                             self._destination_port.name()))
 
+        if not self._stub:
+            LinkProvisioner.instance().remove(self)
+
         # delete the NIOs on both source and destination nodes
         self._source_node.deleteNIO(self._source_port)
         self._source_port.setFree()
@@ -191,22 +187,40 @@ class Link(QtCore.QObject):
 
         return self._destination_port
 
-    def UDPPortAllocatedSlot(self, node_id, port_id, lport):
+    def endpoints(self):
+        """
+        Returns the nodes and ports connected by this link.
+
+        :returns: list of (Node instance, Port instance) tuples
         """
-        Slot to receive events from Node instances
-        when a UDP port has been allocated in order to create a NIO UDP.
+
+        return [(self._source_node, self._source_port), (self._destination_node, self._destination_port)]
+
+    def nios(self):
+        """
+        Returns the NIOs to add on the nodes connected by this link.
+
+        :returns: list of (Node instance, Port instance, NIO instance) tuples
+        """
+
+        return [(self._source_node, self._source_port, self._source_nio),
+                (self._destination_node, self._destination_port, self._destination_nio)]
+
+    def udpPortAllocated(self, node_id, port_id, lport):
+        """
+        Called when a UDP port has been allocated in order to create a NIO UDP.
 
         :param node_id: node identifier
         :param port_id: port identifier
         :param lport: local UDP port
+
+        :returns: True if the UDP NIOs are ready to be added to the nodes
         """
 
         # check that the node is connected to this link as a source
         if node_id == self._source_node.id() and port_id == self._source_port.id():
             laddr = self._source_node.server().host
             self._source_udp = (lport, laddr)
-            # disconnect the signal has we don't expect new source UDP info for this link.
-            self._source_node.allocate_udp_nio_signal.disconnect(self.UDPPortAllocatedSlot)
 
             log.debug("{} has allocated UDP port {} for host {}".format(self._source_node.name(),
                                                                         lport,
@@ -216,8 +230,6 @@ class Link(QtCore.QObject):
         elif node_id == self._destination_node.id() and port_id == self._destination_port.id():
             laddr = self._destination_node.server().host
             self._destination_udp = (lport, laddr)
-            # disconnect the signal has we don't expect new source UDP info for this link.
-            self._destination_node.allocate_udp_nio_signal.disconnect(self.UDPPortAllocatedSlot)
 
             log.debug("{} has allocated UDP port {} for host {}".format(self._destination_node.name(),
                                                                         lport,
@@ -237,12 +249,8 @@ class Link(QtCore.QObject):
             self._destination_udp = None
 
             log.debug("creating UDP tunnel from {}:{} to {}:{} ".format(laddr, lport, raddr, rport))
-
-            # add the UDP NIOs to the nodes
-            self._source_node.nio_cancel_signal.connect(self.cancelNIOSlot)
-            self._source_node.addNIO(self._source_port, self._source_nio)
-            self._destination_node.nio_cancel_signal.connect(self.cancelNIOSlot)
-            self._destination_node.addNIO(self._destination_port, self._destination_nio)
+            return True
+        return False
 
     def newNIOSlot(self, node_id, port_id):
         """
@@ -257,22 +265,22 @@ class Link(QtCore.QObject):
         # check that the node is connected to this link as a source
         if node_id == self._source_node.id() and port_id == self._source_port.id():
             self._source_nio_active = True
-            # disconnect the signal has we don't expect new source NIO for this link.
-            self._source_node.nio_signal.disconnect(self.newNIOSlot)
+            if self._stub:
+                # disconnect the signal has we don't expect new source NIO for this link.
+                self._source_node.nio_signal.disconnect(self.newNIOSlot)
 
         # check that the node is connected to this link as a destination
         elif node_id == self._destination_node.id() and port_id == self._destination_port.id():
             self._destination_nio_active = True
-            # disconnect the signal has we don't expect new destination NIO for this link.
-            self._destination_node.nio_signal.disconnect(self.newNIOSlot)
+            if self._stub:
+                # disconnect the signal has we don't expect new destination NIO for this link.
+                self._destination_node.nio_signal.disconnect(self.newNIOSlot)
 
         if not self._stub and self._source_nio_active and self._destination_nio_active:
             # both NIOs are active now.
             self._addToSourcePort(self._source_nio)
             self._addToDestinationPort(self._destination_nio)
 
-            self._source_node.nio_cancel_signal.disconnect(self.cancelNIOSlot)
-            self._destination_node.nio_cancel_signal.disconnect(self.cancelNIOSlot)
             self._source_nio_active = False
             self._destination_nio_active = False
 
@@ -335,32 +343,18 @@ class Link(QtCore.QObject):
         """
 
         if not self._stub:
+            # the provisioner no longer waits for the other node
             if self._source_node.id() != node_id:
-                try:
-                    # the destination node has canceled its NIO allocation
-                    self._destination_node.nio_signal.disconnect(self.newNIOSlot)
-                except TypeError:
-                    # ignore TypeError: 'method' object is not connected
-                    pass
-
+                # the destination node has canceled its NIO allocation
                 self._source_node.deleteNIO(self._source_port)
                 self._source_port.setFree()
                 self._source_node.updated_signal.emit()
 
             elif self._destination_node.id() != node_id:
-                try:
-                    # the source node has canceled its NIO allocation
-                    self._source_node.nio_signal.disconnect(self.newNIOSlot)
-                except TypeError:
-                    # ignore TypeError: 'method' object is not connected
-                    pass
-
+                # the source node has canceled its NIO allocation
                 self._destination_node.deleteNIO(self._destination_port)
                 self._destination_port.setFree()
                 self._destination_node.updated_signal.emit()
-
-            self._source_node.nio_cancel_signal.disconnect(self.cancelNIOSlot)
-            self._destination_node.nio_cancel_signal.disconnect(self.cancelNIOSlot)
         else:
             if self._source_node.id() == node_id:
                 self._source_node.nio_signal.disconnect(self.newNIOSlot)
@@ -372,6 +366,9 @@ class Link(QtCore.QObject):
         self._source_nio_active = False
         self._destination_nio_active = False
 
+        # let the GUI know this link could not be created
+        self.cancel_link_signal.emit(self._id)
+
     def dump(self):
         """
         Returns a representation of this link.
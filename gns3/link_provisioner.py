@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Batched setup of the UDP tunnels of new links.
+"""
+
+from collections import OrderedDict
+
+from .qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class LinkProvisioner(QtCore.QObject):
+    """
+    Sets up the UDP tunnels of the links created during the same event
+    loop iteration (e.g. a topology being loaded or pasted) together:
+    the UDP port allocations of all these links are sent in one JSON-RPC
+    batch per server, then the NIOs ready at the same time are added in
+    one batch per server (if batch requests are enabled).
+
+    The node signals are connected once per node and the replies
+    are dispatched to the links by node and port identifiers.
+    """
+
+    def __init__(self):
+
+        super(LinkProvisioner, self).__init__()
+        # links waiting for their UDP ports to be requested
+        self._queued = []
+        # links with both UDP ports allocated, waiting for their NIOs to be added
+        self._ready = []
+        # links waiting for a server reply, by (node ID, port ID)
+        self._allocations = {}
+        self._nios = {}
+        # watched nodes by ID: [Node instance, number of expected replies]
+        self._nodes = {}
+        self._flush_scheduled = False
+
+    def add(self, link):
+        """
+        Sets up the UDP tunnel of a new link.
+
+        :param link: Link instance
+        """
+
+        self._queued.append(link)
+        self._scheduleFlush()
+
+    def remove(self, link):
+        """
+        Stops setting up a link (e.g. deleted in the meantime).
+
+        :param link: Link instance
+        """
+
+        if link in self._queued:
+            self._queued.remove(link)
+        if link in self._ready:
+            self._ready.remove(link)
+        for pending in (self._allocations, self._nios):
+            for key in [key for key, pending_link in pending.items() if pending_link is link]:
+                del pending[key]
+                self._unwatch(key[0])
+
+    def reset(self):
+        """
+        Stops setting up the links.
+        """
+
+        self._queued.clear()
+        self._ready.clear()
+        self._allocations.clear()
+        self._nios.clear()
+        for node, _ in self._nodes.values():
+            node.allocate_udp_nio_signal.disconnect(self._udpPortAllocatedSlot)
+            node.nio_signal.disconnect(self._nioAddedSlot)
+            node.nio_cancel_signal.disconnect(self._nioCanceledSlot)
+        self._nodes.clear()
+
+    def pendingLinks(self):
+        """
+        Returns the number of links being set up.
+
+        :returns: integer
+        """
+
+        links = set(self._queued)
+        links.update(self._ready)
+        links.update(self._allocations.values())
+        links.update(self._nios.values())
+        return len(links)
+
+    def _scheduleFlush(self):
+        """
+        Sends the requests once control returns to the event loop,
+        so the links created in the meantime are grouped.
+        """
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QtCore.QTimer.singleShot(0, self._flush)
+
+    def _flush(self):
+        """
+        Sends the UDP port allocations and the NIO additions
+        waiting to be sent, in one batch per server
+        (if batch requests are enabled).
+        """
+
+        self._flush_scheduled = False
+        queued = self._queued
+        ready = self._ready
+        self._queued = []
+        self._ready = []
+
+        calls = OrderedDict()
+        for link in queued:
+            for node, port in link.endpoints():
+                self._watch(node)
+                self._allocations[(node.id(), port.id())] = link
+                calls.setdefault(node.server(), []).append((node.allocateUDPPort, (port.id(),)))
+
+        for link in ready:
+            for node, port, nio in link.nios():
+                self._watch(node)
+                self._nios[(node.id(), port.id())] = link
+                calls.setdefault(node.server(), []).append((node.addNIO, (port, nio)))
+
+        if queued or ready:
+            log.debug("setting up {} links ({} UDP port allocations and {} NIOs) on {} servers".format(len(queued) + len(ready),
+                                                                                                       len(queued) * 2,
+                                                                                                       len(ready) * 2,
+                                                                                                       len(calls)))
+        for server, server_calls in calls.items():
+            # servers without batch support get the requests one by one
+            batch = server.batchRequests()
+            if batch:
+                server.beginBatch()
+            try:
+                for method, args in server_calls:
+                    method(*args)
+            finally:
+                if batch:
+                    server.endBatch()
+
+    def _watch(self, node):
+        """
+        Starts (or keeps) receiving the replies for a node.
+
+        :param node: Node instance
+        """
+
+        if node.id() in self._nodes:
+            self._nodes[node.id()][1] += 1
+            return
+        self._nodes[node.id()] = [node, 1]
+        node.allocate_udp_nio_signal.connect(self._udpPortAllocatedSlot)
+        node.nio_signal.connect(self._nioAddedSlot)
+        node.nio_cancel_signal.connect(self._nioCanceledSlot)
+
+    def _unwatch(self, node_id):
+        """
+        Stops receiving the replies for a node once none is expected.
+
+        :param node_id: node identifier
+        """
+
+        watched = self._nodes.get(node_id)
+        if watched is None:
+            return
+        watched[1] -= 1
+        if watched[1] > 0:
+            return
+        node = watched[0]
+        del self._nodes[node_id]
+        node.allocate_udp_nio_signal.disconnect(self._udpPortAllocatedSlot)
+        node.nio_signal.disconnect(self._nioAddedSlot)
+        node.nio_cancel_signal.disconnect(self._nioCanceledSlot)
+
+    def _udpPortAllocatedSlot(self, node_id, port_id, lport):
+        """
+        Slot called when a node has allocated a UDP port.
+
+        :param node_id: node identifier
+        :param port_id: port identifier
+        :param lport: local UDP port
+        """
+
+        link = self._allocations.pop((node_id, port_id), None)
+        if link is None:
+            return
+        self._unwatch(node_id)
+        if link.udpPortAllocated(node_id, port_id, lport):
+            self._ready.append(link)
+            self._scheduleFlush()
+
+    def _nioAddedSlot(self, node_id, port_id):
+        """
+        Slot called when a node has added a NIO.
+
+        :param node_id: node identifier
+        :param port_id: port identifier
+        """
+
+        link = self._nios.pop((node_id, port_id), None)
+        if link is None:
+            return
+        self._unwatch(node_id)
+        link.newNIOSlot(node_id, port_id)
+
+    def _nioCanceledSlot(self, node_id):
+        """
+        Slot called when a node could not add a NIO,
+        the links waiting for a NIO on this node are canceled.
+
+        :param node_id: node identifier
+        """
+
+        links = [link for (nio_node_id, _), link in self._nios.items() if nio_node_id == node_id]
+        for link in OrderedDict.fromkeys(links):
+            self.remove(link)
+            link.cancelNIOSlot(node_id)
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of LinkProvisioner.
+
+        :returns: instance of LinkProvisioner
+        """
+
+        if not hasattr(LinkProvisioner, "_instance"):
+            LinkProvisioner._instance = LinkProvisioner()
+        return LinkProvisioner._instance
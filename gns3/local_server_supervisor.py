@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Supervisor of the local server process: restart after a crash,
+resource usage sampling, graceful shutdown and output logging.
+"""
+
+import os
+import sys
+import time
+import shlex
+import signal
+import threading
+import subprocess
+import logging.handlers
+from collections import deque
+
+from .qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+# seconds between two checks of the process
+CHECK_INTERVAL = 2
+
+# a process crashing more than MAX_RESTARTS times
+# in RESTART_WINDOW seconds is not restarted
+MAX_RESTARTS = 3
+RESTART_WINDOW = 300
+
+# seconds to wait for the process to exit once asked to,
+# then once terminated before killing it
+SHUTDOWN_TIMEOUT = 10
+TERMINATE_TIMEOUT = 5
+
+# resource pressure thresholds: share of the physical memory used
+# by the process and CPU usage (100 is one core) during CPU_WARNING_SAMPLES checks
+RSS_WARNING_RATIO = 0.75
+CPU_WARNING_PERCENT = 90
+CPU_WARNING_SAMPLES = 5
+
+# rotating log file of the process output
+LOG_FILE_NAME = "GNS3_server.log"
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+# number of output lines kept to be logged when the process crashes
+OUTPUT_TAIL_LINES = 20
+
+
+def processStats(pid):
+    """
+    Returns the resident memory and the CPU time of a process,
+    read from /proc (Linux only).
+
+    :param pid: process ID
+
+    :returns: (RSS in bytes, CPU time in seconds) tuple or None
+    """
+
+    try:
+        with open("/proc/{}/stat".format(pid), "rb") as f:
+            stat = f.read().decode("ascii", "replace")
+    except OSError:
+        return None
+
+    # the process name is between parentheses and may contain spaces
+    fields = stat[stat.rfind(")") + 2:].split()
+    try:
+        # utime and stime are the fields 14 and 15, rss the field 24 (see man proc)
+        cpu_ticks = int(fields[11]) + int(fields[12])
+        rss_pages = int(fields[21])
+    except (IndexError, ValueError):
+        return None
+    return rss_pages * os.sysconf("SC_PAGE_SIZE"), cpu_ticks / os.sysconf("SC_CLK_TCK")
+
+
+def physicalMemory():
+    """
+    Returns the size of the physical memory, read from /proc (Linux only).
+
+    :returns: bytes or None
+    """
+
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class LocalServerSupervisor(QtCore.QObject):
+    """
+    Starts the local server process and keeps an eye on it.
+
+    The process is restarted when it exits unexpectedly, unless it
+    keeps crashing. Its memory and CPU usage are sampled (on Linux) and
+    a warning is emitted when they are high. Its output is written to a
+    rotating log file.
+
+    :param log_directory: directory of the log file (no log file if empty)
+    """
+
+    # the process has been restarted after exiting unexpectedly
+    restarted_signal = QtCore.Signal()
+
+    # the process exited unexpectedly and will not be restarted, with the reason
+    failed_signal = QtCore.Signal(str)
+
+    # resource usage sampled
+    resources_signal = QtCore.Signal()
+
+    # resource usage too high, with a description
+    pressure_signal = QtCore.Signal(str)
+
+    def __init__(self, log_directory=""):
+
+        super(LocalServerSupervisor, self).__init__()
+        self._command = None
+        self._process = None
+        self._stopping = False
+        self._crashes = deque()
+        self._rss = None
+        self._cpu_percent = None
+        self._cpu_time = None
+        self._sample_time = None
+        self._high_cpu_samples = 0
+        self._memory_pressure = False
+        self._physical_memory = physicalMemory()
+        self._output_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+
+        self._output_log = logging.getLogger("gns3.local_server_output")
+        self._output_log.propagate = False
+        self._output_log.setLevel(logging.INFO)
+        if log_directory and not self._output_log.handlers:
+            path = os.path.join(log_directory, LOG_FILE_NAME)
+            try:
+                handler = logging.handlers.RotatingFileHandler(path,
+                                                               maxBytes=LOG_FILE_MAX_BYTES,
+                                                               backupCount=LOG_FILE_BACKUP_COUNT)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self._output_log.addHandler(handler)
+            except OSError as e:
+                log.warning("could not log the local server output to {}: {}".format(path, e))
+
+        self._check_timer = QtCore.QTimer(self)
+        self._check_timer.setInterval(CHECK_INTERVAL * 1000)
+        self._check_timer.timeout.connect(self._checkSlot)
+
+    def start(self, command):
+        """
+        Starts the process.
+
+        :param command: command line (string)
+
+        :returns: True if the process has been started
+        """
+
+        self._command = command
+        self._crashes.clear()
+        self._stopping = False
+        return self._spawn()
+
+    def _spawn(self):
+        """
+        Starts the process with the current command.
+
+        :returns: boolean
+        """
+
+        log.info("starting local server process with {}".format(self._command))
+        try:
+            if sys.platform.startswith("win"):
+                # use the string on Windows
+                self._process = subprocess.Popen(self._command,
+                                                 stdout=subprocess.PIPE,
+                                                 stderr=subprocess.STDOUT,
+                                                 creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+            else:
+                # use arguments on other platforms
+                self._process = subprocess.Popen(shlex.split(self._command),
+                                                 stdout=subprocess.PIPE,
+                                                 stderr=subprocess.STDOUT)
+        except OSError as e:
+            log.warning('could not start local server "{}": {}'.format(self._command, e))
+            self._process = None
+            return False
+
+        self._output_log.info("--- local server process {} started: {}".format(self._process.pid, self._command))
+        self._output_tail.clear()
+        reader = threading.Thread(target=self._readOutput, args=(self._process,), daemon=True)
+        reader.start()
+
+        self._rss = None
+        self._cpu_percent = None
+        self._cpu_time = None
+        self._high_cpu_samples = 0
+        self._memory_pressure = False
+        self._check_timer.start()
+        return True
+
+    def _readOutput(self, process):
+        """
+        Writes the output of the process to the log file
+        (runs in its own thread until the process exits).
+
+        :param process: Popen instance
+        """
+
+        for line in iter(process.stdout.readline, b""):
+            line = line.decode("utf-8", "replace").rstrip()
+            self._output_tail.append(line)
+            self._output_log.info(line)
+        process.stdout.close()
+
+    def process(self):
+        """
+        Returns the supervised process.
+
+        :returns: Popen instance or None
+        """
+
+        return self._process
+
+    def isRunning(self):
+        """
+        Returns either the process is running.
+
+        :returns: boolean
+        """
+
+        return self._process is not None and self._process.poll() is None
+
+    def rss(self):
+        """
+        Returns the resident memory of the process at the last check.
+
+        :returns: bytes or None if unknown
+        """
+
+        return self._rss
+
+    def cpuPercent(self):
+        """
+        Returns the CPU usage of the process between the last two checks.
+
+        :returns: percentage of one core or None if unknown
+        """
+
+        return self._cpu_percent
+
+    def stop(self, wait=False, timeout=SHUTDOWN_TIMEOUT):
+        """
+        Asks the process to exit. If it is still running after the
+        timeout, it is terminated and then killed.
+
+        :param wait: wait for the process to exit
+        :param timeout: seconds to wait before terminating the process
+        """
+
+        self._stopping = True
+        self._check_timer.stop()
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+
+        log.info("stopping local server process {}".format(process.pid))
+        try:
+            if sys.platform.startswith("win"):
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                process.send_signal(signal.SIGINT)
+        except OSError as e:
+            log.warning("could not stop local server process {}: {}".format(process.pid, e))
+
+        if wait:
+            self._waitForExit(process, timeout)
+        else:
+            QtCore.QTimer.singleShot(timeout * 1000, lambda: self._waitForExit(process, 0))
+
+    def _waitForExit(self, process, timeout):
+        """
+        Waits for a process to exit, terminates it after the timeout
+        and kills it if it still does not exit.
+
+        :param process: Popen instance
+        :param timeout: seconds
+        """
+
+        try:
+            process.wait(timeout)
+            return
+        except subprocess.TimeoutExpired:
+            log.warning("local server process {} did not exit after {} seconds, terminating it".format(process.pid, timeout))
+        process.terminate()
+        try:
+            process.wait(TERMINATE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            log.warning("local server process {} did not terminate, killing it".format(process.pid))
+            process.kill()
+            process.wait()
+
+    def _checkSlot(self):
+        """
+        Slot called regularly to check the process.
+        """
+
+        if self._stopping or self._process is None:
+            self._check_timer.stop()
+            return
+
+        returncode = self._process.poll()
+        if returncode is None:
+            self._sample()
+            return
+
+        self._check_timer.stop()
+        tail = "\n".join(self._output_tail)
+        log.error("local server process {} exited unexpectedly with code {}, last output:\n{}".format(self._process.pid,
+                                                                                                     returncode,
+                                                                                                     tail))
+
+        now = time.time()
+        self._crashes.append(now)
+        while self._crashes and now - self._crashes[0] > RESTART_WINDOW:
+            self._crashes.popleft()
+        if len(self._crashes) > MAX_RESTARTS:
+            self.failed_signal.emit("The local server exited with code {} and has crashed {} times in {} minutes, it will not be restarted".format(returncode,
+                                                                                                                                                 len(self._crashes),
+                                                                                                                                                 RESTART_WINDOW // 60))
+            return
+
+        if self._spawn():
+            self.restarted_signal.emit()
+        else:
+            self.failed_signal.emit("The local server exited with code {} and could not be restarted".format(returncode))
+
+    def _sample(self):
+        """
+        Samples the resource usage of the process.
+        """
+
+        stats = processStats(self._process.pid)
+        if stats is None:
+            return
+
+        now = time.time()
+        self._rss, cpu_time = stats
+        if self._cpu_time is not None and now > self._sample_time:
+            self._cpu_percent = (cpu_time - self._cpu_time) / (now - self._sample_time) * 100
+        self._cpu_time = cpu_time
+        self._sample_time = now
+        self.resources_signal.emit()
+
+        if self._physical_memory:
+            memory_pressure = self._rss > self._physical_memory * RSS_WARNING_RATIO
+            if memory_pressure and not self._memory_pressure:
+                self.pressure_signal.emit("The local server uses {} MB, {:.0f}% of the physical memory".format(self._rss // (1024 * 1024),
+                                                                                                           self._rss * 100 / self._physical_memory))
+            self._memory_pressure = memory_pressure
+
+        if self._cpu_percent is not None and self._cpu_percent >= CPU_WARNING_PERCENT:
+            self._high_cpu_samples += 1
+            if self._high_cpu_samples == CPU_WARNING_SAMPLES:
+                self.pressure_signal.emit("The local server has been using {:.0f}% CPU for {} seconds".format(self._cpu_percent,
+                                                                                                           CPU_WARNING_SAMPLES * CHECK_INTERVAL))
+        else:
+            self._high_cpu_samples = 0
@@ -28,6 +28,7 @@ import glob
 import logging
 
 from .modules import MODULES
+from .modules.node_operation import NodeOperation
 from .qt import QtGui, QtCore
 from .servers import Servers
 from .node import Node
@@ -38,8 +39,8 @@ from .dialogs.preferences_dialog import PreferencesDialog
 from .settings import GENERAL_SETTINGS, GENERAL_SETTING_TYPES, CLOUD_SETTINGS, CLOUD_SETTINGS_TYPES
 from .utils.progress_dialog import ProgressDialog
 from .utils.process_files_thread import ProcessFilesThread
-from .utils.wait_for_connection_thread import WaitForConnectionThread
 from .utils.message_box import MessageBox
+from .utils.json_stream_reader import JSONStreamReader
 from .ports.port import Port
 from .items.node_item import NodeItem
 from .items.link_item import LinkItem
@@ -47,6 +48,7 @@ from .items.shape_item import ShapeItem
 from .items.image_item import ImageItem
 from .items.note_item import NoteItem
 from .topology import Topology, TopologyInstance
+from .topology_journal import TopologyJournal
 from .cloud.utils import get_provider
 
 log = logging.getLogger(__name__)
@@ -83,6 +85,10 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         self._loadSettings()
         self._connections()
         self._ignore_unsaved_state = False
+        self._journal_replayed = False
+        self._local_server_started = False
+        self._node_operations = []
+        self._node_operation_progress_dialog = None
         self._temporary_project = True
         self._max_recent_files = 5
         self._recent_file_actions = []
@@ -105,6 +111,12 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         self.uiDocksMenu.addAction(self.uiNodesDockWidget.toggleViewAction())
         self.uiDocksMenu.addAction(self.uiCloudInspectorDockWidget.toggleViewAction())
 
+        # populate the tools menu
+        self._placement_plan_action = QtGui.QAction("Server &placement plan", self.uiToolsMenu)
+        self._placement_plan_action.setStatusTip("Suggests remote servers for the nodes to limit the links between servers")
+        self._placement_plan_action.triggered.connect(self._placementPlanActionSlot)
+        self.uiToolsMenu.addAction(self._placement_plan_action)
+
         # set the images directory
         self.uiGraphicsView.updateImageFilesDir(self.imagesDirPath())
 
@@ -121,6 +133,10 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
 
         self._cloud_provider = None
 
+        # connection status of the servers
+        self._server_status_label = QtGui.QLabel()
+        self.uiStatusBar.addPermanentWidget(self._server_status_label)
+
         # set the window icon
         self.setWindowIcon(QtGui.QIcon(":/images/gns3.ico"))
 
@@ -297,6 +313,12 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         # connect the signal to the view
         self.adding_link_signal.connect(self.uiGraphicsView.addingLinkSlot)
 
+        # topology loading
+        topology = Topology.instance()
+        topology.parse_progress_signal.connect(self._topologyParseProgressSlot)
+        topology.load_progress_signal.connect(self._topologyLoadProgressSlot)
+        topology.loaded_signal.connect(self._topologyLoadedSlot)
+
         # project
         self.project_about_to_close_signal.connect(self.shutdown_cloud_instances)
         self.project_new_signal.connect(self.project_created)
@@ -318,6 +340,38 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         if not self._ignore_unsaved_state:
             self.setWindowModified(True)
 
+    def _topologyParseProgressSlot(self, progress):
+        """
+        Slot to show the topology file reading progress.
+
+        :param progress: percentage of the file that has been read
+        """
+
+        self.uiStatusBar.showMessage("Reading topology file: {}%...".format(progress))
+
+    def _topologyLoadProgressSlot(self, done, total):
+        """
+        Slot to show the topology loading progress.
+
+        :param done: number of nodes and links processed
+        :param total: total number of nodes and links to process
+        """
+
+        self.uiStatusBar.showMessage("Loading topology: {}/{} nodes and links created...".format(done, total))
+
+    def _topologyLoadedSlot(self):
+        """
+        Slot called when the topology has been fully loaded.
+        """
+
+        if self._journal_replayed:
+            # the recovered changes have not been saved to the topology file yet
+            self._journal_replayed = False
+            self.setUnsavedState()
+            self.uiStatusBar.showMessage("Topology fully loaded, unsaved changes have been recovered", 2000)
+        else:
+            self.uiStatusBar.showMessage("Topology fully loaded", 2000)
+
     def ignoreUnsavedState(self, value):
         """
         Activates or deactivates the possibility to
@@ -508,6 +562,27 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         if not self._createScreenshot(path):
             QtGui.QMessageBox.critical(self, "Screenshot", "Could not create screenshot file {}".format(path))
 
+    def _placementPlanActionSlot(self):
+        """
+        Slot called to suggest remote servers for the nodes
+        so that fewer links are UDP tunnels between two servers.
+        """
+
+        topology = Topology.instance()
+        moves, cross_links, planned_cross_links = topology.placementPlan()
+        if not moves:
+            QtGui.QMessageBox.information(self, "Placement plan", "{} links between servers, the nodes are already well placed".format(cross_links))
+            return
+
+        details = []
+        for node_id, server in moves.items():
+            node = topology.getNode(node_id)
+            details.append("{} on {}:{} -> {}:{}".format(node.name(), node.server().host, node.server().port, server.host, server.port))
+        MessageBox(self, "Placement plan", "Moving {} nodes would reduce the links between servers from {} to {}".format(len(moves),
+                                                                                                                      cross_links,
+                                                                                                                      planned_cross_links),
+                   "\n".join(sorted(details)), icon=QtGui.QMessageBox.Information)
+
     def _snapshotActionSlot(self):
         """
         Slot called to open the snapshot dialog.
@@ -626,36 +701,91 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         Slot called when starting all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "start") and item.node().initialized():
-                item.node().start()
+        # nodes are started by groups to not overload the servers
+        options = {"concurrency": self._settings["start_all_server_concurrency"],
+                   "type_concurrency": self._settings["start_all_node_type_concurrency"],
+                   "wait": self._settings["start_all_wait_for_started"],
+                   "delay": self._settings["slow_device_start_all"]}
+        self._runNodeOperation("start", "Starting nodes...", **options)
 
     def _suspendAllActionSlot(self):
         """
         Slot called when suspending all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "suspend") and item.node().initialized():
-                item.node().suspend()
+        self._runNodeOperation("suspend", "Suspending nodes...")
 
     def _stopAllActionSlot(self):
         """
         Slot called when stopping all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "stop") and item.node().initialized():
-                item.node().stop()
+        self._runNodeOperation("stop", "Stopping nodes...")
 
     def _reloadAllActionSlot(self):
         """
         Slot called when reloading all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "reload") and item.node().initialized():
-                item.node().reload()
+        self._runNodeOperation("reload", "Reloading nodes...")
+
+    def _runNodeOperation(self, action, label_text, **options):
+        """
+        Runs a lifecycle action on all the nodes and shows the progress.
+
+        :param action: "start", "stop", "suspend" or "reload"
+        :param label_text: text to describe the progress bar
+        :param options: operation options (see NodeOperation)
+        """
+
+        if self._node_operations:
+            # cancel the previous operation first (QProgressDialog.cancel() does not emit canceled)
+            self._nodeOperationCanceledSlot()
+            self._node_operation_progress_dialog.reset()
+
+        # one operation for the nodes of all the modules,
+        # so the concurrency limits hold per server
+        nodes = [item.node() for item in self.uiGraphicsView.nodeItems()]
+        operation = NodeOperation(action, nodes, **options)
+        total = operation.total()
+        if not total:
+            return
+        operation.progress_signal.connect(self._nodeOperationProgressSlot)
+        operation.completed_signal.connect(self._nodeOperationProgressSlot)
+        self._node_operations.append(operation)
+        operation.start()
+
+        self._node_operation_progress_dialog = QtGui.QProgressDialog(label_text, "Cancel", 0, total, parent=self)
+        self._node_operation_progress_dialog.setWindowTitle("Nodes")
+        self._node_operation_progress_dialog.setMinimumDuration(1000)
+        self._node_operation_progress_dialog.canceled.connect(self._nodeOperationCanceledSlot)
+
+    def _nodeOperationProgressSlot(self, *args):
+        """
+        Slot to show the progress of the running node operations.
+        """
+
+        if not self._node_operations:
+            return
+
+        done = sum(operation.done() for operation in self._node_operations)
+        self._node_operation_progress_dialog.setValue(done)
+        if not any(operation.isRunning() for operation in self._node_operations):
+            self._node_operations.clear()
+            self._node_operation_progress_dialog.reset()
+
+    def _nodeOperationCanceledSlot(self):
+        """
+        Slot called when the running node operations are canceled.
+        """
+
+        operations = self._node_operations
+        self._node_operations = []
+        for operation in operations:
+            # the canceled operations must not update the progress of the next ones
+            operation.progress_signal.disconnect(self._nodeOperationProgressSlot)
+            operation.completed_signal.disconnect(self._nodeOperationProgressSlot)
+            operation.cancel()
 
     def _deviceMenuActionSlot(self):
         """
@@ -679,8 +809,8 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         """
 
         from .telnet_console import telnetConsole
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "console") and item.node().initialized():
+        for item in self.uiGraphicsView.nodeItems():
+            if hasattr(item.node(), "console") and item.node().initialized():
                 node = item.node()
                 if node.status() != Node.started:
                     continue
@@ -967,6 +1097,9 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
                 return self._saveProject(self._project_settings["project_path"])
             elif reply == QtGui.QMessageBox.Cancel:
                 return False
+            else:
+                # the changes recorded since the last save are abandoned
+                Topology.instance().journal().discard()
         self._deleteTemporaryProject()
         return True
 
@@ -978,10 +1111,20 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         self._createTemporaryProject()
         self._newsActionSlot()
 
-        # connect to the local server
         servers = Servers.instance()
         server = servers.localServer()
+        servers.server_connection_error_signal.connect(self._serverConnectionErrorSlot)
+        servers.server_status_signal.connect(self._serverStatusSlot)
+        servers.server_connected_signal.connect(self._firstServerConnectedSlot)
+        supervisor = servers.localServerSupervisor()
+        supervisor.pressure_signal.connect(self._localServerPressureSlot)
+        supervisor.failed_signal.connect(self._localServerFailedSlot)
+        self.uiStatusBar.showMessage("Connecting to the servers...")
 
+        # probe the remote servers in parallel, without waiting for them
+        servers.probeServers(servers.remoteServers().values())
+
+        # connect to the local server
         if not server.connected():
 
             try:
@@ -992,55 +1135,179 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
                 QtGui.QMessageBox.critical(self, "Local server", "Could not bind with {host}: {error} (please check your host binding setting)".format(host=server.host, error=e))
                 return
 
+            self._local_server_started = False
+            server.signals().connected_signal.connect(self._localServerConnectedSlot)
+            server.signals().connection_error_signal.connect(self._localServerConnectionErrorSlot)
+            server.connectAsync()
+
+    def _firstServerConnectedSlot(self, server_id):
+        """
+        Slot called when the first server is connected at startup.
+
+        :param server_id: server identifier
+        """
+
+        Servers.instance().server_connected_signal.disconnect(self._firstServerConnectedSlot)
+        for server in Servers.instance().servers():
+            if server.id() == server_id:
+                self.uiStatusBar.showMessage("Connected to server {}:{}".format(server.host, server.port), 5000)
+                break
+
+    def _localServerPressureSlot(self, message):
+        """
+        Slot called when the local server process uses too many resources.
+
+        :param message: resource usage description
+        """
+
+        log.warning(message)
+        self.uiConsoleTextEdit.writeWarning(None, message)
+
+    def _localServerFailedSlot(self, message):
+        """
+        Slot called when the local server process has crashed
+        and will not be restarted.
+
+        :param message: error message
+        """
+
+        self.uiConsoleTextEdit.writeError(None, message)
+
+    def _serverConnectionErrorSlot(self, server_id, message):
+        """
+        Slot called when a server could not be connected.
+
+        :param server_id: server identifier
+        :param message: error message
+        """
+
+        log.warning("could not connect to server {}: {}".format(server_id, message))
+
+    def _serverStatusSlot(self, server_id):
+        """
+        Slot called when the connection status or the latency
+        of a server has changed.
+
+        :param server_id: server identifier
+        """
+
+        servers = Servers.instance()
+        connected = 0
+        lines = []
+        for server in servers.servers():
+            monitor = servers.serverMonitor(server)
+            if monitor.status() == monitor.connected:
+                connected += 1
+            lines.append("{}:{}: {}".format(server.host, server.port, monitor.statusText()))
+            for method, metrics in server.requestManager().slowMethods(3):
+                lines.append("    {}: {:.2f} s average, {:.2f} s max ({} calls)".format(method,
+                                                                                   metrics.average(),
+                                                                                   metrics.max_time,
+                                                                                   metrics.count))
+        total = len(servers.servers())
+        supervisor = servers.localServerSupervisor()
+        if supervisor.isRunning() and supervisor.rss() is not None:
+            cpu_percent = supervisor.cpuPercent()
+            lines.append("local server process: {} MB, {} CPU".format(supervisor.rss() // (1024 * 1024),
+                                                                      "?" if cpu_percent is None else "{:.0f}%".format(cpu_percent)))
+        self._server_status_label.setText("Servers: {}/{} connected".format(connected, total))
+        self._server_status_label.setToolTip("\n".join(lines))
+
+    def _disconnectLocalServerSlots(self):
+        """
+        Stops following the connection to the local server.
+        """
+
+        servers = Servers.instance()
+        server = servers.localServer()
+        signals = server.signals()
+        monitor = servers.serverMonitor(server)
+        for signal, slot in ((signals.connected_signal, self._localServerConnectedSlot),
+                             (signals.connection_error_signal, self._localServerConnectionErrorSlot),
+                             (monitor.probe_failed_signal, self._localServerProbeFailedSlot)):
             try:
-                server.connect()
-                log.info("use an already started local server on {}:{}".format(server.host, server.port))
-            except OSError as e:
+                signal.disconnect(slot)
+            except TypeError:
+                # ignore TypeError: 'method' object is not connected
+                pass
 
-                if not e.errno:
-                    # not a normal OSError, thrown from the Websocket client.
-                    MessageBox(self, "Local server", "Something other than a GNS3 server is already running on {} port {}, please adjust the local server port setting".format(server.host,
-                                                                                                                                                                               server.port),
-                                                                                                                                                                               str(e))
-                    return
+    def _localServerConnectedSlot(self):
+        """
+        Slot called when connected to the local server at startup.
+        """
 
-                if not servers.localServerAutoStart():
-                    return
+        self._disconnectLocalServerSlots()
+        server = Servers.instance().localServer()
+        if self._local_server_started:
+            log.info("connected to the local server on {}:{}".format(server.host, server.port))
+            self.uiStatusBar.showMessage("Connected to the local server on {}:{}".format(server.host, server.port), 5000)
+        else:
+            log.info("use an already started local server on {}:{}".format(server.host, server.port))
+
+    def _localServerConnectionErrorSlot(self, error_number, message):
+        """
+        Slot called when the local server could not be connected at startup.
+        Starts the local server if there is none running.
 
-                log.info("starting local server {} on {}:{}".format(servers.localServerPath(), server.host, server.port))
+        :param error_number: socket error number (0 for other errors)
+        :param message: error message
+        """
 
-                local_server_path = servers.localServerPath()
+        self._disconnectLocalServerSlots()
+        servers = Servers.instance()
+        server = servers.localServer()
 
-                if not local_server_path:
-                    log.info("no local server is configured")
-                    return
+        if not error_number:
+            # not a socket error, something answered but not as a GNS3 server
+            MessageBox(self, "Local server", "Something other than a GNS3 server is already running on {} port {}, please adjust the local server port setting".format(server.host,
+                                                                                                                                                                       server.port),
+                                                                                                                                                                       message)
+            return
 
-                if not os.path.isfile(local_server_path):
-                    QtGui.QMessageBox.critical(self, "Local server", "Could not find local server {}".format(local_server_path))
-                    return
+        if not servers.localServerAutoStart():
+            return
 
-                elif not os.access(local_server_path, os.X_OK):
-                    QtGui.QMessageBox.critical(self, "Local server", "{} is not an executable".format(local_server_path))
-                    return
+        log.info("starting local server {} on {}:{}".format(servers.localServerPath(), server.host, server.port))
 
-                if servers.startLocalServer(servers.localServerPath(), server.host, server.port):
-                        self._thread = WaitForConnectionThread(server.host, server.port)
-                        progress_dialog = ProgressDialog(self._thread,
-                                                         "Local server",
-                                                         "Connecting to server {} on port {}...".format(server.host, server.port),
-                                                         "Cancel", busy=True, parent=self)
-                        progress_dialog.show()
-                        if progress_dialog.exec_() is False:
-                            return
-                else:
-                    QtGui.QMessageBox.critical(self, "Local server", "Could not start the local server process: {}".format(servers.localServerPath()))
-                    return
-                try:
-                    servers.localServer().reconnect()
-                except OSError as e:
-                    QtGui.QMessageBox.critical(self, "Local server", "Could not connect to the local server {host} on port {port}: {error}".format(host=server.host,
-                                                                                                                                                   port=server.port,
-                                                                                                                                                   error=e))
+        local_server_path = servers.localServerPath()
+
+        if not local_server_path:
+            log.info("no local server is configured")
+            return
+
+        if not os.path.isfile(local_server_path):
+            QtGui.QMessageBox.critical(self, "Local server", "Could not find local server {}".format(local_server_path))
+            return
+
+        elif not os.access(local_server_path, os.X_OK):
+            QtGui.QMessageBox.critical(self, "Local server", "{} is not an executable".format(local_server_path))
+            return
+
+        if not servers.startLocalServer(servers.localServerPath(), server.host, server.port):
+            QtGui.QMessageBox.critical(self, "Local server", "Could not start the local server process: {}".format(servers.localServerPath()))
+            return
+
+        # the server process needs some time to listen,
+        # the window stays usable in the meantime
+        self._local_server_started = True
+        self.uiStatusBar.showMessage("Waiting for the local server on {}:{}...".format(server.host, server.port))
+        server.signals().connected_signal.connect(self._localServerConnectedSlot)
+        servers.serverMonitor(server).probe_failed_signal.connect(self._localServerProbeFailedSlot)
+        servers.probeServers([server])
+
+    def _localServerProbeFailedSlot(self, message):
+        """
+        Slot called when the started local server could not be connected in time.
+
+        :param message: error message
+        """
+
+        self._disconnectLocalServerSlots()
+        server = Servers.instance().localServer()
+        self.uiStatusBar.clearMessage()
+        QtGui.QMessageBox.critical(self, "Local server", "Could not connect to the local server {host} on port {port}: {error}".format(host=server.host,
+                                                                                                                                   port=server.port,
+                                                                                                                                   error=message))
 
     def _saveProjectAs(self):
         """
@@ -1151,12 +1418,25 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         """
 
         topology = Topology.instance()
+        temporary_path = path + ".tmp"
         try:
-            with open(path, "w") as f:
+            # write to a temporary file first so an interrupted save
+            # never leaves a truncated project file behind
+            with open(temporary_path, "w") as f:
                 log.info("saving project: {}".format(path))
-                json.dump(topology.dump(), f, sort_keys=True, indent=4)
+                # servers first so the nodes can be created while the file is read
+                json.dump(Topology.streamOrder(topology.dump()), f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_path, path)
+            # the journal restarts from this snapshot
+            topology.openJournal(path)
         except OSError as e:
             QtGui.QMessageBox.critical(self, "Save", "Could not save project to {}: {}".format(path, e))
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
             return False
 
         self.uiStatusBar.showMessage("Project saved to {}".format(path), 2000)
@@ -1175,54 +1455,60 @@ class MainWindow(QtGui.QMainWindow, Ui_MainWindow):
         topology = Topology.instance()
         try:
             QtGui.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-            with open(path, "r") as f:
-                need_to_save = False
-                log.info("loading project: {}".format(path))
-                json_topology = json.load(f)
-
-                project_files_dir = path
-                if path.endswith(".gns3"):
-                    project_files_dir = path[:-5]
-                elif path.endswith(".net"):
-                    project_files_dir = path[:-4]
-                self._project_settings["project_files_dir"] = project_files_dir + "-files"
-
-                if not os.path.isdir(self._project_settings["project_files_dir"]):
-                    os.makedirs(self._project_settings["project_files_dir"])
-                self.uiGraphicsView.updateProjectFilesDir(self._project_settings["project_files_dir"])
-
-                # if we're opening a cloud project, fire up instances
-                if json_topology["resources_type"] == "cloud":
-                    self._project_settings["project_type"] = "cloud"
-                    provider = self.cloudProvider
-                    new_instances = []
-                    for instance in json_topology["topology"]["instances"]:
-                        name = instance["name"]
-                        flavor = instance["size_id"]
-                        image = instance["image_id"]
-                        i = provider.create_instance(name, flavor, image)
-                        new_instances.append({
-                            "name": i.name,
-                            "id": i.id,
-                            "size_id": flavor,
-                            "image_id": image,
-                        })
-                    # update topology with new image data
-                    json_topology["topology"]["instances"] = new_instances
-                    # we need to save the updates
-                    need_to_save = True
-                else:
-                    self._project_settings["project_type"] = "local"
-
-                topology.load(json_topology)
-
-                if need_to_save:
-                    self._saveProject(path)
+            need_to_save = False
+            log.info("loading project: {}".format(path))
+
+            project_files_dir = path
+            if path.endswith(".gns3"):
+                project_files_dir = path[:-5]
+            elif path.endswith(".net"):
+                project_files_dir = path[:-4]
+            self._project_settings["project_files_dir"] = project_files_dir + "-files"
+
+            if not os.path.isdir(self._project_settings["project_files_dir"]):
+                os.makedirs(self._project_settings["project_files_dir"])
+            self.uiGraphicsView.updateProjectFilesDir(self._project_settings["project_files_dir"])
+
+            # the topology file is read and loaded section by section
+            reader = JSONStreamReader(path)
+            self._project_settings["project_type"] = "local"
+
+            def sections():
+                nonlocal need_to_save
+                for section, value in reader:
+                    if section == ("resources_type", ) and value == "cloud":
+                        self._project_settings["project_type"] = "cloud"
+                        # we need to save the updates
+                        need_to_save = True
+                    elif section == ("topology", "instances") and self._project_settings["project_type"] == "cloud":
+                        # if we're opening a cloud project, fire up instances
+                        # and update the topology with new image data
+                        i = self.cloudProvider.create_instance(value["name"], value["size_id"], value["image_id"])
+                        value = {"name": i.name,
+                                 "id": i.id,
+                                 "size_id": value["size_id"],
+                                 "image_id": value["image_id"]}
+                    yield section, value
+
+            # changes recorded after the last save are applied on top of the topology file
+            journal_records = TopologyJournal.read(path)
+            self._journal_replayed = bool(journal_records)
+            if journal_records:
+                topology.loadSections(TopologyJournal.replay(sections(), journal_records), reader.progress)
+            else:
+                topology.loadSections(sections(), reader.progress)
+            topology.openJournal(path, journal_records)
+
+            if need_to_save:
+                self._saveProject(path)
         except OSError as e:
+            # remove what has been loaded before the error
+            self.uiGraphicsView.reset()
             QtGui.QMessageBox.critical(self, "Load", "Could not load project from {}: {}".format(path, e))
             #log.error("exception {type}".format(type=type(e)), exc_info=1)
             return False
         except ValueError as e:
+            self.uiGraphicsView.reset()
             QtGui.QMessageBox.critical(self, "Load", "Invalid file: {}".format(e))
             return False
         finally:
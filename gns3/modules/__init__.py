@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from gns3.websocket_client import WebSocketClient
 from gns3.modules.builtin import Builtin
 from gns3.modules.dynamips import Dynamips
 from gns3.modules.iou import IOU
@@ -23,3 +24,15 @@ from gns3.modules.virtualbox import VirtualBox
 from gns3.modules.qemu import Qemu
 
 MODULES = [Builtin, Dynamips, IOU, VPCS, VirtualBox, Qemu]
+
+
+def _registerNotificationHandlers():
+    """
+    Lets each module handle the notifications sent to it by the servers.
+    """
+
+    for module in MODULES:
+        WebSocketClient.registerNotificationHandler(module.__name__.lower(),
+                                                    lambda method, params, server, module=module: module.instance().notification(method, params, server))
+
+_registerNotificationHandlers()
@@ -97,6 +97,7 @@ class Builtin(Module):
         """
 
         self._nodes.append(node)
+        self._indexNode(node)
 
     def removeNode(self, node):
         """
@@ -107,6 +108,7 @@ class Builtin(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+            self._unindexNode(node)
 
     def allocateServer(self, node_class):
         """
@@ -170,13 +172,12 @@ class Builtin(Module):
         log.info("creating node {}".format(node_class))
 
         if not server.connected():
-            try:
-                log.info("reconnecting to server {}:{}".format(server.host, server.port))
-                server.reconnect()
-            except OSError as e:
-                raise ModuleError("Could not connect to server {}:{}: {}".format(server.host,
-                                                                                 server.port,
-                                                                                 e))
+            # requests are queued until the connection is established
+            log.info("connecting to server {}:{}".format(server.host, server.port))
+            server.connectAsync()
+            if not server.connected() and not server.isConnecting():
+                # the connection failed right away (e.g. connection refused)
+                raise ModuleError("Could not connect to server {}:{}".format(server.host, server.port))
         if server not in self._servers:
             self.addServer(server)
 
@@ -236,6 +236,7 @@ class Dynamips(Module):
         """
 
         self._nodes.append(node)
+        self._indexNode(node)
 
     def removeNode(self, node):
         """
@@ -246,6 +247,7 @@ class Dynamips(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+            self._unindexNode(node)
 
     def iosImages(self):
         """
@@ -335,8 +337,8 @@ class Dynamips(Module):
             # use the local server
             server = servers.localServer()
         else:
-            # pick up a remote server (round-robin method)
-            server = next(iter(servers))
+            # pick up the least loaded remote server
+            server = servers.allocateRemoteServer()
             if not server:
                 raise ModuleError("No remote server is configured")
         return server
@@ -352,13 +354,12 @@ class Dynamips(Module):
         log.info("creating node {}".format(node_class))
 
         if not server.connected():
-            try:
-                log.info("reconnecting to server {}:{}".format(server.host, server.port))
-                server.reconnect()
-            except OSError as e:
-                raise ModuleError("Could not connect to server {}:{}: {}".format(server.host,
-                                                                                 server.port,
-                                                                                 e))
+            # requests are queued until the connection is established
+            log.info("connecting to server {}:{}".format(server.host, server.port))
+            server.connectAsync()
+            if not server.connected() and not server.isConnecting():
+                # the connection failed right away (e.g. connection refused)
+                raise ModuleError("Could not connect to server {}:{}".format(server.host, server.port))
         if server not in self._servers:
             self.addServer(server)
 
@@ -452,23 +453,25 @@ class Dynamips(Module):
         for node in self._nodes:
             node.reset()
         self._nodes.clear()
+        self._clearNodeIndex()
 
-    def notification(self, destination, params):
+    def notification(self, destination, params, server):
         """
         To received notifications from the server.
 
         :param destination: JSON-RPC method
         :param params: JSON-RPC params
+        :param server: WebSocketClient instance which sent the notification
         """
 
         if "devices" in params:
-            for node in self._nodes:
-                for device in params["devices"]:
-                    if node.name() == device:
-                        message = "node {}: {}".format(node.name(), params["message"])
-                        self.notification_signal.emit(message, params["details"])
-                        if hasattr(node, "stop"):
-                            node.stop()
+            for device in params["devices"]:
+                node = self._findNode(server, "name", device)
+                if node:
+                    message = "node {}: {}".format(node.name(), params["message"])
+                    self.notification_signal.emit(message, params["details"])
+                    if hasattr(node, "stop"):
+                        node.stop()
 
     def exportConfigs(self, directory):
         """
@@ -528,6 +528,7 @@ class Router(Node):
             self.server_error_signal.emit(self.id(), result["code"], result["message"])
         else:
             log.info("{} has reloaded".format(self.name()))
+            self.reloaded_signal.emit()
 
     def startPacketCapture(self, port, capture_file_name, data_link_type):
         """
@@ -749,7 +750,7 @@ class Router(Node):
 
         log.debug("{} has deleted a NIO: {}".format(self.name(), result))
 
-    def _saveConfig(self):
+    def saveConfig(self):
         """
         Tells the server to save the router configurations (startup-config and private-config).
         """
@@ -899,10 +900,6 @@ class Router(Node):
         :returns: representation of the node (dictionary)
         """
 
-        # tell the server to save the startup-config and
-        # private-config
-        self._saveConfig()
-
         router = {"id": self.id(),
                   "router_id": self._router_id,
                   "type": self.__class__.__name__,
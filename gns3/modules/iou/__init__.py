@@ -200,6 +200,7 @@ class IOU(Module):
         """
 
         self._nodes.append(node)
+        self._indexNode(node)
 
     def removeNode(self, node):
         """
@@ -210,6 +211,7 @@ class IOU(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+            self._unindexNode(node)
 
     def iouImages(self):
         """
@@ -330,8 +332,8 @@ class IOU(Module):
             # use the local server
             server = servers.localServer()
         else:
-            # pick up a remote server (round-robin method)
-            server = next(iter(servers))
+            # pick up the least loaded remote server
+            server = servers.allocateRemoteServer()
             if not server:
                 raise ModuleError("No remote server is configured")
         return server
@@ -350,13 +352,12 @@ class IOU(Module):
             raise ModuleError("The path to IOURC must be configured")
 
         if not server.connected():
-            try:
-                log.info("reconnecting to server {}:{}".format(server.host, server.port))
-                server.reconnect()
-            except OSError as e:
-                raise ModuleError("Could not connect to server {}:{}: {}".format(server.host,
-                                                                                 server.port,
-                                                                                 e))
+            # requests are queued until the connection is established
+            log.info("connecting to server {}:{}".format(server.host, server.port))
+            server.connectAsync()
+            if not server.connected() and not server.isConnecting():
+                # the connection failed right away (e.g. connection refused)
+                raise ModuleError("Could not connect to server {}:{}".format(server.host, server.port))
         if server not in self._servers:
             self.addServer(server)
 
@@ -417,21 +418,23 @@ class IOU(Module):
                 server.send_notification("iou.reset")
         self._servers.clear()
         self._nodes.clear()
+        self._clearNodeIndex()
 
-    def notification(self, destination, params):
+    def notification(self, destination, params, server):
         """
         To received notifications from the server.
 
         :param destination: JSON-RPC method
         :param params: JSON-RPC params
+        :param server: WebSocketClient instance which sent the notification
         """
 
         if "id" in params:
-            for node in self._nodes:
-                if node.id() == params["id"]:
-                    message = "node {}: {}".format(node.name(), params["message"])
-                    self.notification_signal.emit(message, params["details"])
-                    node.stop()
+            node = self._findNode(server, "id", params["id"])
+            if node:
+                message = "node {}: {}".format(node.name(), params["message"])
+                self.notification_signal.emit(message, params["details"])
+                node.stop()
 
     def exportConfigs(self, directory):
         """
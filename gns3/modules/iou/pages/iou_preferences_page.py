@@ -97,13 +97,9 @@ class IOUPreferencesPage(QtGui.QWidget, Ui_IOUPreferencesPageWidget):
         else:
             QtGui.QMessageBox.critical(self, "Test settings", "Sorry, not yet implemented!")
 
-        try:
-            if not server.connected():
-                server.reconnect()
-        except OSError as e:
-            QtGui.QMessageBox.critical(self, "Local server", "Could not connect to the local server {host} on port {port}: {error}".format(host=server.host,
-                                                                                                                                           port=server.port,
-                                                                                                                                           error=e))
+        if not server.connected():
+            # the test request is queued until the connection is established
+            server.connectAsync()
 
         self._progress_dialog = QtGui.QProgressDialog("Testing settings...", "Cancel", 0, 0, parent=self)
         self._progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
@@ -35,6 +35,10 @@ class Module(QtCore.QObject):
     def __init__(self):
 
         super(Module, self).__init__()
+        # nodes by (server, "id", node ID) and (server, "name", node name)
+        self._node_index = {}
+        # index keys by node
+        self._node_index_keys = {}
 
     def setProjectFilesDir(self, path):
         """
@@ -76,13 +80,95 @@ class Module(QtCore.QObject):
 
         raise NotImplementedError()
 
-    def notification(self, destination, params):
+    def _indexNode(self, node):
+        """
+        Indexes a node by server and ID and by server and name,
+        or updates its index entries (e.g. the node has been renamed).
+
+        :param node: Node instance
+        """
+
+        if node in self._node_index_keys:
+            for key in self._node_index_keys[node]:
+                if self._node_index.get(key) is node:
+                    del self._node_index[key]
+        else:
+            node.created_signal.connect(self._nodeIndexSlot)
+            node.updated_signal.connect(self._nodeIndexSlot)
+            node.deleted_signal.connect(self._nodeUnindexSlot)
+
+        server = node.server()
+        keys = [(server, "id", node.id()), (server, "name", node.name())]
+        for key in keys:
+            self._node_index[key] = node
+        self._node_index_keys[node] = keys
+
+    def _unindexNode(self, node):
+        """
+        Removes a node from the index.
+
+        :param node: Node instance
+        """
+
+        keys = self._node_index_keys.pop(node, None)
+        if keys is None:
+            return
+        for key in keys:
+            if self._node_index.get(key) is node:
+                del self._node_index[key]
+        node.created_signal.disconnect(self._nodeIndexSlot)
+        node.updated_signal.disconnect(self._nodeIndexSlot)
+        node.deleted_signal.disconnect(self._nodeUnindexSlot)
+
+    def _clearNodeIndex(self):
+        """
+        Removes all the nodes from the index.
+        """
+
+        for node in list(self._node_index_keys):
+            self._unindexNode(node)
+
+    def _nodeIndexSlot(self, *args):
+        """
+        Slot to update the index when a node
+        has been created or updated.
+        """
+
+        node = self.sender()
+        if node is not None:
+            self._indexNode(node)
+
+    def _nodeUnindexSlot(self):
+        """
+        Slot to remove a node from the index when it has been deleted.
+        """
+
+        node = self.sender()
+        if node is not None:
+            self._unindexNode(node)
+
+    def _findNode(self, server, key, value):
+        """
+        Finds a node of this module without going through all the nodes.
+        Node IDs are only unique for a server, the index is keyed by server.
+
+        :param server: WebSocketClient instance
+        :param key: "id" or "name"
+        :param value: node ID or name
+
+        :returns: Node instance or None
+        """
+
+        return self._node_index.get((server, key, value))
+
+    def notification(self, destination, params, server):
         """
         To received notifications from the server.
         Must be overloaded.
 
         :param destination: JSON-RPC method
         :param params: JSON-RPC params
+        :param server: WebSocketClient instance which sent the notification
         """
 
         raise NotImplementedError()
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Bulk lifecycle operations (start, stop, suspend, reload) on many nodes.
+"""
+
+import time
+from collections import OrderedDict, deque
+
+from ..qt import QtCore
+from ..node import Node
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class NodeOperation(QtCore.QObject):
+    """
+    Runs a lifecycle action on several nodes.
+
+    Nodes are grouped by server and only a limited number of actions are
+    in progress on each server, and optionally for each node type on a
+    server. The requests released at the same time for a server are sent
+    in one JSON-RPC batch when batch requests are enabled for the server
+    (see Servers.batchRequests()), otherwise one by one.
+
+    :param action: "start", "stop", "suspend" or "reload"
+    :param nodes: list of Node instances
+    :param concurrency: maximum number of actions in progress per server
+    :param type_concurrency: maximum number of actions in progress
+    per node type on a server (0 means no limit)
+    :param wait: wait for the nodes to report the action is done before
+    running the next ones, otherwise only the delay is respected
+    :param delay: minimum seconds between two groups of actions
+    :param timeout: seconds to wait for a node before releasing its slot
+    """
+
+    # signals to follow the progress of the operation
+    progress_signal = QtCore.Signal(int, int)
+    completed_signal = QtCore.Signal()
+
+    # node status reached when an action has been done
+    _target_status = {"start": Node.started,
+                      "stop": Node.stopped,
+                      "suspend": Node.suspended}
+
+    def __init__(self, action, nodes, concurrency=10, type_concurrency=0, wait=True, delay=0, timeout=60):
+
+        super(NodeOperation, self).__init__()
+        self._action = action
+        self._concurrency = concurrency
+        self._type_concurrency = type_concurrency
+        self._wait = wait
+        self._delay = delay
+        self._timeout = timeout
+        self._queues = OrderedDict()
+        self._in_progress = {}
+        # number of slots taken per server and per (server, node type)
+        self._server_slots = {}
+        self._type_slots = {}
+        self._holding = set()
+        self._last_launch = 0
+        self._done = 0
+        self._total = 0
+        self._launch_scheduled = False
+
+        for node in nodes:
+            if not hasattr(node, action) or not node.initialized():
+                continue
+            self._queues.setdefault(node.server(), deque()).append(node)
+            self._total += 1
+
+        self._watchdog = QtCore.QTimer(self)
+        self._watchdog.setInterval(1000)
+        self._watchdog.timeout.connect(self._watchdogSlot)
+
+    def action(self):
+        """
+        Returns the action run by this operation.
+
+        :returns: action name (string)
+        """
+
+        return self._action
+
+    def total(self):
+        """
+        Returns the number of nodes in this operation.
+
+        :returns: integer
+        """
+
+        return self._total
+
+    def done(self):
+        """
+        Returns the number of nodes for which the action has been done.
+
+        :returns: integer
+        """
+
+        return self._done
+
+    def isRunning(self):
+        """
+        Returns either this operation is in progress.
+
+        :returns: boolean
+        """
+
+        return self._done < self._total
+
+    def start(self):
+        """
+        Starts this operation once control returns to the event loop
+        (the caller can connect to the signals first).
+        """
+
+        QtCore.QTimer.singleShot(0, self._run)
+
+    def _run(self):
+        """
+        Runs the first actions.
+        """
+
+        log.info("{} {} nodes on {} servers".format(self._action, self._total, len(self._queues)))
+        if not self._total:
+            self.completed_signal.emit()
+            return
+        self._watchdog.start()
+        self._launch()
+
+    def cancel(self):
+        """
+        Cancels the nodes waiting for the action.
+        The actions already sent are not canceled.
+        """
+
+        for queue in self._queues.values():
+            self._done += len(queue)
+            queue.clear()
+        for node in list(self._in_progress):
+            self._release(node)
+        self._updateProgress()
+
+    def _signals(self, node):
+        """
+        Returns the node signals telling the action is done.
+
+        :param node: Node instance
+
+        :returns: list of signals
+        """
+
+        signal = {"start": node.started_signal,
+                  "stop": node.stopped_signal,
+                  "suspend": node.suspended_signal,
+                  "reload": node.reloaded_signal}[self._action]
+        return [signal, node.error_signal, node.server_error_signal]
+
+    def _canLaunch(self, server, node):
+        """
+        Returns either the action can be run on a node now.
+
+        :param server: server of the node
+        :param node: Node instance
+
+        :returns: boolean
+        """
+
+        if self._server_slots.get(server, 0) >= self._concurrency:
+            return False
+        if self._type_concurrency and self._type_slots.get((server, node.__class__), 0) >= self._type_concurrency:
+            return False
+        return True
+
+    def _takeSlot(self, node, count=1):
+        """
+        Takes (or frees with a negative count) the slots used by a node.
+
+        :param node: Node instance
+        :param count: number of slots
+        """
+
+        server = node.server()
+        self._server_slots[server] = self._server_slots.get(server, 0) + count
+        key = (server, node.__class__)
+        self._type_slots[key] = self._type_slots.get(key, 0) + count
+
+    def _launch(self):
+        """
+        Runs the action on the nodes allowed to, with one batch per server
+        (if batch requests are enabled).
+        """
+
+        self._launch_scheduled = False
+        launched = []
+        for server, queue in self._queues.items():
+            if not queue:
+                continue
+            # servers without batch support get the requests one by one
+            batch = server.batchRequests()
+            if batch:
+                server.beginBatch()
+            try:
+                # nodes of a type which reached its limit let the other nodes go first
+                waiting = deque()
+                while queue:
+                    node = queue.popleft()
+                    if self._server_slots.get(server, 0) >= self._concurrency:
+                        waiting.append(node)
+                        waiting.extend(queue)
+                        queue.clear()
+                    elif not self._canLaunch(server, node):
+                        waiting.append(node)
+                    elif self._launchNode(node):
+                        launched.append(node)
+                queue.extend(waiting)
+            finally:
+                if batch:
+                    server.endBatch()
+
+        if launched:
+            self._last_launch = time.time()
+            if not self._wait:
+                # the next group can go as soon as the delay has elapsed
+                for node in launched:
+                    self._freeSlot(node)
+                if any(self._queues.values()):
+                    self._scheduleLaunch()
+        self._updateProgress()
+
+    def _launchNode(self, node):
+        """
+        Runs the action on a node.
+
+        :param node: Node instance
+
+        :returns: True if the action has been sent
+        """
+
+        target_status = self._target_status.get(self._action)
+        if target_status is not None and node.status() == target_status:
+            # nothing to do for this node
+            self._done += 1
+            return False
+
+        self._in_progress[node] = time.time()
+        self._holding.add(node)
+        self._takeSlot(node)
+        for signal in self._signals(node):
+            signal.connect(self._nodeDoneSlot)
+        getattr(node, self._action)()
+        return True
+
+    def _freeSlot(self, node):
+        """
+        Frees the slots taken by a node.
+
+        :param node: Node instance
+        """
+
+        if node in self._holding:
+            self._holding.remove(node)
+            self._takeSlot(node, -1)
+
+    def _nodeDoneSlot(self, *args):
+        """
+        Slot called when a node has run the action or failed to.
+        """
+
+        node = self.sender()
+        if node in self._in_progress:
+            self._release(node)
+            self._scheduleLaunch()
+            self._updateProgress()
+
+    def _release(self, node):
+        """
+        Stops waiting for a node.
+
+        :param node: Node instance
+        """
+
+        del self._in_progress[node]
+        self._freeSlot(node)
+        for signal in self._signals(node):
+            try:
+                signal.disconnect(self._nodeDoneSlot)
+            except TypeError:
+                # ignore TypeError: 'method' object is not connected
+                pass
+        self._done += 1
+
+    def _scheduleLaunch(self):
+        """
+        Runs the next actions once control returns to the event loop,
+        so nodes released by the same server reply are launched together,
+        and not before the delay since the previous group has elapsed.
+        """
+
+        if not self._launch_scheduled and any(self._queues.values()):
+            self._launch_scheduled = True
+            remaining = self._delay - (time.time() - self._last_launch)
+            QtCore.QTimer.singleShot(max(0, int(remaining * 1000)), self._launch)
+
+    def _watchdogSlot(self):
+        """
+        Slot called every second to release nodes
+        which did not report back in time.
+        """
+
+        now = time.time()
+        expired = [node for node, started in self._in_progress.items() if now - started > self._timeout]
+        for node in expired:
+            log.warning("no answer from {} after {} seconds".format(node.name(), self._timeout))
+            self._release(node)
+        if expired:
+            self._scheduleLaunch()
+            self._updateProgress()
+
+    def _updateProgress(self):
+        """
+        Reports the progress and detects the end of the operation.
+        """
+
+        if not self._watchdog.isActive():
+            # already completed
+            return
+        self.progress_signal.emit(self._done, self._total)
+        if not self.isRunning():
+            self._watchdog.stop()
+            log.info("{} done on {} nodes".format(self._action, self._total))
+            self.completed_signal.emit()
@@ -348,6 +348,7 @@ class QemuVM(Node):
             self.server_error_signal.emit(self.id(), result["code"], result["message"])
         else:
             log.info("{} has reloaded".format(self.name()))
+            self.reloaded_signal.emit()
 
     def allocateUDPPort(self, port_id):
         """
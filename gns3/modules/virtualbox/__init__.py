@@ -209,6 +209,7 @@ class VirtualBox(Module):
         """
 
         self._nodes.append(node)
+        self._indexNode(node)
 
     def removeNode(self, node):
         """
@@ -219,6 +220,7 @@ class VirtualBox(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+            self._unindexNode(node)
 
     def settings(self):
         """
@@ -293,8 +295,8 @@ class VirtualBox(Module):
             # use the local server
             server = servers.localServer()
         else:
-            # pick up a remote server (round-robin method)
-            server = next(iter(servers))
+            # pick up the least loaded remote server
+            server = servers.allocateRemoteServer()
             if not server:
                 raise ModuleError("No remote server is configured")
         return server
@@ -310,13 +312,12 @@ class VirtualBox(Module):
         log.info("creating node {}".format(node_class))
 
         if not server.connected():
-            try:
-                log.info("reconnecting to server {}:{}".format(server.host, server.port))
-                server.reconnect()
-            except OSError as e:
-                raise ModuleError("Could not connect to server {}:{}: {}".format(server.host,
-                                                                                 server.port,
-                                                                                 e))
+            # requests are queued until the connection is established
+            log.info("connecting to server {}:{}".format(server.host, server.port))
+            server.connectAsync()
+            if not server.connected() and not server.isConnecting():
+                # the connection failed right away (e.g. connection refused)
+                raise ModuleError("Could not connect to server {}:{}".format(server.host, server.port))
         if server not in self._servers:
             self.addServer(server)
 
@@ -379,21 +380,23 @@ class VirtualBox(Module):
                 server.send_notification("virtualbox.reset")
         self._servers.clear()
         self._nodes.clear()
+        self._clearNodeIndex()
 
-    def notification(self, destination, params):
+    def notification(self, destination, params, server):
         """
         To received notifications from the server.
 
         :param destination: JSON-RPC method
         :param params: JSON-RPC params
+        :param server: WebSocketClient instance which sent the notification
         """
 
         if "id" in params:
-            for node in self._nodes:
-                if node.id() == params["id"]:
-                    message = "node {}: {}".format(node.name(), params["message"])
-                    self.notification_signal.emit(message, params["details"])
-                    node.stop()
+            node = self._findNode(server, "id", params["id"])
+            if node:
+                message = "node {}: {}".format(node.name(), params["message"])
+                self.notification_signal.emit(message, params["details"])
+                node.stop()
 
     def get_vm_list(self, server, callback):
         """
@@ -403,13 +406,12 @@ class VirtualBox(Module):
         :param callback: callback for the server response
         """
         if not server.connected():
-            try:
-                log.info("reconnecting to server {}:{}".format(server.host, server.port))
-                server.reconnect()
-            except OSError as e:
-                raise ModuleError("Could not connect to server {}:{}: {}".format(server.host,
-                                                                                 server.port,
-                                                                                 e))
+            # requests are queued until the connection is established
+            log.info("connecting to server {}:{}".format(server.host, server.port))
+            server.connectAsync()
+            if not server.connected() and not server.isConnecting():
+                # the connection failed right away (e.g. connection refused)
+                raise ModuleError("Could not connect to server {}:{}".format(server.host, server.port))
 
         server.send_message("virtualbox.vm_list", None, callback)
 
@@ -133,6 +133,7 @@ class VPCS(Module):
         """
 
         self._nodes.append(node)
+        self._indexNode(node)
 
     def removeNode(self, node):
         """
@@ -143,6 +144,7 @@ class VPCS(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+            self._unindexNode(node)
 
     def settings(self):
         """
@@ -220,8 +222,8 @@ class VPCS(Module):
             # use the local server
             server = servers.localServer()
         else:
-            # pick up a remote server (round-robin method)
-            server = next(iter(servers))
+            # pick up the least loaded remote server
+            server = servers.allocateRemoteServer()
             if not server:
                 raise ModuleError("No remote server is configured")
         return server
@@ -237,13 +239,12 @@ class VPCS(Module):
         log.info("creating node {}".format(node_class))
 
         if not server.connected():
-            try:
-                log.info("reconnecting to server {}:{}".format(server.host, server.port))
-                server.reconnect()
-            except OSError as e:
-                raise ModuleError("Could not connect to server {}:{}: {}".format(server.host,
-                                                                                 server.port,
-                                                                                 e))
+            # requests are queued until the connection is established
+            log.info("connecting to server {}:{}".format(server.host, server.port))
+            server.connectAsync()
+            if not server.connected() and not server.isConnecting():
+                # the connection failed right away (e.g. connection refused)
+                raise ModuleError("Could not connect to server {}:{}".format(server.host, server.port))
         if server not in self._servers:
             self.addServer(server)
 
@@ -278,21 +279,23 @@ class VPCS(Module):
                 server.send_notification("vpcs.reset")
         self._servers.clear()
         self._nodes.clear()
+        self._clearNodeIndex()
 
-    def notification(self, destination, params):
+    def notification(self, destination, params, server):
         """
         To received notifications from the server.
 
         :param destination: JSON-RPC method
         :param params: JSON-RPC params
+        :param server: WebSocketClient instance which sent the notification
         """
 
         if "id" in params:
-            for node in self._nodes:
-                if node.id() == params["id"]:
-                    message = "node {}: {}".format(node.name(), params["message"])
-                    self.notification_signal.emit(message, params["details"])
-                    node.stop()
+            node = self._findNode(server, "id", params["id"])
+            if node:
+                message = "node {}: {}".format(node.name(), params["message"])
+                self.notification_signal.emit(message, params["details"])
+                node.stop()
 
     def exportConfigs(self, directory):
         """
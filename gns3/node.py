@@ -37,6 +37,7 @@ class Node(QtCore.QObject):
     started_signal = QtCore.Signal()
     stopped_signal = QtCore.Signal()
     suspended_signal = QtCore.Signal()
+    reloaded_signal = QtCore.Signal()
     updated_signal = QtCore.Signal()
     deleted_signal = QtCore.Signal()
     delete_links_signal = QtCore.Signal()
@@ -220,6 +221,14 @@ class Node(QtCore.QObject):
 
         raise NotImplementedError()
 
+    def saveConfig(self):
+        """
+        Tells the server to save the node configurations.
+        Called each time the topology is saved, does nothing by default.
+        """
+
+        pass
+
     def load(self, node_info):
         """
         Loads a node representation
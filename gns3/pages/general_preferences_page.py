@@ -198,6 +198,9 @@ class GeneralPreferencesPage(QtGui.QWidget, Ui_GeneralPreferencesPageWidget):
         self.uiCheckForUpdateCheckBox.setChecked(settings["check_for_update"])
         self.uiLinkManualModeCheckBox.setChecked(settings["link_manual_mode"])
         self.uiSlowStartAllSpinBox.setValue(settings["slow_device_start_all"])
+        self.uiStartAllServerConcurrencySpinBox.setValue(settings["start_all_server_concurrency"])
+        self.uiStartAllNodeTypeConcurrencySpinBox.setValue(settings["start_all_node_type_concurrency"])
+        self.uiStartAllWaitForStartedCheckBox.setChecked(settings["start_all_wait_for_started"])
         self.uiTelnetConsoleCommandLineEdit.setText(settings["telnet_console_command"])
         self.uiTelnetConsoleCommandLineEdit.setCursorPosition(0)
         index = self.uiTelnetConsolePreconfiguredCommandComboBox.findData(settings["telnet_console_command"])
@@ -256,6 +259,9 @@ class GeneralPreferencesPage(QtGui.QWidget, Ui_GeneralPreferencesPageWidget):
         new_settings["check_for_update"] = self.uiCheckForUpdateCheckBox.isChecked()
         new_settings["link_manual_mode"] = self.uiLinkManualModeCheckBox.isChecked()
         new_settings["slow_device_start_all"] = self.uiSlowStartAllSpinBox.value()
+        new_settings["start_all_server_concurrency"] = self.uiStartAllServerConcurrencySpinBox.value()
+        new_settings["start_all_node_type_concurrency"] = self.uiStartAllNodeTypeConcurrencySpinBox.value()
+        new_settings["start_all_wait_for_started"] = self.uiStartAllWaitForStartedCheckBox.isChecked()
         new_settings["telnet_console_command"] = self.uiTelnetConsoleCommandLineEdit.text()
         new_settings["serial_console_command"] = self.uiSerialConsoleCommandLineEdit.text()
         new_settings["auto_close_console"] = self.uiCloseConsoleWindowsOnDeleteCheckBox.isChecked()
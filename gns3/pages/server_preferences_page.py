@@ -70,6 +70,11 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
         if index != -1:
             self.uiLocalServerHostComboBox.setCurrentIndex(index)
 
+        # policies to choose the remote server of a new node
+        self.uiAllocationPolicyComboBox.addItem("Fewest nodes", "least_nodes")
+        self.uiAllocationPolicyComboBox.addItem("Least RAM used", "least_ram")
+        self.uiAllocationPolicyComboBox.addItem("Fewest nodes relative to the server weight", "weighted_capacity")
+
     def _testSettingsSlot(self):
 
         QtGui.QMessageBox.critical(self, "Test settings", "Sorry, not yet implemented!")
@@ -85,6 +90,12 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
         self.uiLocalServerPortSpinBox.setValue(DEFAULT_LOCAL_SERVER_PORT)
         self.uiLocalServerPathLineEdit.setText(DEFAULT_LOCAL_SERVER_PATH)
         self.uiLocalServerAutoStartCheckBox.setChecked(True)
+        self.uiBatchRequestsCheckBox.setChecked(False)
+        self.uiBinaryTransportCheckBox.setChecked(True)
+        self.uiHeartbeatIntervalSpinBox.setValue(5)
+        self.uiRequestTimeoutSpinBox.setValue(60)
+        self.uiAllocationPolicyComboBox.setCurrentIndex(self.uiAllocationPolicyComboBox.findData("least_nodes"))
+        self.uiOptimizePlacementCheckBox.setChecked(False)
 
     def _localServerBrowserSlot(self):
         """
@@ -110,8 +121,10 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
 
         host = item.text(0)
         port = int(item.text(1))
+        weight = float(item.text(2))
         self.uiRemoteServerPortLineEdit.setText(host)
         self.uiRemoteServerPortSpinBox.setValue(port)
+        self.uiRemoteServerWeightDoubleSpinBox.setValue(weight)
 
     def _remoteServerChangedSlot(self):
         """
@@ -129,12 +142,9 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
         Adds a new remote server.
         """
 
-        if len(self._remote_servers) == 1:
-            QtGui.QMessageBox.critical(self, "Remote server", "Sorry we do not support multiple remote servers yet!")
-            return
-
         host = self.uiRemoteServerPortLineEdit.text()
         port = self.uiRemoteServerPortSpinBox.value()
+        weight = self.uiRemoteServerWeightDoubleSpinBox.value()
 
         # check if the remote server is already defined
         remote_server = "{host}:{port}".format(host=host, port=port)
@@ -146,10 +156,12 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
         item = QtGui.QTreeWidgetItem(self.uiRemoteServersTreeWidget)
         item.setText(0, host)
         item.setText(1, str(port))
+        item.setText(2, str(weight))
 
         # keep track of this remote server
         self._remote_servers[remote_server] = {"host": host,
-                                               "port": port}
+                                               "port": port,
+                                               "weight": weight}
 
         self.uiRemoteServerPortSpinBox.setValue(self.uiRemoteServerPortSpinBox.value() + 1)
         self.uiRemoteServersTreeWidget.resizeColumnToContents(0)
@@ -190,14 +202,27 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
         for server_id, server in servers.remoteServers().items():
             host = server.host
             port = server.port
+            weight = servers.remoteServerWeight(server)
             self._remote_servers[server_id] = {"host": host,
-                                               "port": port}
+                                               "port": port,
+                                               "weight": weight}
             item = QtGui.QTreeWidgetItem(self.uiRemoteServersTreeWidget)
             item.setText(0, host)
             item.setText(1, str(port))
+            item.setText(2, str(weight))
 
         self.uiRemoteServersTreeWidget.resizeColumnToContents(0)
 
+        # load the advanced preferences
+        self.uiBatchRequestsCheckBox.setChecked(servers.batchRequests())
+        self.uiBinaryTransportCheckBox.setChecked(servers.binaryTransport())
+        self.uiHeartbeatIntervalSpinBox.setValue(servers.heartbeatInterval())
+        self.uiRequestTimeoutSpinBox.setValue(servers.requestTimeout())
+        index = self.uiAllocationPolicyComboBox.findData(servers.allocationPolicy())
+        if index != -1:
+            self.uiAllocationPolicyComboBox.setCurrentIndex(index)
+        self.uiOptimizePlacementCheckBox.setChecked(servers.optimizePlacement())
+
     def savePreferences(self):
         """
         Saves the server preferences.
@@ -249,4 +274,12 @@ class ServerPreferencesPage(QtGui.QWidget, Ui_ServerPreferencesPageWidget):
 
         # save the remote server preferences
         servers.updateRemoteServers(self._remote_servers)
+
+        # save the advanced preferences
+        servers.setBatchRequests(self.uiBatchRequestsCheckBox.isChecked())
+        servers.setBinaryTransport(self.uiBinaryTransportCheckBox.isChecked())
+        servers.setHeartbeatInterval(self.uiHeartbeatIntervalSpinBox.value())
+        servers.setRequestTimeout(self.uiRequestTimeoutSpinBox.value())
+        servers.setAllocationPolicy(self.uiAllocationPolicyComboBox.itemData(self.uiAllocationPolicyComboBox.currentIndex()))
+        servers.setOptimizePlacement(self.uiOptimizePlacementCheckBox.isChecked())
         servers.save()
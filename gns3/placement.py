@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Placement of the nodes of a topology on the servers, so that as few
+links as possible are UDP tunnels between two servers.
+"""
+
+import math
+from collections import Counter, OrderedDict, deque
+
+# a server may get up to 20% more nodes than its share (given by its weight)
+BALANCE_TOLERANCE = 1.2
+
+# maximum number of label propagation rounds
+COMMUNITY_ROUNDS = 20
+
+# maximum number of refinement passes
+REFINEMENT_PASSES = 10
+
+
+def _neighbors(nodes, links):
+    """
+    Returns the neighbors of each node, a node linked
+    several times to another one has it several times.
+
+    :param nodes: iterable of node IDs
+    :param links: iterable of (node ID, node ID) tuples
+
+    :returns: dictionary node ID -> list of node IDs
+    """
+
+    neighbors = OrderedDict((node, []) for node in nodes)
+    for source, destination in links:
+        if source == destination or source not in neighbors or destination not in neighbors:
+            continue
+        neighbors[source].append(destination)
+        neighbors[destination].append(source)
+    return neighbors
+
+
+def crossLinks(assignment, links):
+    """
+    Returns the number of links between nodes on different servers.
+
+    :param assignment: dictionary node ID -> server
+    :param links: iterable of (node ID, node ID) tuples
+
+    :returns: integer
+    """
+
+    return sum(1 for source, destination in links
+               if source in assignment and destination in assignment and assignment[source] != assignment[destination])
+
+
+def detectCommunities(nodes, links, rounds=COMMUNITY_ROUNDS):
+    """
+    Groups the nodes which are densely linked together (label propagation:
+    each node takes the label shared by most of its neighbors). A link
+    counts more when both nodes have neighbors in common, so that groups
+    do not spread over the links between them. The result only depends
+    on the order of the nodes.
+
+    :param nodes: list of node IDs
+    :param links: iterable of (node ID, node ID) tuples
+    :param rounds: maximum number of rounds
+
+    :returns: list of communities (lists of node IDs), in the order of their first node
+    """
+
+    neighbors = _neighbors(nodes, links)
+    neighbor_sets = {node: set(node_neighbors) for node, node_neighbors in neighbors.items()}
+    rank = {node: index for index, node in enumerate(neighbors)}
+    labels = {node: node for node in neighbors}
+    for _ in range(rounds):
+        changed = False
+        for node, node_neighbors in neighbors.items():
+            if not node_neighbors:
+                continue
+            counts = Counter()
+            for neighbor in node_neighbors:
+                counts[labels[neighbor]] += 1 + len(neighbor_sets[node] & neighbor_sets[neighbor])
+            best = max(counts.values())
+            if counts.get(labels[node]) == best:
+                continue
+            labels[node] = min((label for label, count in counts.items() if count == best), key=rank.get)
+            changed = True
+        if not changed:
+            break
+
+    communities = OrderedDict()
+    for node in neighbors:
+        communities.setdefault(labels[node], []).append(node)
+    return list(communities.values())
+
+
+def _breadthFirst(community, neighbors):
+    """
+    Orders the nodes of a community so that linked nodes follow each other.
+
+    :param community: list of node IDs
+    :param neighbors: dictionary node ID -> list of node IDs
+
+    :returns: list of node IDs
+    """
+
+    members = set(community)
+    ordered = []
+    seen = set()
+    for start in community:
+        if start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            ordered.append(node)
+            for neighbor in neighbors[node]:
+                if neighbor in members and neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+    return ordered
+
+
+def placeNodes(nodes, links, servers, fixed=None, current=None, balance=BALANCE_TOLERANCE):
+    """
+    Assigns nodes to servers, keeping linked nodes on the same server
+    while sharing the nodes between the servers according to their weight.
+
+    The densely linked groups of nodes are found first and each group is
+    placed on the server it is the most linked to (if the server has room
+    for it, otherwise the group is split). Nodes are then moved one by one
+    to another server as long as it removes cross-server links. Between
+    equally good servers, nodes stay where they currently are.
+
+    :param nodes: list of node IDs to place
+    :param links: iterable of (node ID, node ID) tuples
+    :param servers: dictionary server -> weight (relative capacity > 0)
+    :param fixed: dictionary node ID -> server of the nodes which cannot be moved
+    :param current: dictionary node ID -> server the nodes to place are currently on
+    :param balance: share of the nodes a server may get over its weight
+
+    :returns: dictionary node ID -> server for the nodes to place
+    """
+
+    if not servers:
+        raise ValueError("No server to place the nodes on")
+
+    fixed = fixed or {}
+    current = current or {}
+    links = list(links)
+    neighbors = _neighbors(list(nodes) + [node for node in fixed if node not in set(nodes)], links)
+
+    total_weight = sum(servers.values())
+    total_nodes = len(nodes) + sum(1 for server in fixed.values() if server in servers)
+    capacity = {}
+    for server, weight in servers.items():
+        capacity[server] = max(1, math.ceil(total_nodes * weight / total_weight * balance))
+    load = dict.fromkeys(servers, 0)
+    for server in fixed.values():
+        if server in load:
+            load[server] += 1
+
+    assignment = dict(fixed)
+
+    def affinity(node_group):
+        # number of links from a group of nodes to each server
+        counts = Counter()
+        for node in node_group:
+            for neighbor in neighbors[node]:
+                if neighbor in assignment:
+                    counts[assignment[neighbor]] += 1
+        return counts
+
+    def free(server):
+        return capacity[server] - load[server]
+
+    def assign(node, server):
+        assignment[node] = server
+        load[server] += 1
+
+    # the biggest groups first, while the servers have room for them
+    communities = detectCommunities(list(nodes), links)
+    for community in sorted(communities, key=len, reverse=True):
+        counts = affinity(community)
+        staying = Counter(current.get(node) for node in community)
+        candidates = [server for server in servers if free(server) >= len(community)]
+        if candidates:
+            server = max(candidates, key=lambda server: (counts[server], staying[server], free(server) / servers[server]))
+            for node in community:
+                assign(node, server)
+            continue
+
+        # too big for any server: split it, neighbors first
+        for node in _breadthFirst(community, neighbors):
+            counts = affinity([node])
+            candidates = [server for server in servers if free(server) > 0] or list(servers)
+            server = max(candidates, key=lambda server: (counts[server], current.get(node) == server, free(server)))
+            assign(node, server)
+
+    # move the nodes more linked to another server than to their own
+    for _ in range(REFINEMENT_PASSES):
+        moved = False
+        for node in nodes:
+            assigned = assignment[node]
+            counts = affinity([node])
+            best = assigned
+            best_gain = 0
+            for server in servers:
+                if server == assigned or free(server) <= 0:
+                    continue
+                gain = counts[server] - counts[assigned]
+                if gain > best_gain:
+                    best = server
+                    best_gain = gain
+            if best != assigned:
+                load[assigned] -= 1
+                assign(node, best)
+                moved = True
+        if not moved:
+            break
+
+    return {node: assignment[node] for node in nodes}
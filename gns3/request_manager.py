@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Keeps track of the JSON-RPC requests sent to a server: timeouts,
+retries of idempotent requests, cancellation and response time metrics.
+"""
+
+import time
+import fnmatch
+from collections import OrderedDict, deque
+
+import logging
+log = logging.getLogger(__name__)
+
+# JSON-RPC error codes given to the callbacks of failed requests
+CONNECTION_ERROR_CODE = -32000
+REQUEST_TIMEOUT_CODE = -32001
+TOO_MANY_REQUESTS_CODE = -32002
+
+# maximum number of requests sent and waiting for a reply,
+# the next ones wait for a reply to be received
+MAX_OUTSTANDING_REQUESTS = 500
+
+# maximum number of requests waiting to be sent
+MAX_WAITING_REQUESTS = 5000
+
+# seconds to wait for a reply to methods slower than most
+# (the first matching pattern applies, the default timeout otherwise)
+METHOD_TIMEOUTS = [("dynamips.vm.idlepcs", 300),
+                   ("*.create", 120),
+                   ("*.start", 120),
+                   ("*.stop", 120),
+                   ("*.reload", 120),
+                   ("*.export_config", 120),
+                   ("*_list", 120)]
+
+# methods which can be sent again without side effects
+IDEMPOTENT_METHODS = ["*.start",
+                      "*.stop",
+                      "*.suspend",
+                      "*.update",
+                      "*.export_config",
+                      "*_list",
+                      "dynamips.vm.idlepcs",
+                      "builtin.interfaces"]
+
+# number of times an idempotent request is sent again
+MAX_RETRIES = 2
+
+
+def isIdempotent(method):
+    """
+    Returns either a method can be sent again without side effects.
+
+    :param method: JSON-RPC method
+
+    :returns: boolean
+    """
+
+    for pattern in IDEMPOTENT_METHODS:
+        if fnmatch.fnmatchcase(method, pattern):
+            return True
+    return False
+
+
+class PendingRequest(object):
+    """
+    Request waiting for a reply.
+
+    :param request: JSONRPCRequest instance
+    :param callback: method to call with the reply
+    :param timeout: seconds to wait for the reply
+    :param retries: number of times the request can be sent again
+    """
+
+    def __init__(self, request, callback, timeout, retries):
+
+        self.request = request
+        self.callback = callback
+        self.timeout = timeout
+        self.retries = retries
+        self.created = time.time()
+        self.sent = None
+
+
+class MethodMetrics(object):
+    """
+    Response time statistics of a JSON-RPC method.
+    """
+
+    def __init__(self):
+
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.retries = 0
+        self.timeouts = 0
+
+    def average(self):
+        """
+        Returns the average response time.
+
+        :returns: seconds (float)
+        """
+
+        if not self.count:
+            return 0.0
+        return self.total_time / self.count
+
+
+class RequestManager(object):
+    """
+    Tracks the requests sent to a server.
+
+    At most max_outstanding requests are sent without a reply, the
+    next ones are sent as replies are received. Requests without a reply
+    in time are failed or, for idempotent methods, sent again. When the
+    connection is lost, idempotent requests are kept to be sent again
+    once reconnected.
+
+    :param send: method sending a request to the server
+    :param default_timeout: seconds to wait for a reply (0 means no timeout)
+    :param max_outstanding: maximum number of requests waiting for a reply
+    """
+
+    def __init__(self, send, default_timeout=60, max_outstanding=MAX_OUTSTANDING_REQUESTS):
+
+        self._send = send
+        self._default_timeout = default_timeout
+        self._max_outstanding = max_outstanding
+        self._outstanding = OrderedDict()
+        self._waiting = deque()
+        self._retained = OrderedDict()
+        self._canceled = deque(maxlen=100)
+        self._metrics = {}
+
+    def setDefaultTimeout(self, timeout):
+        """
+        Sets the time to wait for a reply for most methods.
+
+        :param timeout: seconds (0 means no timeout)
+        """
+
+        self._default_timeout = timeout
+
+    def timeout(self, method):
+        """
+        Returns the time to wait for a reply to a method.
+
+        :param method: JSON-RPC method
+
+        :returns: seconds (0 means no timeout)
+        """
+
+        if not self._default_timeout:
+            return 0
+        for pattern, timeout in METHOD_TIMEOUTS:
+            if fnmatch.fnmatchcase(method, pattern):
+                return max(timeout, self._default_timeout)
+        return self._default_timeout
+
+    def add(self, request, callback, timeout=None):
+        """
+        Sends a request, or waits for replies if there are too many
+        requests without a reply.
+
+        :param request: JSONRPCRequest instance
+        :param callback: method to call with the reply
+        :param timeout: seconds to wait for a reply (default depends on the method)
+
+        :returns: request ID
+        """
+
+        method = request.method
+        if timeout is None:
+            timeout = self.timeout(method)
+        pending = PendingRequest(request, callback, timeout, MAX_RETRIES if isIdempotent(method) else 0)
+        if len(self._outstanding) < self._max_outstanding:
+            self._dispatch(pending)
+        elif len(self._waiting) < MAX_WAITING_REQUESTS:
+            self._waiting.append(pending)
+        else:
+            log.warning("too many requests waiting to be sent, {} is dropped".format(method))
+            self._fail(pending, TOO_MANY_REQUESTS_CODE, "Too many requests waiting to be sent")
+        return request.id
+
+    def _dispatch(self, pending):
+        """
+        Sends a request.
+
+        :param pending: PendingRequest instance
+        """
+
+        pending.sent = time.time()
+        self._outstanding[pending.request.id] = pending
+        self._send(pending.request)
+
+    def _sendWaiting(self):
+        """
+        Sends the waiting requests allowed to.
+        """
+
+        while self._waiting and len(self._outstanding) < self._max_outstanding:
+            self._dispatch(self._waiting.popleft())
+
+    def _metricsFor(self, method):
+        """
+        Returns the metrics of a method.
+
+        :param method: JSON-RPC method
+
+        :returns: MethodMetrics instance
+        """
+
+        if method not in self._metrics:
+            self._metrics[method] = MethodMetrics()
+        return self._metrics[method]
+
+    def complete(self, request_id):
+        """
+        Stops tracking a request once its reply has been received.
+
+        :param request_id: JSON-RPC request ID
+
+        :returns: callback of the request or None if unknown
+        """
+
+        pending = self._outstanding.pop(request_id, None)
+        if pending is None:
+            if request_id not in self._canceled:
+                log.warning("unknown JSON-RPC request ID received {}".format(request_id))
+            return None
+
+        # a request sent again may get several replies
+        self._canceled.append(request_id)
+        metrics = self._metricsFor(pending.request.method)
+        elapsed = time.time() - pending.sent
+        metrics.count += 1
+        metrics.total_time += elapsed
+        metrics.max_time = max(metrics.max_time, elapsed)
+        self._sendWaiting()
+        return pending.callback
+
+    def _fail(self, pending, code, message):
+        """
+        Calls the callback of a request with an error.
+
+        :param pending: PendingRequest instance
+        :param code: JSON-RPC error code
+        :param message: error message
+        """
+
+        if pending.callback:
+            pending.callback({"code": code, "message": message}, True)
+
+    def _remove(self, request_id):
+        """
+        Stops tracking a request.
+
+        :param request_id: JSON-RPC request ID
+
+        :returns: PendingRequest instance or None
+        """
+
+        pending = self._outstanding.pop(request_id, None) or self._retained.pop(request_id, None)
+        if pending is None:
+            for waiting in self._waiting:
+                if waiting.request.id == request_id:
+                    pending = waiting
+                    self._waiting.remove(waiting)
+                    break
+        return pending
+
+    def cancel(self, request_id):
+        """
+        Cancels a request, its callback will not be called.
+
+        :param request_id: JSON-RPC request ID
+
+        :returns: True if the request was pending
+        """
+
+        pending = self._remove(request_id)
+        if pending is None:
+            return False
+        self._canceled.append(request_id)
+        self._sendWaiting()
+        return True
+
+    def cancelFor(self, receiver):
+        """
+        Cancels the requests whose callback is a method of an object
+        (e.g. a node being deleted).
+
+        :param receiver: object
+
+        :returns: number of canceled requests
+        """
+
+        request_ids = [pending.request.id for pending in self.pendingRequests()
+                       if getattr(pending.callback, "__self__", None) is receiver]
+        for request_id in request_ids:
+            self.cancel(request_id)
+        return len(request_ids)
+
+    def fail(self, request_id, code, message):
+        """
+        Fails a request.
+
+        :param request_id: JSON-RPC request ID
+        :param code: JSON-RPC error code
+        :param message: error message
+        """
+
+        pending = self._remove(request_id)
+        if pending:
+            self._canceled.append(request_id)
+            self._fail(pending, code, message)
+            self._sendWaiting()
+
+    def pendingRequests(self):
+        """
+        Returns the requests without a reply.
+
+        :returns: list of PendingRequest instances
+        """
+
+        return list(self._outstanding.values()) + list(self._waiting) + list(self._retained.values())
+
+    def expire(self):
+        """
+        Sends again or fails the requests without a reply in time.
+
+        :returns: number of failed requests
+        """
+
+        now = time.time()
+        expired = []
+        for pending in self._outstanding.values():
+            if pending.timeout and now - pending.sent > pending.timeout:
+                expired.append(pending)
+        for pending in self._retained.values():
+            if pending.timeout and now - pending.sent > pending.timeout:
+                expired.append(pending)
+
+        failed = 0
+        for pending in expired:
+            request_id = pending.request.id
+            method = pending.request.method
+            if request_id in self._outstanding and pending.retries:
+                log.warning("no reply to {} after {} seconds, sending it again".format(method, pending.timeout))
+                pending.retries -= 1
+                self._metricsFor(method).retries += 1
+                del self._outstanding[request_id]
+                self._dispatch(pending)
+                continue
+            log.warning("no reply to {} after {} seconds".format(method, pending.timeout))
+            self._metricsFor(method).timeouts += 1
+            self.fail(request_id, REQUEST_TIMEOUT_CODE, "No reply to {} in time".format(method))
+            failed += 1
+        return failed
+
+    def failOutstanding(self, message):
+        """
+        Fails the requests sent or waiting to be sent
+        (the requests kept for a reconnection are not).
+
+        :param message: error message
+        """
+
+        pending_requests = list(self._outstanding.values()) + list(self._waiting)
+        self._outstanding.clear()
+        self._waiting.clear()
+        for pending in pending_requests:
+            self._canceled.append(pending.request.id)
+            self._fail(pending, CONNECTION_ERROR_CODE, message)
+
+    def connectionLost(self, message):
+        """
+        Keeps the idempotent requests to be sent again
+        once reconnected and fails the others.
+
+        :param message: error message
+        """
+
+        pending_requests = list(self._outstanding.values()) + list(self._waiting)
+        self._outstanding.clear()
+        self._waiting.clear()
+        for pending in pending_requests:
+            if pending.retries:
+                pending.retries -= 1
+                self._metricsFor(pending.request.method).retries += 1
+                if pending.sent is None:
+                    pending.sent = time.time()
+                self._retained[pending.request.id] = pending
+            else:
+                self._canceled.append(pending.request.id)
+                self._fail(pending, CONNECTION_ERROR_CODE, message)
+
+    def reconnected(self):
+        """
+        Sends again the requests kept since the connection was lost.
+        """
+
+        if self._retained:
+            log.info("sending {} requests again after reconnection".format(len(self._retained)))
+        self._waiting.extendleft(reversed(list(self._retained.values())))
+        self._retained.clear()
+        self._sendWaiting()
+
+    def metrics(self):
+        """
+        Returns the response time statistics of each method.
+
+        :returns: dictionary of MethodMetrics instances
+        """
+
+        return self._metrics
+
+    def slowMethods(self, count=5):
+        """
+        Returns the methods with the longest average response time.
+
+        :param count: number of methods to return
+
+        :returns: list of (method, MethodMetrics instance) tuples
+        """
+
+        methods = sorted(self._metrics.items(), key=lambda item: item[1].average(), reverse=True)
+        return methods[:count]
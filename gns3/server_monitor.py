@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Health monitor for the connection with a server: heartbeats,
+latency measurement, request expiration and automatic reconnection.
+"""
+
+import time
+import random
+
+from .qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+# maximum seconds between two reconnection attempts
+MAX_RECONNECT_DELAY = 60
+
+# seconds before the first new attempt when probing a server
+# (e.g. a local server process just started)
+PROBE_FIRST_DELAY = 0.1
+
+# maximum seconds between two attempts when probing a server
+MAX_PROBE_DELAY = 2
+
+
+class ServerMonitor(QtCore.QObject):
+    """
+    Monitors the connection with a server.
+
+    A WebSocket ping is sent at each heartbeat, the connection is
+    considered lost when two heartbeats pass without a pong. Once a
+    connection has been established, it is automatically re-established
+    with an exponential backoff when it is lost.
+
+    :param server: WebSocketClient instance
+    :param heartbeat_interval: seconds between two pings
+    """
+
+    # connection status
+    disconnected = 0
+    connecting = 1
+    connected = 2
+    reconnecting = 3
+
+    # emitted when the status or the latency has changed
+    status_signal = QtCore.Signal()
+
+    # emitted when a probe has not reached the server in time, with the last error
+    probe_failed_signal = QtCore.Signal(str)
+
+    def __init__(self, server, heartbeat_interval=5):
+
+        super(ServerMonitor, self).__init__()
+        self._server = server
+        self._latency = None
+        self._ping_data = None
+        self._ping_time = 0
+        self._ping_count = 0
+        self._reconnect_delay = 0
+        self._auto_reconnect = False
+        self._probe_deadline = None
+
+        self._heartbeat_timer = QtCore.QTimer(self)
+        self._heartbeat_timer.timeout.connect(self._heartbeatSlot)
+        self.setHeartbeatInterval(heartbeat_interval)
+        self._reconnect_timer = QtCore.QTimer(self)
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.timeout.connect(self._reconnectSlot)
+
+        signals = server.signals()
+        signals.connected_signal.connect(self._connectedSlot)
+        signals.connection_error_signal.connect(self._connectionErrorSlot)
+        signals.disconnected_signal.connect(self._disconnectedSlot)
+        signals.pong_signal.connect(self._pongSlot)
+        self._heartbeat_timer.start()
+
+    def server(self):
+        """
+        Returns the monitored server.
+
+        :returns: WebSocketClient instance
+        """
+
+        return self._server
+
+    def status(self):
+        """
+        Returns the connection status.
+
+        :returns: status (integer)
+        """
+
+        if self._server.connected():
+            return self.connected
+        if self._server.isConnecting():
+            return self.connecting
+        if self._reconnect_timer.isActive():
+            return self.reconnecting
+        return self.disconnected
+
+    def statusText(self):
+        """
+        Returns a description of the connection status.
+
+        :returns: string
+        """
+
+        status = self.status()
+        if status == self.connected:
+            if self._latency is None:
+                return "connected"
+            return "connected ({:.0f} ms)".format(self._latency * 1000)
+        if status == self.connecting:
+            return "connecting"
+        if status == self.reconnecting:
+            return "disconnected, reconnecting in {:g} seconds".format(self._reconnect_delay)
+        return "disconnected"
+
+    def latency(self):
+        """
+        Returns the round-trip time measured with the heartbeats,
+        smoothed over the last measures.
+
+        :returns: seconds (float) or None if not measured yet
+        """
+
+        return self._latency
+
+    def setHeartbeatInterval(self, interval):
+        """
+        Sets the interval between two heartbeats.
+
+        :param interval: seconds
+        """
+
+        self._heartbeat_interval = interval
+        self._heartbeat_timer.setInterval(interval * 1000)
+
+    def probe(self, timeout):
+        """
+        Connects to the server, trying again with an exponential
+        backoff until connected or the timeout has elapsed (then the
+        probe_failed_signal signal is emitted).
+
+        :param timeout: seconds
+        """
+
+        if self._server.connected():
+            return
+        self._probe_deadline = time.time() + timeout
+        self._reconnect_delay = 0
+        if not self._reconnect_timer.isActive():
+            self._server.connectAsync()
+        self.status_signal.emit()
+
+    def isProbing(self):
+        """
+        Returns either the server is being probed.
+
+        :returns: boolean
+        """
+
+        return self._probe_deadline is not None
+
+    def stop(self):
+        """
+        Stops monitoring the server.
+        """
+
+        self._heartbeat_timer.stop()
+        self._reconnect_timer.stop()
+        self._auto_reconnect = False
+        self._probe_deadline = None
+        signals = self._server.signals()
+        signals.connected_signal.disconnect(self._connectedSlot)
+        signals.connection_error_signal.disconnect(self._connectionErrorSlot)
+        signals.disconnected_signal.disconnect(self._disconnectedSlot)
+        signals.pong_signal.disconnect(self._pongSlot)
+
+    def _heartbeatSlot(self):
+        """
+        Slot called at each heartbeat.
+        """
+
+        # requests without a reply in time are sent again or failed
+        self._server.expireRequests()
+
+        if not self._server.connected():
+            return
+
+        if self._ping_data is not None:
+            if time.time() - self._ping_time > 2 * self._heartbeat_interval:
+                self._server.connectionLost("no answer to the heartbeats")
+            return
+
+        self._ping_count += 1
+        self._ping_data = str(self._ping_count).encode("ascii")
+        self._ping_time = time.time()
+        self._server.ping(self._ping_data)
+
+    def _pongSlot(self, data):
+        """
+        Slot called when a pong has been received.
+
+        :param data: pong payload
+        """
+
+        if data != self._ping_data:
+            return
+
+        rtt = time.time() - self._ping_time
+        self._ping_data = None
+        if self._latency is None:
+            self._latency = rtt
+        else:
+            self._latency = 0.8 * self._latency + 0.2 * rtt
+        self.status_signal.emit()
+
+    def _connectedSlot(self):
+        """
+        Slot called when the server is connected.
+        """
+
+        self._reconnect_delay = 0
+        self._ping_data = None
+        self._auto_reconnect = True
+        self._probe_deadline = None
+        self.status_signal.emit()
+
+    def _connectionErrorSlot(self, error_number, message):
+        """
+        Slot called when a connection attempt has failed.
+
+        :param error_number: socket error number
+        :param message: error message
+        """
+
+        if self._probe_deadline is not None:
+            if time.time() < self._probe_deadline:
+                self._scheduleReconnect(PROBE_FIRST_DELAY, MAX_PROBE_DELAY, self._probe_deadline)
+            else:
+                self._probe_deadline = None
+                self.probe_failed_signal.emit(message)
+                if self._auto_reconnect:
+                    self._scheduleReconnect()
+        elif self._auto_reconnect:
+            self._scheduleReconnect()
+        self.status_signal.emit()
+
+    def _disconnectedSlot(self, reason):
+        """
+        Slot called when the connection has been lost.
+
+        :param reason: reason of the connection loss
+        """
+
+        self._latency = None
+        self._ping_data = None
+        if self._auto_reconnect:
+            self._scheduleReconnect()
+        self.status_signal.emit()
+
+    def _scheduleReconnect(self, first_delay=1, max_delay=MAX_RECONNECT_DELAY, deadline=None):
+        """
+        Schedules a reconnection attempt, waiting twice as long
+        as the previous time. Some randomness is added so the servers
+        lost at the same time (e.g. network outage) are not all
+        reconnected at the same time.
+
+        :param first_delay: seconds to wait before the first attempt
+        :param max_delay: maximum seconds to wait
+        :param deadline: time after which no attempt is scheduled (the last one is made at that time)
+        """
+
+        self._reconnect_delay = min(max_delay, max(first_delay, self._reconnect_delay * 2))
+        delay = self._reconnect_delay * random.uniform(1.0, 1.25)
+        if deadline is not None:
+            delay = max(0, min(delay, deadline - time.time()))
+        log.info("reconnecting to server {}:{} in {:g} seconds".format(self._server.host, self._server.port, delay))
+        self._reconnect_timer.start(int(delay * 1000))
+
+    def _reconnectSlot(self):
+        """
+        Slot called to try to reconnect to the server.
+        """
+
+        self._server.connectAsync()
+        self.status_signal.emit()
@@ -21,12 +21,11 @@ Keeps track of all the local and remote servers and their settings.
 
 import os
 import sys
-import shlex
-import signal
 import socket
-import subprocess
 from .qt import QtCore
-from .websocket_client import WebSocketClient
+from .connection_pool import ConnectionPool
+from .server_monitor import ServerMonitor
+from .local_server_supervisor import LocalServerSupervisor
 from .settings import DEFAULT_LOCAL_SERVER_PATH
 from .settings import DEFAULT_LOCAL_SERVER_HOST
 from .settings import DEFAULT_LOCAL_SERVER_PORT
@@ -34,6 +33,64 @@ from .settings import DEFAULT_LOCAL_SERVER_PORT
 import logging
 log = logging.getLogger(__name__)
 
+# seconds to keep trying to connect to a server which is starting
+PROBE_TIMEOUT = 30
+
+
+class AllocationPolicy(object):
+    """
+    Base class for the policies choosing a remote server for a new node.
+    The server with the lowest score is chosen.
+    """
+
+    def score(self, load, weight):
+        """
+        Returns the score of a server.
+
+        :param load: server load (dictionary with "nodes" and "ram" keys)
+        :param weight: server relative capacity (float)
+
+        :returns: score (number)
+        """
+
+        raise NotImplementedError()
+
+
+class LeastNodesPolicy(AllocationPolicy):
+    """
+    Chooses the server with the fewest nodes.
+    """
+
+    def score(self, load, weight):
+
+        return load["nodes"]
+
+
+class LeastRAMPolicy(AllocationPolicy):
+    """
+    Chooses the server with the least RAM committed to its nodes.
+    """
+
+    def score(self, load, weight):
+
+        return load["ram"], load["nodes"]
+
+
+class WeightedCapacityPolicy(AllocationPolicy):
+    """
+    Chooses the server with the fewest nodes relative to its capacity,
+    e.g. a server with a weight of 2 gets twice as many nodes.
+    """
+
+    def score(self, load, weight):
+
+        return (load["nodes"] + 1) / weight
+
+
+ALLOCATION_POLICIES = {"least_nodes": LeastNodesPolicy,
+                       "least_ram": LeastRAMPolicy,
+                       "weighted_capacity": WeightedCapacityPolicy}
+
 
 class Servers(QtCore.QObject):
     """
@@ -43,6 +100,13 @@ class Servers(QtCore.QObject):
     # to let other pages know about remote server updates
     updated_signal = QtCore.Signal()
 
+    # results of the asynchronous connections (server ID and error message)
+    server_connected_signal = QtCore.Signal(int)
+    server_connection_error_signal = QtCore.Signal(int, str)
+
+    # the connection status or latency of a server has changed (server ID)
+    server_status_signal = QtCore.Signal(int)
+
     def __init__(self):
 
         super(Servers, self).__init__()
@@ -50,9 +114,21 @@ class Servers(QtCore.QObject):
         self._remote_servers = {}
         self._local_server_path = ""
         self._local_server_auto_start = True
-        self._local_server_proccess = None
+        self._supervisor = None
+        self._batch_requests = False
+        self._binary_transport = True
+        self._remote_server_weights = {}
+        self._allocation_policy = "least_nodes"
+        self._optimize_placement = False
+        # load of each server: number of nodes and RAM committed
+        self._server_loads = {}
+        self._node_loads = {}
+        self._monitors = {}
+        self._relays = {}
+        self._pool = ConnectionPool()
+        self._heartbeat_interval = 5
+        self._request_timeout = 60
         self._loadSettings()
-        self._remote_server_iter_pos = 0
 
     def _loadSettings(self):
         """
@@ -75,6 +151,14 @@ class Servers(QtCore.QObject):
         local_server_port = settings.value("local_server_port", DEFAULT_LOCAL_SERVER_PORT, type=int)
         local_server_path = settings.value("local_server_path", DEFAULT_LOCAL_SERVER_PATH)
         local_server_auto_start = settings.value("local_server_auto_start", True, type=bool)
+        self._batch_requests = settings.value("batch_requests", False, type=bool)
+        self._binary_transport = settings.value("binary_transport", True, type=bool)
+        allocation_policy = settings.value("allocation_policy", "least_nodes")
+        if allocation_policy in ALLOCATION_POLICIES:
+            self._allocation_policy = allocation_policy
+        self._optimize_placement = settings.value("optimize_placement", False, type=bool)
+        self._heartbeat_interval = settings.value("heartbeat_interval", 5, type=int)
+        self._request_timeout = settings.value("request_timeout", 60, type=int)
         self.setLocalServer(local_server_path, local_server_host, local_server_port, local_server_auto_start)
 
         # load the remote servers
@@ -83,8 +167,9 @@ class Servers(QtCore.QObject):
             settings.setArrayIndex(index)
             host = settings.value("host", "")
             port = settings.value("port", 0, type=int)
+            weight = settings.value("weight", 1.0, type=float)
             if host and port:
-                self._addRemoteServer(host, port)
+                self._addRemoteServer(host, port, weight)
         settings.endArray()
         settings.endGroup()
 
@@ -104,14 +189,21 @@ class Servers(QtCore.QObject):
             settings.setValue("local_server_port", self._local_server.port)
             settings.setValue("local_server_path", self._local_server_path)
             settings.setValue("local_server_auto_start", self._local_server_auto_start)
+        settings.setValue("batch_requests", self._batch_requests)
+        settings.setValue("binary_transport", self._binary_transport)
+        settings.setValue("allocation_policy", self._allocation_policy)
+        settings.setValue("optimize_placement", self._optimize_placement)
+        settings.setValue("heartbeat_interval", self._heartbeat_interval)
+        settings.setValue("request_timeout", self._request_timeout)
 
         # save the remote servers
         settings.beginWriteArray("remote", len(self._remote_servers))
         index = 0
-        for server in self._remote_servers.values():
+        for server_socket, server in self._remote_servers.items():
             settings.setArrayIndex(index)
             settings.setValue("host", server.host)
             settings.setValue("port", server.port)
+            settings.setValue("weight", self._remote_server_weights.get(server_socket, 1.0))
             index += 1
         settings.endArray()
         settings.endGroup()
@@ -135,56 +227,99 @@ class Servers(QtCore.QObject):
 
         return self._local_server_path
 
+    def batchRequests(self):
+        """
+        Returns either the requests to the servers are
+        sent in JSON-RPC batches.
+
+        :returns: boolean
+        """
+
+        return self._batch_requests
+
+    def setBatchRequests(self, value):
+        """
+        Sets either the requests to the servers are
+        sent in JSON-RPC batches.
+
+        :param value: boolean
+        """
+
+        self._batch_requests = value
+        if self._local_server:
+            self._local_server.setBatchRequests(value)
+        for server in self._remote_servers.values():
+            server.setBatchRequests(value)
+
+    def binaryTransport(self):
+        """
+        Returns either the binary transport is offered to the servers.
+
+        :returns: boolean
+        """
+
+        return self._binary_transport
+
+    def setBinaryTransport(self, value):
+        """
+        Sets either the binary transport is offered to the servers
+        (used from their next connection).
+
+        :param value: boolean
+        """
+
+        self._binary_transport = value
+        for server in self.servers():
+            server.setBinaryTransport(value)
+
     def startLocalServer(self, path, host, port):
         """
         Starts the local server process.
         """
 
-        command = '"{executable}" --host={host} --port={port}'.format(executable=path, host=host, port=port)
-
-        # settings_dir = os.path.dirname(QtCore.QSettings().fileName())
-        # if os.path.isdir(settings_dir):
-        #     # save server logging info to a file in the settings directory
-        #     logpath = os.path.join(settings_dir, "GNS3_server.log")
-        #     if os.path.isfile(logpath):
-        #         # delete the previous log file
-        #         try:
-        #             os.remove(logpath)
-        #         except FileNotFoundError:
-        #             pass
-        #         except OSError as e:
-        #             log.warn("could not delete server log file {}: {}".format(logpath, e))
-        #
-        #     command += " --log_file_prefix={logpath} --log_file_num_backups=0 --log_to_stderr".format(logpath=logpath)
-
-        log.info("starting local server process with {}".format(command))
+        if self._local_server:
+            # a new process, maybe another version
+            self._local_server.forgetVersion()
 
-        try:
-            if sys.platform.startswith("win"):
-                # use the string on Windows
-                self._local_server_proccess = subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
-            else:
-                # use arguments on other platforms
-                args = shlex.split(command)
-                self._local_server_proccess = subprocess.Popen(args)
-        except OSError as e:
-            log.warning('could not start local server "{}": {}'.format(command, e))
-            return False
-
-        return True
+        command = '"{executable}" --host={host} --port={port}'.format(executable=path, host=host, port=port)
+        return self.localServerSupervisor().start(command)
 
     def stopLocalServer(self, wait=False):
+        """
+        Stops the local server process, which is terminated
+        if it does not exit in time.
+
+        :param wait: wait for the process to exit
+        """
 
         if self._local_server and self._local_server.connected() and not sys.platform.startswith('win'):
             # only gracefully disconnect if we are not on Windows
             self._local_server.close_connection()
-        if self._local_server_proccess and self._local_server_proccess.poll() is None:
-            if sys.platform.startswith("win"):
-                self._local_server_proccess.send_signal(signal.CTRL_BREAK_EVENT)
-            else:
-                self._local_server_proccess.send_signal(signal.SIGINT)
-            if wait:
-                self._local_server_proccess.wait()
+        if self._supervisor:
+            self._supervisor.stop(wait)
+
+    def localServerSupervisor(self):
+        """
+        Returns the supervisor of the local server process.
+
+        :returns: LocalServerSupervisor instance
+        """
+
+        if self._supervisor is None:
+            # the server output is logged in the same directory as the settings
+            self._supervisor = LocalServerSupervisor(os.path.dirname(QtCore.QSettings().fileName()))
+            self._supervisor.restarted_signal.connect(self._localServerRestartedSlot)
+            self._supervisor.resources_signal.connect(lambda: self.server_status_signal.emit(self._local_server.id()))
+        return self._supervisor
+
+    def _localServerRestartedSlot(self):
+        """
+        Slot called when the local server process has been restarted
+        after a crash, reconnects to it as soon as it is ready.
+        """
+
+        self._local_server.forgetVersion()
+        self.probeServers([self._local_server])
 
     def setLocalServer(self, path, host, port, auto_start):
         """
@@ -202,14 +337,165 @@ class Servers(QtCore.QObject):
         if self._local_server:
             if self._local_server.host == host and self._local_server.port == port:
                 return
-            if self._local_server.connected():
-                self._local_server.close_connection()
+            self._local_server.setLocal(False)
+            self._releaseServer(self._local_server)
             log.info("local server connection {} unregistered".format(self._local_server.url))
 
-        url = "ws://{host}:{port}".format(host=host, port=port)
-        self._local_server = WebSocketClient(url)
+        self._local_server = self._acquireServer(host, port)
         self._local_server.setLocal(True)
-        log.info("new local server connection {} registered".format(url))
+        log.info("new local server connection {} registered".format(self._local_server.url))
+
+    def _acquireServer(self, host, port):
+        """
+        Gets the connection to a server from the pool, the connection
+        is shared if the server is already used (or has been recently).
+
+        :param host: host or address of the server
+        :param port: port of the server (integer)
+
+        :returns: WebSocketClient instance
+        """
+
+        server = self._pool.acquire(host, port)
+        server.setBatchRequests(self._batch_requests)
+        server.setBinaryTransport(self._binary_transport)
+        if server not in self._monitors:
+            self._watchServer(server)
+        return server
+
+    def _releaseServer(self, server):
+        """
+        Gives a connection back to the pool, which closes
+        it later if it is no longer used.
+
+        :param server: WebSocketClient instance
+        """
+
+        if self._pool.release(server):
+            self._unwatchServer(server)
+
+    def connectionPool(self):
+        """
+        Returns the pool of the connections to the servers.
+
+        :returns: ConnectionPool instance
+        """
+
+        return self._pool
+
+    def _watchServer(self, server):
+        """
+        Relays the connection results of a server.
+
+        :param server: WebSocketClient instance
+        """
+
+        signals = server.signals()
+        relays = (lambda: self.server_connected_signal.emit(server.id()),
+                  lambda error_number, message: self.server_connection_error_signal.emit(server.id(), message))
+        signals.connected_signal.connect(relays[0])
+        signals.connection_error_signal.connect(relays[1])
+        self._relays[server] = relays
+
+        server.setRequestTimeout(self._request_timeout)
+        monitor = ServerMonitor(server, self._heartbeat_interval)
+        monitor.status_signal.connect(lambda: self.server_status_signal.emit(server.id()))
+        self._monitors[server] = monitor
+
+    def _unwatchServer(self, server):
+        """
+        Stops monitoring a server which is no longer used.
+
+        :param server: WebSocketClient instance
+        """
+
+        monitor = self._monitors.pop(server, None)
+        if monitor:
+            monitor.stop()
+        relays = self._relays.pop(server, None)
+        if relays:
+            signals = server.signals()
+            signals.connected_signal.disconnect(relays[0])
+            signals.connection_error_signal.disconnect(relays[1])
+
+    def serverMonitor(self, server):
+        """
+        Returns the health monitor of a server.
+
+        :param server: WebSocketClient instance
+
+        :returns: ServerMonitor instance
+        """
+
+        return self._monitors[server]
+
+    def servers(self):
+        """
+        Returns the local server and the remote servers.
+
+        :returns: list of WebSocketClient instances
+        """
+
+        servers = [self._local_server] if self._local_server else []
+        servers.extend(self._remote_servers.values())
+        return servers
+
+    def heartbeatInterval(self):
+        """
+        Returns the interval between two heartbeats sent to the servers.
+
+        :returns: seconds (integer)
+        """
+
+        return self._heartbeat_interval
+
+    def setHeartbeatInterval(self, interval):
+        """
+        Sets the interval between two heartbeats sent to the servers.
+
+        :param interval: seconds (integer)
+        """
+
+        self._heartbeat_interval = interval
+        for monitor in self._monitors.values():
+            monitor.setHeartbeatInterval(interval)
+
+    def requestTimeout(self):
+        """
+        Returns the time to wait for a server reply before failing a request.
+
+        :returns: seconds (integer, 0 means no timeout)
+        """
+
+        return self._request_timeout
+
+    def setRequestTimeout(self, timeout):
+        """
+        Sets the time to wait for a server reply before failing a request.
+
+        :param timeout: seconds (integer, 0 means no timeout)
+        """
+
+        self._request_timeout = timeout
+        for server in self._monitors:
+            server.setRequestTimeout(timeout)
+
+    def probeServers(self, servers=None, timeout=PROBE_TIMEOUT):
+        """
+        Connects to servers in parallel without blocking, each server is
+        tried again with an exponential backoff until connected or the
+        timeout has elapsed. The results are reported by the
+        server_connected_signal and server_connection_error_signal signals
+        (and the probe_failed_signal signal of the server monitors).
+
+        :param servers: WebSocketClient instances (all the servers by default)
+        :param timeout: seconds
+        """
+
+        if servers is None:
+            servers = self.servers()
+        for server in servers:
+            self._monitors[server].probe(timeout)
 
     def localServer(self):
         """
@@ -220,28 +506,37 @@ class Servers(QtCore.QObject):
 
         return self._local_server
 
-    def _addRemoteServer(self, host, port):
+    def _addRemoteServer(self, host, port, weight=1.0):
         """
         Adds a new remote server.
 
         :param host: host or address of the server
         :param port: port of the server (integer)
+        :param weight: relative capacity of the server (float)
 
         :returns: the new remote server
         """
 
-        server_socket = "{host}:{port}".format(host=host, port=port)
-        url = "ws://{server_socket}".format(server_socket=server_socket)
-        server = WebSocketClient(url)
+        server_socket = ConnectionPool.key(host, port)
+        server = self._acquireServer(host, port)
         self._remote_servers[server_socket] = server
-        log.info("new remote server connection {} registered".format(url))
+        self._remote_server_weights[server_socket] = weight
+        log.info("new remote server connection {} registered".format(server.url))
         return server
 
     def getRemoteServer(self, host, port):
+        """
+        Returns a remote server, added if not known yet.
 
-        for server in self._remote_servers.values():
-            if server.host == host and server.port == port:
-                return server
+        :param host: host or address of the server
+        :param port: port of the server (integer)
+
+        :returns: remote server (WebSocketClient instance)
+        """
+
+        server = self._remote_servers.get(ConnectionPool.key(host, port))
+        if server is not None:
+            return server
 
         return self._addRemoteServer(host, port)
 
@@ -254,21 +549,20 @@ class Servers(QtCore.QObject):
 
         for server_id, server in self._remote_servers.copy().items():
             if not server_id in servers:
-                if server.connected():
-                    server.close()
+                # kept open by the pool for a while in case it is added back
+                self._releaseServer(server)
                 log.info("remote server connection {} unregistered".format(server.url))
                 del self._remote_servers[server_id]
+                self._remote_server_weights.pop(server_id, None)
 
         for server_id, server in servers.items():
+            self._remote_server_weights[server_id] = server.get("weight", self._remote_server_weights.get(server_id, 1.0))
             if server_id in self._remote_servers:
                 continue
 
-            host = server["host"]
-            port = server["port"]
-            url = "ws://{host}:{port}".format(host=host, port=port)
-            new_server = WebSocketClient(url)
+            new_server = self._acquireServer(server["host"], server["port"])
             self._remote_servers[server_id] = new_server
-            log.info("new remote server connection {} registered".format(url))
+            log.info("new remote server connection {} registered".format(new_server.url))
 
         self.updated_signal.emit()
 
@@ -281,32 +575,161 @@ class Servers(QtCore.QObject):
 
         return self._remote_servers
 
-    def __iter__(self):
+    def allocationPolicy(self):
         """
-        Creates a round-robin system to pick up a remote server.
+        Returns the name of the policy used to allocate remote servers.
+
+        :returns: policy name (see ALLOCATION_POLICIES)
         """
 
-        return self
+        return self._allocation_policy
 
-    def __next__(self):
+    def setAllocationPolicy(self, name):
         """
-        Returns the next available remote server.
+        Sets the policy used to allocate remote servers.
 
-        :returns: remote server (WebSocketClient instance)
+        :param name: policy name (see ALLOCATION_POLICIES)
+        """
+
+        if name not in ALLOCATION_POLICIES:
+            raise ValueError("Unknown allocation policy: {}".format(name))
+        self._allocation_policy = name
+
+    def optimizePlacement(self):
+        """
+        Returns either the nodes of a topology being loaded are moved
+        between the remote servers to limit the links between servers.
+
+        :returns: boolean
+        """
+
+        return self._optimize_placement
+
+    def setOptimizePlacement(self, value):
+        """
+        Sets either the nodes of a topology being loaded are moved
+        between the remote servers to limit the links between servers.
+
+        :param value: boolean
+        """
+
+        self._optimize_placement = value
+
+    def remoteServerWeight(self, server):
+        """
+        Returns the relative capacity of a remote server.
+
+        :param server: WebSocketClient instance
+
+        :returns: weight (float)
+        """
+
+        server_socket = "{host}:{port}".format(host=server.host, port=server.port)
+        return self._remote_server_weights.get(server_socket, 1.0)
+
+    def setRemoteServerWeight(self, server, weight):
+        """
+        Sets the relative capacity of a remote server,
+        used by the weighted capacity allocation policy.
+
+        :param server: WebSocketClient instance
+        :param weight: weight (float)
+        """
+
+        server_socket = "{host}:{port}".format(host=server.host, port=server.port)
+        self._remote_server_weights[server_socket] = weight
+
+    def serverLoad(self, server):
+        """
+        Returns the load of a server.
+
+        :param server: WebSocketClient instance
+
+        :returns: dictionary with the number of nodes and the RAM committed (MB)
+        """
+
+        return self._server_loads.get(server, {"nodes": 0, "ram": 0})
+
+    def updateNodeLoad(self, node):
+        """
+        Counts (or counts again) a node in the load of its server.
+
+        :param node: Node instance
+        """
+
+        self.removeNodeLoad(node)
+        try:
+            # RAM allocated to routers and VMs (MB)
+            ram = node.settings().get("ram", 0) or 0
+        except NotImplementedError:
+            ram = 0
+        server = node.server()
+        load = self._server_loads.setdefault(server, {"nodes": 0, "ram": 0})
+        load["nodes"] += 1
+        load["ram"] += ram
+        self._node_loads[node.id()] = (server, ram)
+
+    def removeNodeLoad(self, node):
+        """
+        Removes a node from the load of its server.
+
+        :param node: Node instance
+        """
+
+        if node.id() in self._node_loads:
+            server, ram = self._node_loads.pop(node.id())
+            load = self._server_loads[server]
+            load["nodes"] -= 1
+            load["ram"] -= ram
+
+    def resetLoads(self):
+        """
+        Resets the load of all the servers.
+        """
+
+        self._server_loads.clear()
+        self._node_loads.clear()
+
+    def allocateRemoteServer(self):
+        """
+        Returns the least loaded remote server
+        according to the allocation policy.
+
+        :returns: remote server (WebSocketClient instance) or None
         """
 
         if not self._remote_servers:
             return None
 
-        server_ids = list(self._remote_servers.keys())
-        server_id = server_ids[self._remote_server_iter_pos]
+        policy = ALLOCATION_POLICIES[self._allocation_policy]()
+        best_server = None
+        best_score = None
+        for server_socket, server in self._remote_servers.items():
+            weight = self._remote_server_weights.get(server_socket, 1.0)
+            if weight <= 0:
+                # this server does not accept new nodes
+                continue
+            score = policy.score(self.serverLoad(server), weight)
+            if best_score is None or score < best_score:
+                best_server = server
+                best_score = score
+        return best_server
 
-        if self._remote_server_iter_pos < len(server_ids) - 1:
-            self._remote_server_iter_pos += 1
-        else:
-            self._remote_server_iter_pos = 0
+    def __iter__(self):
+        """
+        Iterates over the remote servers, the least loaded first.
+        """
 
-        return self._remote_servers[server_id]
+        return self
+
+    def __next__(self):
+        """
+        Returns the least loaded remote server.
+
+        :returns: remote server (WebSocketClient instance)
+        """
+
+        return self.allocateRemoteServer()
 
     def save(self):
         """
@@ -320,9 +743,7 @@ class Servers(QtCore.QObject):
         Disconnects all servers (local and remote).
         """
 
-        if self._local_server.connected():
-            self._local_server.close_connection()
-        for server in self._remote_servers:
+        for server in self._pool.connections():
             if server.connected():
                 server.close_connection()
 
@@ -177,6 +177,9 @@ GENERAL_SETTINGS = {
     "temporary_files_path": DEFAULT_TEMPORARY_FILES_PATH,
     "check_for_update": True,
     "slow_device_start_all": 0,
+    "start_all_server_concurrency": 10,
+    "start_all_node_type_concurrency": 0,
+    "start_all_wait_for_started": True,
     "link_manual_mode": True,
     "telnet_console_command": DEFAULT_TELNET_CONSOLE_COMMAND,
     "serial_console_command": DEFAULT_SERIAL_CONSOLE_COMMAND,
@@ -191,6 +194,9 @@ GENERAL_SETTING_TYPES = {
     "temporary_files_path": str,
     "check_for_update": bool,
     "slow_device_start_all": int,
+    "start_all_server_concurrency": int,
+    "start_all_node_type_concurrency": int,
+    "start_all_wait_for_started": bool,
     "link_manual_mode": bool,
     "telnet_console_command": str,
     "serial_console_command": str,
@@ -206,6 +212,8 @@ GRAPHICS_VIEW_SETTINGS = {
     "draw_link_status_points": True,
     "default_label_font": "TypeWriter,10,-1,5,75,0,0,0,0,0",
     "default_label_color": "#000000",
+    "lod_pixmap_threshold": 0.5,
+    "lod_shape_threshold": 0.2,
 }
 
 GRAPHICS_VIEW_SETTING_TYPES = {
@@ -215,6 +223,8 @@ GRAPHICS_VIEW_SETTING_TYPES = {
     "draw_link_status_points": bool,
     "default_label_font": str,
     "default_label_color": str,
+    "lod_pixmap_threshold": float,
+    "lod_shape_threshold": float,
 }
 
 PACKET_CAPTURE_SETTINGS = {
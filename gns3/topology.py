@@ -21,17 +21,21 @@ Handles the saving and loading of a topology.
 """
 
 import os
-from collections import namedtuple
+import uuid
+from collections import namedtuple, OrderedDict
 
-from .qt import QtCore, QtGui, QtSvg
+from .qt import QtCore, QtGui
 from .items.node_item import NodeItem
-from .items.link_item import LinkItem
 from .items.note_item import NoteItem
 from .items.rectangle_item import RectangleItem
 from .items.ellipse_item import EllipseItem
 from .items.image_item import ImageItem
 from .servers import Servers
+from .link_provisioner import LinkProvisioner
+from .topology_journal import TopologyJournal
+from .placement import placeNodes, crossLinks
 from .modules import MODULES
+from .modules.builtin import Builtin
 from .modules.module_error import ModuleError
 from .utils.message_box import MessageBox
 from .version import __version__
@@ -44,25 +48,70 @@ TopologyInstance = namedtuple("TopologyInstance",
                               ["name", "id", "size_id", "image_id"],
                               verbose=False)
 
-
-class Topology(object):
+# node settings referring to files or VMs of the server the node is on
+SERVER_FILE_SETTINGS = ("image",
+                        "path",
+                        "startup_config",
+                        "private_config",
+                        "initial_config",
+                        "script_file",
+                        "qemu_path",
+                        "hda_disk_image",
+                        "hdb_disk_image",
+                        "initrd",
+                        "kernel_image",
+                        "vmname")
+
+
+class Topology(QtCore.QObject):
     """
     Topology.
     """
 
+    # signals to follow the progress of a topology loading
+    parse_progress_signal = QtCore.Signal(int)
+    load_progress_signal = QtCore.Signal(int, int)
+    loaded_signal = QtCore.Signal()
+
     def __init__(self):
 
-        self._nodes = []
-        self._links = []
+        super(Topology, self).__init__()
+        # nodes and links by identifier, in the order they were added
+        self._nodes = OrderedDict()
+        self._links = OrderedDict()
+
+        # indexes to lookup the links in constant time
+        self._node_links_index = {}
+        self._port_link_index = {}
+
+        # serialized nodes and links cached between saves
+        self._node_dumps = {}
+        self._link_dumps = {}
+
+        # changes since the last save are recorded to a journal
+        self._journal = TopologyJournal()
+        # notes and shapes do not have identifiers, they are numbered by
+        # their position in the topology file (see TopologyJournal):
+        # item -> (section, identifier)
+        self._drawings = {}
+
         self._notes = []
         self._rectangles = []
         self._ellipses = []
         self._images = []
         self._topology = None
-        self._initialized_nodes = []
+        self._initialized_nodes = set()
         self._resources_type = "local"
         self._instances = []
 
+        # topology loading state
+        self._node_to_links_mapping = {}
+        self._loading_nodes = set()
+        self._loading_links = set()
+        self._loading_total = 0
+        self._loading_stream = False
+        self._link_to_topology_link = {}
+
     def addNode(self, node):
         """
         Adds a new node to this topology.
@@ -71,7 +120,14 @@ class Topology(object):
         """
 
         #self._topology.add_node(node)
-        self._nodes.append(node)
+        self._nodes[node.id()] = node
+
+        # the cached representation is invalidated each time the node changes
+        node.created_signal.connect(self._nodeChangedSlot)
+        node.updated_signal.connect(self._nodeChangedSlot)
+
+        # the server allocation takes the nodes already on a server into account
+        Servers.instance().updateNodeLoad(node)
 
     def removeNode(self, node):
         """
@@ -80,8 +136,19 @@ class Topology(object):
         :param node: Node instance
         """
 
-        if node in self._nodes:
-            self._nodes.remove(node)
+        if self._nodes.get(node.id()) is node:
+            del self._nodes[node.id()]
+            self._node_links_index.pop(node.id(), None)
+            self._node_dumps.pop(node.id(), None)
+            Servers.instance().removeNodeLoad(node)
+            try:
+                node.created_signal.disconnect(self._nodeChangedSlot)
+                node.updated_signal.disconnect(self._nodeChangedSlot)
+            except TypeError:
+                # ignore TypeError: 'method' object is not connected
+                pass
+            if self._isJournaling():
+                self._journal.record("remove", "nodes", {"id": node.id()})
 
     def getNode(self, node_id):
         """
@@ -90,10 +157,7 @@ class Topology(object):
         :returns: Node instance or None
         """
 
-        for node in self._nodes:
-            if node.id() == node_id:
-                return node
-        return None
+        return self._nodes.get(node_id)
 
     def addLink(self, link):
         """
@@ -103,7 +167,17 @@ class Topology(object):
         """
 
         #self._topology.add_node(node)
-        self._links.append(link)
+        self._links[link.id()] = link
+        for node, port in ((link.sourceNode(), link.sourcePort()), (link.destinationNode(), link.destinationPort())):
+            self._node_links_index.setdefault(node.id(), []).append(link)
+            self._port_link_index[port.id()] = link
+            # the node representations include their ports
+            self.invalidateNode(node)
+
+        # the ports change again once the NIOs are attached
+        link.add_link_signal.connect(self._linkAddedSlot)
+        if self._isJournaling():
+            self._journal.record("update", "links", link.dump())
 
     def removeLink(self, link):
         """
@@ -112,8 +186,31 @@ class Topology(object):
         :param link: Link instance
         """
 
-        if link in self._links:
-            self._links.remove(link)
+        if self._links.get(link.id()) is link:
+            del self._links[link.id()]
+            self._link_dumps.pop(link.id(), None)
+            for node, port in ((link.sourceNode(), link.sourcePort()), (link.destinationNode(), link.destinationPort())):
+                node_links = self._node_links_index.get(node.id())
+                if node_links and link in node_links:
+                    node_links.remove(link)
+                if self._port_link_index.get(port.id()) is link:
+                    del self._port_link_index[port.id()]
+                self.invalidateNode(node)
+            if self._isJournaling():
+                self._journal.record("remove", "links", link.dump())
+
+    def _linkAddedSlot(self, link_id):
+        """
+        Slot called when the NIOs of a link have been
+        attached to the ports of its nodes.
+
+        :param link_id: link identifier
+        """
+
+        link = self._links.get(link_id)
+        if link:
+            self.invalidateNode(link.sourceNode())
+            self.invalidateNode(link.destinationNode())
 
     def getLink(self, link_id):
         """
@@ -122,19 +219,185 @@ class Topology(object):
         :returns: Link instance or None
         """
 
-        for link in self._links:
-            if link.id() == link_id:
-                return link
-        return None
+        return self._links.get(link_id)
+
+    def getNodeLinks(self, node_id):
+        """
+        Returns all the links connected to a node.
+
+        :param node_id: node identifier
+
+        :returns: list of Link instances
+        """
+
+        return list(self._node_links_index.get(node_id, []))
+
+    def getPortLink(self, port_id):
+        """
+        Lookups for the link connected to a port.
+
+        :param port_id: port identifier
+
+        :returns: Link instance or None
+        """
+
+        return self._port_link_index.get(port_id)
+
+    def _nodeChangedSlot(self, *args):
+        """
+        Slot to know when a node has been created or updated
+        and must be serialized again on the next save.
+        """
+
+        node = self.sender()
+        if node is not None:
+            self.invalidateNode(node)
+            # the RAM of the node may have changed
+            Servers.instance().updateNodeLoad(node)
+            if self._isJournaling():
+                self._recordNode(node)
+
+    def invalidateNode(self, node):
+        """
+        Invalidates the cached representation of a node, and of the links
+        and peer nodes which include its name in their representation.
+
+        :param node: Node instance
+        """
+
+        self._node_dumps.pop(node.id(), None)
+        for link in self._node_links_index.get(node.id(), []):
+            self._link_dumps.pop(link.id(), None)
+            for peer_node in (link.sourceNode(), link.destinationNode()):
+                self._node_dumps.pop(peer_node.id(), None)
+
+    def journal(self):
+        """
+        Returns the journal recording the changes made
+        to this topology since it was last saved.
+
+        :returns: TopologyJournal instance
+        """
+
+        return self._journal
+
+    def _isJournaling(self):
+        """
+        Returns either changes must be recorded to the journal
+        (they are not while a topology is being loaded).
+
+        :returns: boolean
+        """
+
+        return self._journal.isOpen() and not self.isLoading()
+
+    def _recordNode(self, node):
+        """
+        Records a node to the journal, with its GUI settings and server.
+
+        :param node: Node instance
+        """
+
+        from .main_window import MainWindow
+        node_item = MainWindow.instance().uiGraphicsView.nodeItem(node.id())
+        if not node_item or not node.initialized():
+            return
+
+        self._node_dumps[node.id()] = node.dump()
+        node_info = dict(self._node_dumps[node.id()])
+        self._dumpNodeGuiSettings(node_info, node_item)
+        self._journal.record("update", "nodes", node_info, server=node.server().dump())
+
+    def _recordDrawing(self, item):
+        """
+        Records a note or a shape to the journal.
+
+        :param item: NoteItem, RectangleItem or EllipseItem instance
+        """
+
+        if self._isJournaling():
+            section, drawing_id = self._drawings[item]
+            self._journal.record("update", section, item.dump(), drawing_id=drawing_id)
+
+    def _addDrawing(self, section, items, item, drawing_id):
+        """
+        Adds a note or a shape to this topology.
+
+        :param section: topology section
+        :param items: list of the items of the section
+        :param item: NoteItem, RectangleItem or EllipseItem instance
+        :param drawing_id: identifier of the item in the journal (None for a new item)
+        """
+
+        items.append(item)
+        self._drawings[item] = (section, drawing_id if drawing_id is not None else uuid.uuid4().hex)
+        self._recordDrawing(item)
+
+    def _removeDrawing(self, items, item):
+        """
+        Removes a note or a shape from this topology.
+
+        :param items: list of the items of the section
+        :param item: NoteItem, RectangleItem or EllipseItem instance
+        """
+
+        if item in items:
+            items.remove(item)
+            section, drawing_id = self._drawings.pop(item)
+            if self._isJournaling():
+                self._journal.record("remove", section, {}, drawing_id=drawing_id)
+
+    def recordItem(self, item):
+        """
+        Records an item of the view to the journal,
+        for instance once it has been moved or edited.
+
+        :param item: NodeItem, NoteItem, RectangleItem or EllipseItem instance
+        """
+
+        if not self._isJournaling():
+            return
+        if isinstance(item, NoteItem) and isinstance(item.parentItem(), NodeItem):
+            # node label
+            item = item.parentItem()
+        if isinstance(item, NodeItem):
+            self._recordNode(item.node())
+        elif item in self._drawings:
+            self._recordDrawing(item)
+
+    def openJournal(self, path, records=None):
+        """
+        Starts recording the changes made to this topology to the journal.
+
+        :param path: path to the topology file
+        :param records: records already in the journal (see TopologyJournal.read())
+        """
 
-    def addNote(self, note):
+        if not records:
+            # the journal starts from the topology file, where the
+            # notes and shapes are numbered by their position
+            for section, items in (("notes", self._notes), ("rectangles", self._rectangles), ("ellipses", self._ellipses)):
+                for position, item in enumerate(items):
+                    self._drawings[item] = (section, position)
+        self._journal.open(path, records)
+
+    def invalidateAll(self):
+        """
+        Invalidates all the cached node and link representations.
+        """
+
+        self._node_dumps.clear()
+        self._link_dumps.clear()
+
+    def addNote(self, note, drawing_id=None):
         """
         Adds a new note to this topology.
 
         :param note: NoteItem instance
+        :param drawing_id: identifier of the note in the journal (when loaded)
         """
 
-        self._notes.append(note)
+        self._addDrawing("notes", self._notes, note, drawing_id)
 
     def removeNote(self, note):
         """
@@ -143,17 +406,17 @@ class Topology(object):
         :param note: NoteItem instance
         """
 
-        if note in self._notes:
-            self._notes.remove(note)
+        self._removeDrawing(self._notes, note)
 
-    def addRectangle(self, rectangle):
+    def addRectangle(self, rectangle, drawing_id=None):
         """
         Adds a new rectangle to this topology.
 
         :param rectangle: RectangleItem instance
+        :param drawing_id: identifier of the rectangle in the journal (when loaded)
         """
 
-        self._rectangles.append(rectangle)
+        self._addDrawing("rectangles", self._rectangles, rectangle, drawing_id)
 
     def removeRectangle(self, rectangle):
         """
@@ -162,17 +425,17 @@ class Topology(object):
         :param rectangle: RectangleItem instance
         """
 
-        if rectangle in self._rectangles:
-            self._rectangles.remove(rectangle)
+        self._removeDrawing(self._rectangles, rectangle)
 
-    def addEllipse(self, ellipse):
+    def addEllipse(self, ellipse, drawing_id=None):
         """
         Adds a new ellipse to this topology.
 
         :param ellipse: EllipseItem instance
+        :param drawing_id: identifier of the ellipse in the journal (when loaded)
         """
 
-        self._ellipses.append(ellipse)
+        self._addDrawing("ellipses", self._ellipses, ellipse, drawing_id)
 
     def removeEllipse(self, ellipse):
         """
@@ -181,8 +444,7 @@ class Topology(object):
         :param ellipse: EllipseItem instance
         """
 
-        if ellipse in self._ellipses:
-            self._ellipses.remove(ellipse)
+        self._removeDrawing(self._ellipses, ellipse)
 
     def addImage(self, image):
         """
@@ -228,14 +490,14 @@ class Topology(object):
         Returns all the nodes in this topology.
         """
 
-        return self._nodes
+        return list(self._nodes.values())
 
     def links(self):
         """
         Returns all the links in this topology.
         """
 
-        return self._links
+        return list(self._links.values())
 
     def notes(self):
         """
@@ -272,6 +534,88 @@ class Topology(object):
 
         return self._instances
 
+    @staticmethod
+    def _placementServers():
+        """
+        Returns the remote servers accepting new nodes, with their weight.
+
+        :returns: dictionary server -> weight
+        """
+
+        server_manager = Servers.instance()
+        servers = OrderedDict()
+        for server in server_manager.remoteServers().values():
+            weight = server_manager.remoteServerWeight(server)
+            if weight > 0:
+                servers[server] = weight
+        return servers
+
+    @staticmethod
+    def _isPlaceable(node_type, settings):
+        """
+        Returns either a node can be placed on another server.
+        Builtin devices (e.g. clouds) are linked through the interfaces
+        of their server instead of UDP tunnels, and the images, configs
+        or VMs used by a node may not exist on the other servers.
+
+        :param node_type: node class name
+        :param settings: node settings (dictionary)
+
+        :returns: boolean
+        """
+
+        if node_type in [node_class.__name__ for node_class in Builtin.classes()]:
+            return False
+        for name in SERVER_FILE_SETTINGS:
+            if settings.get(name):
+                return False
+        return True
+
+    def _placementPlan(self, node_servers, links):
+        """
+        Computes the remote servers of nodes
+        minimizing the links between servers.
+
+        :param node_servers: dictionary node ID -> current server
+        :param links: list of (node ID, node ID) tuples
+
+        :returns: (dictionary node ID -> server of the nodes to move,
+                   number of links between servers before, after)
+        """
+
+        servers = self._placementServers()
+        cross_links = crossLinks(node_servers, links)
+        nodes = [node_id for node_id, server in node_servers.items() if server in servers]
+        if len(servers) < 2 or not nodes:
+            return {}, cross_links, cross_links
+
+        fixed = {node_id: server for node_id, server in node_servers.items() if server not in servers}
+        plan = placeNodes(nodes, links, servers, fixed, current=node_servers)
+        planned = dict(node_servers)
+        planned.update(plan)
+        planned_cross_links = crossLinks(planned, links)
+        if planned_cross_links >= cross_links:
+            return {}, cross_links, cross_links
+        moves = {node_id: server for node_id, server in plan.items() if server is not node_servers[node_id]}
+        return moves, cross_links, planned_cross_links
+
+    def placementPlan(self):
+        """
+        Suggests remote servers for the nodes of this topology
+        so that fewer links are UDP tunnels between two servers.
+        The nodes on the local server are not moved.
+
+        :returns: (dictionary node ID -> server of the nodes to move,
+                   number of links between servers before, after)
+        """
+
+        node_servers = OrderedDict()
+        for node in self._nodes.values():
+            if self._isPlaceable(node.__class__.__name__, node.settings()):
+                node_servers[node.id()] = node.server()
+        links = [(link.sourceNode().id(), link.destinationNode().id()) for link in self._links.values()]
+        return self._placementPlan(node_servers, links)
+
     def reset(self):
         """
         Resets this topology.
@@ -280,15 +624,46 @@ class Topology(object):
         #self._topology.clear()
         self._links.clear()
         self._nodes.clear()
+        self._node_links_index.clear()
+        self._port_link_index.clear()
+        self._node_dumps.clear()
+        self._link_dumps.clear()
         self._notes.clear()
         self._rectangles.clear()
         self._ellipses.clear()
+        self._drawings.clear()
         self._images.clear()
         self._initialized_nodes.clear()
         self._resources_type = "local"
         self._instances = []
+        self._journal.close()
+        Servers.instance().resetLoads()
+        LinkProvisioner.instance().reset()
+        if self.isLoading():
+            self._loadCompleted()
         log.info("topology has been reset")
 
+    @staticmethod
+    def _dumpNodeGuiSettings(node_info, node_item):
+        """
+        Adds the GUI settings of a node to its representation.
+
+        :param node_info: representation of the node (dictionary)
+        :param node_item: NodeItem instance
+        """
+
+        node_info["x"] = node_item.x()
+        node_info["y"] = node_item.y()
+        if node_item.zValue() != 1.0:
+            node_info["z"] = node_item.zValue()
+        if node_item.label():
+            node_info["label"] = node_item.label().dump()
+        node = node_item.node()
+        if node_item.defaultSymbol() != node.defaultSymbol():
+            node_info["default_symbol"] = node_item.defaultSymbol()
+        if node_item.hoverSymbol() != node.hoverSymbol():
+            node_info["hover_symbol"] = node_item.hoverSymbol()
+
     def _dump_gui_settings(self, topology):
         """
         Adds GUI settings to the topology when saving a topology.
@@ -301,31 +676,25 @@ class Topology(object):
         view = main_window.uiGraphicsView
 
         if "nodes" in topology["topology"]:
-            for item in view.scene().items():
-                if isinstance(item, NodeItem):
-                    for node in topology["topology"]["nodes"]:
-                        if node["id"] == item.node().id():
-                            node["x"] = item.x()
-                            node["y"] = item.y()
-                            if item.zValue() != 1.0:
-                                node["z"] = item.zValue()
-                            if item.label():
-                                node["label"] = item.label().dump()
-                            default_symbol_path = item.defaultRenderer().objectName()
-                            if default_symbol_path:
-                                node["default_symbol"] = default_symbol_path
-                            hover_symbol_path = item.hoverRenderer().objectName()
-                            if hover_symbol_path:
-                                node["hover_symbol"] = hover_symbol_path
-                if isinstance(item, LinkItem):
-                    for link in topology["topology"]["links"]:
-                        if link["id"] == item.link().id():
-                            source_port_label = item.sourcePort().label()
-                            destination_port_label = item.destinationPort().label()
-                            if source_port_label:
-                                link["source_port_label"] = source_port_label.dump()
-                            if destination_port_label:
-                                link["destination_port_label"] = destination_port_label.dump()
+            link_items = {}
+            for node in topology["topology"]["nodes"]:
+                item = view.nodeItem(node["id"])
+                if not item:
+                    continue
+                self._dumpNodeGuiSettings(node, item)
+                for link_item in item.links():
+                    link_items[link_item.link().id()] = link_item
+
+            for link in topology["topology"].get("links", []):
+                item = link_items.get(link["id"])
+                if not item:
+                    continue
+                source_port_label = item.sourcePort().label()
+                destination_port_label = item.destinationPort().label()
+                if source_port_label:
+                    link["source_port_label"] = source_port_label.dump()
+                if destination_port_label:
+                    link["destination_port_label"] = destination_port_label.dump()
 
         # notes
         if self._notes:
@@ -381,18 +750,25 @@ class Topology(object):
         # nodes
         if self._nodes:
             topology_nodes = topology["topology"]["nodes"] = []
-            for node in self._nodes:
+            for node in self._nodes.values():
                 if node.server().id() not in servers:
                     servers[node.server().id()] = node.server()
-                log.info("saving node: {}".format(node.name()))
-                topology_nodes.append(node.dump())
+                # tell the server to save the node configurations
+                node.saveConfig()
+                if node.id() not in self._node_dumps:
+                    log.info("saving node: {}".format(node.name()))
+                    self._node_dumps[node.id()] = node.dump()
+                # GUI settings are added to a copy of the cached representation
+                topology_nodes.append(dict(self._node_dumps[node.id()]))
 
         # links
         if self._links:
             topology_links = topology["topology"]["links"] = []
-            for link in self._links:
-                log.info("saving {}".format(str(link)))
-                topology_links.append(link.dump())
+            for link in self._links.values():
+                if link.id() not in self._link_dumps:
+                    log.info("saving {}".format(str(link)))
+                    self._link_dumps[link.id()] = link.dump()
+                topology_links.append(dict(self._link_dumps[link.id()]))
 
         # servers
         if servers:
@@ -424,200 +800,421 @@ class Topology(object):
         :param topology: topology representation
         """
 
+        if "topology" not in topology or "version" not in topology:
+            log.warn("not a topology file")
+            return
+
+        self.loadSections(self._topologySections(topology))
+
+    @staticmethod
+    def streamOrder(topology):
+        """
+        Orders a topology representation the way its sections are
+        best loaded while the file is read (version first, servers
+        before nodes etc.), the other keys are sorted.
+
+        :param topology: topology representation
+
+        :returns: OrderedDict instance
+        """
+
+        def sortedKeys(value):
+            if isinstance(value, dict):
+                return OrderedDict((key, sortedKeys(value[key])) for key in sorted(value.keys()))
+            if isinstance(value, list):
+                return [sortedKeys(element) for element in value]
+            return value
+
+        ordered = OrderedDict()
+        for name in sorted(topology.keys(), key=lambda name: (name != "version", name)):
+            if name != "topology":
+                ordered[name] = sortedKeys(topology[name])
+        if "topology" in topology:
+            order = ["servers", "links", "nodes"]
+            sections = topology["topology"]
+            ordered["topology"] = OrderedDict((section, sortedKeys(sections[section]))
+                                              for section in sorted(sections.keys(), key=lambda section: (order.index(section) if section in order else len(order), section)))
+        return ordered
+
+    @staticmethod
+    def _topologySections(topology):
+        """
+        Splits a topology representation into sections, in the order
+        they are best loaded (version first, servers before nodes etc.)
+
+        :param topology: topology representation
+
+        :returns: iterator of (path, value) tuples
+        """
+
+        for name in sorted(topology.keys(), key=lambda name: name != "version"):
+            if name != "topology":
+                yield (name, ), topology[name]
+
+        order = ["servers", "links", "nodes"]
+        for section in sorted(topology["topology"].keys(), key=lambda section: order.index(section) if section in order else len(order)):
+            value = topology["topology"][section]
+            if isinstance(value, list):
+                for element in value:
+                    yield ("topology", section), element
+            else:
+                yield ("topology", section), value
+
+    def loadSections(self, sections, progress=None):
+        """
+        Loads a topology section by section, for instance
+        while the topology file is still being read.
+
+        :param sections: iterable of (path, value) tuples (see JSONStreamReader)
+        :param progress: optional callable returning the read progress (percentage)
+        """
+
         from .main_window import MainWindow
         main_window = MainWindow.instance()
         view = main_window.uiGraphicsView
 
         topology_file_errors = []
-        if "topology" not in topology or "version" not in topology:
-            log.warn("not a topology file")
-            return
-
-        if parse_version(topology["version"]) <= parse_version("1.0a7.dev2"):
-            # temporary warning
-            QtGui.QMessageBox.warning(main_window, "Version", "Importing a project made with an old alpha version ({}) may not work properly".format(topology["version"]))
 
-        # deactivate the unsaved state support
+        # deactivate the unsaved state support until the topology is fully loaded
         main_window.ignoreUnsavedState(True)
-        # trick: no matter what, reactivate the unsaved state support after 3 seconds
-        QtCore.QTimer.singleShot(3000, self._reactivateUnsavedState)
 
         self._node_to_links_mapping = {}
-        # create a mapping node ID to links
-        if "links" in topology["topology"]:
-            links = topology["topology"]["links"]
-            for topology_link in links:
-                log.debug("mapping node to link with ID {}".format(topology_link["id"]))
-                source_id = topology_link["source_node_id"]
-                destination_id = topology_link["destination_node_id"]
-                if source_id not in self._node_to_links_mapping:
-                    self._node_to_links_mapping[source_id] = []
-                if destination_id not in self._node_to_links_mapping:
-                    self._node_to_links_mapping[destination_id] = []
-                self._node_to_links_mapping[source_id].append(topology_link)
-                self._node_to_links_mapping[destination_id].append(topology_link)
-
-        # servers
+        self._loading_nodes = set()
+        self._loading_links = set()
+        self._link_to_topology_link = {}
+        self._loading_total = 0
+        self._loading_stream = True
         self._servers = {}
-        server_manager = Servers.instance()
-        if "servers" in topology["topology"]:
-            servers = topology["topology"]["servers"]
-            for topology_server in servers:
-                if "local" in topology_server and topology_server["local"]:
-                    self._servers[topology_server["id"]] = server_manager.localServer()
-                else:
-                    host = topology_server["host"]
-                    port = topology_server["port"]
-                    self._servers[topology_server["id"]] = server_manager.getRemoteServer(host, port)
 
-        # nodes
-        if "nodes" in topology["topology"]:
-            topology_nodes = {}
-            nodes = topology["topology"]["nodes"]
-            for topology_node in nodes:
-                # check for duplicate node IDs
-                if topology_node["id"] in topology_nodes:
-                    topology_file_errors.append("Duplicated node ID {} for {}".format(topology_node["id"],
-                                                                                      topology_node["description"]))
+        # nodes waiting for the reference to their server
+        pending_nodes = {}
+        # nodes ready to be created, by server (sent at each read chunk)
+        ready_nodes = OrderedDict()
+        # nodes waiting for the whole topology to be read to be placed on the servers
+        placed_nodes = None
+        if Servers.instance().optimizePlacement() and len(self._placementServers()) > 1:
+            placed_nodes = []
+        loaded_node_ids = set()
+        drawing_positions = {}
+        resources_type = None
+        is_topology = False
+        parse_progress = 0
+
+        try:
+            for path, value in sections:
+
+                if progress:
+                    current_progress = progress()
+                    if current_progress != parse_progress:
+                        parse_progress = current_progress
+                        self.parse_progress_signal.emit(parse_progress)
+                        self._loadNodes(ready_nodes, topology_file_errors)
+                        # let the GUI breathe and the servers replies come in
+                        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+
+                if path == ("version", ):
+                    if parse_version(value) <= parse_version("1.0a7.dev2"):
+                        # temporary warning
+                        QtGui.QMessageBox.warning(main_window, "Version", "Importing a project made with an old alpha version ({}) may not work properly".format(value))
                     continue
-                topology_nodes[topology_node["id"]] = topology_node
-
-            for topology_node in topology_nodes.values():
-                log.debug("loading node with ID {}".format(topology_node["id"]))
-
-                try:
-                    node_module = None
-                    for module in MODULES:
-                        instance = module.instance()
-                        node_class = module.getNodeClass(topology_node["type"])
-                        if node_class:
-                            node_module = instance
-                            break
-                    if not node_module:
-                        raise ModuleError("Could not find any module for {}".format(topology_node["type"]))
-
-                    server = None
-                    if topology_node["server_id"] in self._servers:
-                        server = self._servers[topology_node["server_id"]]
-
-                    if not server:
-                        topology_file_errors.append("No server reference for node ID {}".format(topology_node["id"]))
-                        continue
 
-                    node = node_module.createNode(node_class, server)
-                    node.error_signal.connect(main_window.uiConsoleTextEdit.writeError)
-                    node.warning_signal.connect(main_window.uiConsoleTextEdit.writeWarning)
-                    node.server_error_signal.connect(main_window.uiConsoleTextEdit.writeServerError)
+                if path == ("resources_type", ):
+                    resources_type = value
+                    continue
 
-                except ModuleError as e:
-                    topology_file_errors.append(str(e))
+                if path[0] != "topology" or len(path) != 2:
                     continue
 
-                node.setId(topology_node["id"])
+                is_topology = True
+                section = path[1]
+                if section == "servers":
+                    self._loadServer(value)
+                    # create the nodes which were waiting for this server
+                    if value["id"] in pending_nodes:
+                        ready_nodes.setdefault(self._servers[value["id"]], []).extend(pending_nodes.pop(value["id"]))
+                elif section == "links":
+                    self._loadLink(value)
+                elif section == "nodes":
+                    # check for duplicate node IDs
+                    if value["id"] in loaded_node_ids:
+                        topology_file_errors.append("Duplicated node ID {} for {}".format(value["id"],
+                                                                                          value["description"]))
+                        continue
+                    loaded_node_ids.add(value["id"])
+                    if placed_nodes is not None:
+                        placed_nodes.append(value)
+                    elif value["server_id"] in self._servers:
+                        ready_nodes.setdefault(self._servers[value["server_id"]], []).append(value)
+                    else:
+                        pending_nodes.setdefault(value["server_id"], []).append(value)
+                elif section in ("notes", "rectangles", "ellipses"):
+                    # numbered by their position in the file unless replayed from the journal
+                    drawing_id = value.pop("drawing_id", drawing_positions.get(section, 0))
+                    drawing_positions[section] = drawing_positions.get(section, 0) + 1
+                    if section == "notes":
+                        note_item = NoteItem()
+                        note_item.load(value)
+                        view.scene().addItem(note_item)
+                        self.addNote(note_item, drawing_id)
+                    elif section == "rectangles":
+                        rectangle_item = RectangleItem()
+                        rectangle_item.load(value)
+                        view.scene().addItem(rectangle_item)
+                        self.addRectangle(rectangle_item, drawing_id)
+                    else:
+                        ellipse_item = EllipseItem()
+                        ellipse_item.load(value)
+                        view.scene().addItem(ellipse_item)
+                        self.addEllipse(ellipse_item, drawing_id)
+                elif section == "images":
+                    self._loadImage(value, topology_file_errors)
+                elif section == "instances":
+                    self.addInstance(value["name"], value["id"], value["size_id"], value["image_id"])
+        except Exception:
+            # the topology cannot be read to the end
+            self._abortLoading()
+            raise
+
+        if not is_topology:
+            log.warn("not a topology file")
 
-                # we want to know when the node has been created
-                node.created_signal.connect(self._nodeCreatedSlot)
+        if placed_nodes:
+            self._placeNodes(placed_nodes)
+            for topology_node in placed_nodes:
+                if topology_node["server_id"] in self._servers:
+                    ready_nodes.setdefault(self._servers[topology_node["server_id"]], []).append(topology_node)
+                else:
+                    pending_nodes.setdefault(topology_node["server_id"], []).append(topology_node)
+        self._loadNodes(ready_nodes, topology_file_errors)
 
-                # load the settings
-                node.load(topology_node)
+        for topology_nodes in pending_nodes.values():
+            for topology_node in topology_nodes:
+                topology_file_errors.append("No server reference for node ID {}".format(topology_node["id"]))
 
-                # create the node item and restore GUI settings
-                node_item = NodeItem(node)
-                node_item.setPos(topology_node["x"], topology_node["y"])
+        # links with an endpoint that will never be created cannot be loaded
+        for node_id, topology_links in self._node_to_links_mapping.items():
+            if node_id not in self._loading_nodes and node_id not in self._initialized_nodes:
+                for topology_link in topology_links:
+                    self._loading_links.discard(topology_link["id"])
 
-                # create the node label if present
-                label_info = topology_node.get("label")
-                if label_info:
-                    node_label = NoteItem(node_item)
-                    node_label.setEditable(False)
-                    node_label.load(label_info)
-                    node_item.setLabel(node_label)
+        self._resources_type = resources_type
+        self._loading_stream = False
 
-                if "z" in topology_node:
-                    node_item.setZValue(topology_node["z"])
+        if topology_file_errors:
+            errors = "\n".join(topology_file_errors)
+            MessageBox(main_window, "Topology", "Errors detected while importing the topology", errors)
 
-                if "default_symbol" in topology_node:
-                    path = topology_node["default_symbol"]
-                    default_renderer = QtSvg.QSvgRenderer(path)
-                    if default_renderer.isValid():
-                        default_renderer.setObjectName(path)
-                        node_item.setDefaultRenderer(default_renderer)
+        if self._loading_total:
+            self._updateLoadProgress()
+        else:
+            # nothing to wait for
+            self._loadCompleted()
 
-                if "hover_symbol" in topology_node:
-                    path = topology_node["hover_symbol"]
-                    hover_renderer = QtSvg.QSvgRenderer(path)
-                    if hover_renderer.isValid() and default_renderer.isValid():
-                        # default renderer must be valid too
-                        hover_renderer.setObjectName(path)
-                        node_item.setHoverRenderer(hover_renderer)
+    def _loadServer(self, topology_server):
+        """
+        Loads a server reference from a topology.
 
-                view.scene().addItem(node_item)
-                self.addNode(node)
-                main_window.uiTopologySummaryTreeWidget.addNode(node)
+        :param topology_server: server representation (dictionary)
+        """
 
-        self._resources_type = topology.get("resources_type")
+        server_manager = Servers.instance()
+        if "local" in topology_server and topology_server["local"]:
+            self._servers[topology_server["id"]] = server_manager.localServer()
+        else:
+            host = topology_server["host"]
+            port = topology_server["port"]
+            self._servers[topology_server["id"]] = server_manager.getRemoteServer(host, port)
+
+    def _placeNodes(self, topology_nodes):
+        """
+        Moves the nodes of a topology being loaded between the remote
+        servers so that fewer links are UDP tunnels between two servers.
 
-        # notes
-        if "notes" in topology["topology"]:
-            notes = topology["topology"]["notes"]
-            for topology_note in notes:
-                note_item = NoteItem()
-                note_item.load(topology_note)
-                view.scene().addItem(note_item)
-                self.addNote(note_item)
+        :param topology_nodes: list of node representations (dictionaries)
+        """
 
-        # rectangles
-        if "rectangles" in topology["topology"]:
-            rectangles = topology["topology"]["rectangles"]
-            for topology_rectangle in rectangles:
-                rectangle_item = RectangleItem()
-                rectangle_item.load(topology_rectangle)
-                view.scene().addItem(rectangle_item)
-                self.addRectangle(rectangle_item)
+        node_servers = OrderedDict()
+        fixed_nodes = 0
+        for topology_node in topology_nodes:
+            server = self._servers.get(topology_node["server_id"])
+            if server is None:
+                continue
+            if self._isPlaceable(topology_node["type"], topology_node.get("properties", {})):
+                node_servers[topology_node["id"]] = server
+            else:
+                fixed_nodes += 1
+        if fixed_nodes:
+            log.info("{} nodes use images, configs or VMs of their server and are not moved".format(fixed_nodes))
+
+        links = OrderedDict()
+        for topology_links in self._node_to_links_mapping.values():
+            for topology_link in topology_links:
+                links[topology_link["id"]] = (topology_link["source_node_id"], topology_link["destination_node_id"])
+
+        moves, cross_links, planned_cross_links = self._placementPlan(node_servers, list(links.values()))
+        if not moves:
+            return
 
-        # ellipses
-        if "ellipses" in topology["topology"]:
-            ellipses = topology["topology"]["ellipses"]
-            for topology_ellipse in ellipses:
-                ellipse_item = EllipseItem()
-                ellipse_item.load(topology_ellipse)
-                view.scene().addItem(ellipse_item)
-                self.addEllipse(ellipse_item)
+        log.info("moving {} nodes to other servers: {} links between servers instead of {}".format(len(moves),
+                                                                                                   planned_cross_links,
+                                                                                                   cross_links))
+        for topology_node in topology_nodes:
+            server = moves.get(topology_node["id"])
+            if server is not None:
+                server_id = "placement-{}".format(server.id())
+                self._servers[server_id] = server
+                topology_node["server_id"] = server_id
+
+    def _loadLink(self, topology_link):
+        """
+        Loads a link from a topology. The link is created
+        once both its source and destination nodes are initialized.
 
-        # images
-        if "images" in topology["topology"]:
-            images = topology["topology"]["images"]
-            for topology_image in images:
+        :param topology_link: link representation (dictionary)
+        """
 
-                updated_image_path = os.path.join(main_window.projectSettings()["project_files_dir"], topology_image["path"])
-                if os.path.isfile(updated_image_path):
-                    image_path = updated_image_path
-                else:
-                    image_path = topology_image["path"]
-                if not os.path.isfile(image_path):
-                    topology_file_errors.append("Path to image {} doesn't exist".format(image_path))
-                    continue
+        log.debug("mapping node to link with ID {}".format(topology_link["id"]))
+        source_id = topology_link["source_node_id"]
+        destination_id = topology_link["destination_node_id"]
+        if source_id not in self._node_to_links_mapping:
+            self._node_to_links_mapping[source_id] = []
+        if destination_id not in self._node_to_links_mapping:
+            self._node_to_links_mapping[destination_id] = []
+        self._node_to_links_mapping[source_id].append(topology_link)
+        self._node_to_links_mapping[destination_id].append(topology_link)
+        self._loading_links.add(topology_link["id"])
+        self._loading_total += 1
+
+        if source_id in self._initialized_nodes and destination_id in self._initialized_nodes:
+            # both nodes have been created before the link was read
+            self._createLink(topology_link)
+
+    def _loadNodes(self, ready_nodes, topology_file_errors):
+        """
+        Loads the nodes ready to be created, the creation requests
+        to a server being sent in one batch (if batches are enabled).
 
-                pixmap = QtGui.QPixmap(image_path)
-                if pixmap.isNull():
-                    topology_file_errors.append("Image format not supported for {}".format(image_path))
-                    continue
+        :param ready_nodes: lists of node representations by server (emptied)
+        :param topology_file_errors: list to report errors
+        """
 
-                image_item = ImageItem(pixmap, image_path)
-                image_item.load(topology_image)
-                view.scene().addItem(image_item)
-                self.addImage(image_item)
+        for server, topology_nodes in ready_nodes.items():
+            batch = server.batchRequests()
+            if batch:
+                server.beginBatch()
+            try:
+                for topology_node in topology_nodes:
+                    self._loadNode(topology_node, topology_file_errors)
+            finally:
+                if batch:
+                    server.endBatch()
+        ready_nodes.clear()
+
+    def _loadNode(self, topology_node, topology_file_errors):
+        """
+        Loads a node from a topology and sends its creation request.
 
-        # instances
-        if "instances" in topology["topology"]:
-            instances = topology["topology"]["instances"]
-            for instance in instances:
-                self.addInstance(instance["name"], instance["id"], instance["size_id"],
-                                 instance["image_id"])
+        :param topology_node: node representation (dictionary)
+        :param topology_file_errors: list to report errors
+        """
 
-        if topology_file_errors:
-            errors = "\n".join(topology_file_errors)
-            MessageBox(main_window, "Topology", "Errors detected while importing the topology", errors)
+        from .main_window import MainWindow
+        main_window = MainWindow.instance()
+        view = main_window.uiGraphicsView
+
+        log.debug("loading node with ID {}".format(topology_node["id"]))
+
+        try:
+            node_module = None
+            for module in MODULES:
+                instance = module.instance()
+                node_class = module.getNodeClass(topology_node["type"])
+                if node_class:
+                    node_module = instance
+                    break
+            if not node_module:
+                raise ModuleError("Could not find any module for {}".format(topology_node["type"]))
+
+            server = self._servers[topology_node["server_id"]]
+            node = node_module.createNode(node_class, server)
+            node.error_signal.connect(main_window.uiConsoleTextEdit.writeError)
+            node.warning_signal.connect(main_window.uiConsoleTextEdit.writeWarning)
+            node.server_error_signal.connect(main_window.uiConsoleTextEdit.writeServerError)
+
+        except ModuleError as e:
+            topology_file_errors.append(str(e))
+            return
+
+        node.setId(topology_node["id"])
+
+        # we want to know when the node has been created or if it failed to be
+        node.created_signal.connect(self._nodeCreatedSlot)
+        node.error_signal.connect(self._nodeErrorSlot)
+        node.server_error_signal.connect(self._nodeServerErrorSlot)
+
+        # create the node item and restore GUI settings
+        node_item = NodeItem(node)
+        node_item.setPos(topology_node["x"], topology_node["y"])
+
+        # create the node label if present
+        label_info = topology_node.get("label")
+        if label_info:
+            node_label = NoteItem(node_item)
+            node_label.setEditable(False)
+            node_label.load(label_info)
+            node_item.setLabel(node_label)
+
+        if "z" in topology_node:
+            node_item.setZValue(topology_node["z"])
+
+        # the hover symbol is only used with a valid default symbol
+        if "default_symbol" in topology_node and node_item.setDefaultSymbol(topology_node["default_symbol"]):
+            if "hover_symbol" in topology_node:
+                node_item.setHoverSymbol(topology_node["hover_symbol"])
+
+        view.scene().addItem(node_item)
+        self.addNode(node)
+        main_window.uiTopologySummaryTreeWidget.addNode(node)
+        self._loading_nodes.add(node.id())
+        self._loading_total += 1
+
+        # load the settings and send the creation request
+        node.load(topology_node)
+
+        if not server.connected() and not server.isConnecting():
+            # the creation request could not be sent, no reply will come
+            topology_file_errors.append("Could not create {}: server {}:{} is not connected".format(topology_node["description"], server.host, server.port))
+            self._nodeLoadFailed(node.id())
+
+    def _loadImage(self, topology_image, topology_file_errors):
+        """
+        Loads an image from a topology.
+
+        :param topology_image: image representation (dictionary)
+        :param topology_file_errors: list to report errors
+        """
+
+        from .main_window import MainWindow
+        main_window = MainWindow.instance()
+
+        updated_image_path = os.path.join(main_window.projectSettings()["project_files_dir"], topology_image["path"])
+        if os.path.isfile(updated_image_path):
+            image_path = updated_image_path
+        else:
+            image_path = topology_image["path"]
+        if not os.path.isfile(image_path):
+            topology_file_errors.append("Path to image {} doesn't exist".format(image_path))
+            return
+
+        pixmap = QtGui.QPixmap(image_path)
+        if pixmap.isNull():
+            topology_file_errors.append("Image format not supported for {}".format(image_path))
+            return
+
+        image_item = ImageItem(pixmap, image_path)
+        image_item.load(topology_image)
+        main_window.uiGraphicsView.scene().addItem(image_item)
+        self.addImage(image_item)
 
     def _nodeCreatedSlot(self, node_id):
         """
@@ -632,11 +1229,11 @@ class Topology(object):
             log.warn("cannot find node or node not initialized")
             return
 
-        from .main_window import MainWindow
-        view = MainWindow.instance().uiGraphicsView
-
         log.debug("node {} has initialized".format(node.name()))
-        self._initialized_nodes.append(node_id)
+        self._initialized_nodes.add(node_id)
+        if node_id in self._loading_nodes:
+            self._loading_nodes.remove(node_id)
+            self._updateLoadProgress()
 
         if node_id in self._node_to_links_mapping:
             topology_link = self._node_to_links_mapping[node_id]
@@ -644,33 +1241,50 @@ class Topology(object):
                 source_node_id = link["source_node_id"]
                 destination_node_id = link["destination_node_id"]
                 if source_node_id in self._initialized_nodes and destination_node_id in self._initialized_nodes:
+                    self._createLink(link)
 
-                    source_node = self.getNode(source_node_id)
-                    destination_node = self.getNode(destination_node_id)
+    def _createLink(self, link):
+        """
+        Creates a link from a topology once both nodes are initialized.
 
-                    log.debug("creating link from {} to {}".format(source_node.name(), destination_node.name()))
+        :param link: link representation (dictionary)
+        """
+
+        from .main_window import MainWindow
+        view = MainWindow.instance().uiGraphicsView
 
-                    source_port = None
-                    destination_port = None
+        source_node = self.getNode(link["source_node_id"])
+        destination_node = self.getNode(link["destination_node_id"])
 
-                    # find the source port
-                    for port in source_node.ports():
-                        if port.id() == link["source_port_id"]:
-                            source_port = port
-                            if "source_port_label" in link:
-                                source_port.setLabel(self._createPortLabel(source_node, link["source_port_label"]))
-                            break
+        log.debug("creating link from {} to {}".format(source_node.name(), destination_node.name()))
 
-                    # find the destination port
-                    for port in destination_node.ports():
-                        if port.id() == link["destination_port_id"]:
-                            destination_port = port
-                            if "destination_port_label" in link:
-                                destination_port.setLabel(self._createPortLabel(destination_node, link["destination_port_label"]))
-                            break
+        source_port = None
+        destination_port = None
+
+        # find the source port
+        for port in source_node.ports():
+            if port.id() == link["source_port_id"]:
+                source_port = port
+                if "source_port_label" in link:
+                    source_port.setLabel(self._createPortLabel(source_node, link["source_port_label"]))
+                break
+
+        # find the destination port
+        for port in destination_node.ports():
+            if port.id() == link["destination_port_id"]:
+                destination_port = port
+                if "destination_port_label" in link:
+                    destination_port.setLabel(self._createPortLabel(destination_node, link["destination_port_label"]))
+                break
 
-                    if source_port and destination_port:
-                        view.addLink(source_node, source_port, destination_node, destination_port)
+        if source_port and destination_port:
+            new_link = view.addLink(source_node, source_port, destination_node, destination_port)
+            if link["id"] in self._loading_links:
+                self._link_to_topology_link[new_link.id()] = link["id"]
+                new_link.add_link_signal.connect(self._linkLoadedSlot)
+                new_link.cancel_link_signal.connect(self._linkLoadedSlot)
+        else:
+            self._linkLoaded(link["id"])
 
     def _createPortLabel(self, node, label_info):
         """
@@ -685,22 +1299,135 @@ class Topology(object):
         from .main_window import MainWindow
         view = MainWindow.instance().uiGraphicsView
 
-        for item in view.scene().items():
-            if isinstance(item, NodeItem) and node.id() == item.node().id():
-                port_label = NoteItem(item)
-                port_label.load(label_info)
-                port_label.hide()
-                return port_label
-        return None
+        node_item = view.nodeItem(node.id())
+        if not node_item:
+            return None
+
+        port_label = NoteItem(node_item)
+        port_label.load(label_info)
+        port_label.hide()
+        return port_label
+
+    def _nodeErrorSlot(self, node_id, message):
+        """
+        Slot to know when a node reports an error while loading.
+
+        :param node_id: node identifier
+        :param message: error message
+        """
+
+        self._nodeLoadFailed(node_id)
+
+    def _nodeServerErrorSlot(self, node_id, code, message):
+        """
+        Slot to know when a node receives an error from
+        its server while loading.
+
+        :param node_id: node identifier
+        :param code: error code
+        :param message: error message
+        """
+
+        self._nodeLoadFailed(node_id)
+
+    def _nodeLoadFailed(self, node_id):
+        """
+        Stops waiting for a node (and its links) that could not be created.
+
+        :param node_id: node identifier
+        """
+
+        if node_id not in self._loading_nodes:
+            return
+
+        log.warning("node with ID {} could not be loaded".format(node_id))
+        self._loading_nodes.remove(node_id)
+        for topology_link in self._node_to_links_mapping.get(node_id, []):
+            self._loading_links.discard(topology_link["id"])
+        self._updateLoadProgress()
+
+    def _linkLoadedSlot(self, link_id):
+        """
+        Slot to know when a link has been created or canceled while loading.
+
+        :param link_id: link identifier
+        """
+
+        link = self.getLink(link_id)
+        if link:
+            link.add_link_signal.disconnect(self._linkLoadedSlot)
+            link.cancel_link_signal.disconnect(self._linkLoadedSlot)
+        if link_id in self._link_to_topology_link:
+            self._linkLoaded(self._link_to_topology_link.pop(link_id))
+
+    def _linkLoaded(self, topology_link_id):
+        """
+        Marks a link from the topology file as processed.
+
+        :param topology_link_id: link identifier in the topology file
+        """
+
+        if topology_link_id in self._loading_links:
+            self._loading_links.remove(topology_link_id)
+            self._updateLoadProgress()
+
+    def _updateLoadProgress(self):
+        """
+        Reports the loading progress and detects
+        when the topology is fully loaded.
+        """
+
+        if not self._loading_total:
+            return
+
+        remaining = len(self._loading_nodes) + len(self._loading_links)
+        self.load_progress_signal.emit(self._loading_total - remaining, self._loading_total)
+        if not remaining and not self._loading_stream:
+            # everything has been read and created
+            self._loadCompleted()
 
-    def _reactivateUnsavedState(self):
+    def _abortLoading(self):
         """
-        Slots to reactivate the unsaved state support
-        when the QTimer timeouts
+        Stops waiting for the topology being loaded,
+        e.g. when its file cannot be read to the end.
         """
 
+        self._loading_stream = False
+        self._loading_total = 0
+        self._loading_nodes.clear()
+        self._loading_links.clear()
+        self._link_to_topology_link.clear()
+        self._node_to_links_mapping = {}
+        log.info("topology loading has been aborted")
+
+        # the unsaved state support can be reactivated
+        from .main_window import MainWindow
+        MainWindow.instance().ignoreUnsavedState(False)
+
+    def isLoading(self):
+        """
+        Returns either a topology is being loaded.
+
+        :returns: boolean
+        """
+
+        return self._loading_total > 0
+
+    def _loadCompleted(self):
+        """
+        Called when the topology has been fully loaded.
+        """
+
+        self._loading_total = 0
+        self._loading_nodes.clear()
+        self._loading_links.clear()
+        self._link_to_topology_link.clear()
+        log.info("topology has been loaded")
+
+        # the unsaved state support can be reactivated
         from .main_window import MainWindow
         MainWindow.instance().ignoreUnsavedState(False)
+        self.loaded_signal.emit()
 
     def __str__(self):
 
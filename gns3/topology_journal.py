@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Append-only journal of the changes made to a topology since
+it was last saved. The journal is stored next to the topology file
+and replayed on top of it when the topology is loaded.
+"""
+
+import os
+import json
+from collections import OrderedDict
+
+from .qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+# number of records written before compacting the journal
+# (and at least twice the number of objects it describes)
+COMPACTION_THRESHOLD = 200
+
+
+class TopologyJournal(QtCore.QObject):
+    """
+    Topology journal.
+
+    Each line of the journal file is a JSON record with an operation
+    ("update" or "remove"), a topology section ("nodes", "links", "notes",
+    "rectangles" or "ellipses") and the representation of the object.
+    Notes and shapes do not have identifiers, they are recorded with their
+    position in the topology file (or a unique identifier when added since).
+    """
+
+    def __init__(self):
+
+        super(TopologyJournal, self).__init__()
+        self._path = None
+        self._file = None
+        self._records = OrderedDict()
+        self._record_count = 0
+        self._compaction_thread = None
+        self._compaction_backlog = []
+
+    @staticmethod
+    def journalPath(project_path):
+        """
+        Returns the path of the journal for a topology file.
+
+        :param project_path: path to the topology file
+
+        :returns: path to the journal file
+        """
+
+        return project_path + ".journal"
+
+    @staticmethod
+    def _key(record):
+        """
+        Returns the key of the object described by a record. Links are
+        identified by their ports as link IDs change each time a topology
+        is loaded.
+
+        :param record: journal record (dictionary)
+
+        :returns: key (tuple)
+        """
+
+        section = record["section"]
+        data = record["data"]
+        if section == "nodes":
+            return section, data["id"]
+        if section == "links":
+            return section, tuple(sorted((data["source_port_id"], data["destination_port_id"])))
+        return section, record["drawing_id"]
+
+    def isOpen(self):
+        """
+        Returns either the journal is open for recording.
+
+        :returns: boolean
+        """
+
+        return self._file is not None
+
+    def open(self, project_path, records=None):
+        """
+        Opens the journal of a topology file for recording.
+
+        :param project_path: path to the topology file
+        :param records: records already in the journal (see read()),
+        the journal is emptied if not set
+        """
+
+        self.close()
+        self._path = self.journalPath(project_path)
+        self._records = OrderedDict()
+        self._record_count = 0
+        for record in records or []:
+            self._records[self._key(record)] = record
+            self._record_count += 1
+        try:
+            self._file = open(self._path, "a" if records else "w", encoding="utf-8")
+        except OSError as e:
+            log.warning("could not open the topology journal {}: {}".format(self._path, e))
+            self._file = None
+        else:
+            log.info("recording topology changes to {}".format(self._path))
+
+    def close(self):
+        """
+        Closes the journal, the journal file is kept.
+        """
+
+        if self._compaction_thread:
+            self._compaction_thread.completed.disconnect(self._compactionCompletedSlot)
+            self._compaction_thread.error.disconnect(self._compactionErrorSlot)
+            self._compaction_thread.wait()
+            self._compaction_thread = None
+            try:
+                os.remove(self._path + ".tmp")
+            except OSError:
+                pass
+        self._compaction_backlog = []
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """
+        Closes the journal and deletes the journal file
+        (changes since the last save are abandoned).
+        """
+
+        path = self._path
+        self.close()
+        self._records = OrderedDict()
+        if path and os.path.isfile(path):
+            log.info("deleting topology journal {}".format(path))
+            try:
+                os.remove(path)
+            except OSError as e:
+                log.warning("could not delete the topology journal {}: {}".format(path, e))
+
+    def record(self, operation, section, data, **kwargs):
+        """
+        Appends a record to the journal.
+
+        :param operation: "update" or "remove"
+        :param section: topology section
+        :param data: object representation
+        :param kwargs: additional record fields
+        """
+
+        if not self._file:
+            return
+
+        record = {"operation": operation, "section": section, "data": data}
+        record.update(kwargs)
+        line = json.dumps(record, sort_keys=True) + "\n"
+        try:
+            self._file.write(line)
+            self._file.flush()
+        except OSError as e:
+            log.warning("could not write to the topology journal {}: {}".format(self._path, e))
+            return
+
+        key = self._key(record)
+        self._records.pop(key, None)
+        self._records[key] = record
+        self._record_count += 1
+        if self._compaction_thread:
+            self._compaction_backlog.append(line)
+        elif self._record_count > max(COMPACTION_THRESHOLD, 2 * len(self._records)):
+            self._compact()
+
+    def _compact(self):
+        """
+        Rewrites the journal in a background thread,
+        keeping only the last record of each object.
+        """
+
+        log.info("compacting topology journal {}".format(self._path))
+        self._compaction_thread = JournalCompactionThread(self._path + ".tmp", list(self._records.values()))
+        self._compaction_thread.completed.connect(self._compactionCompletedSlot)
+        self._compaction_thread.error.connect(self._compactionErrorSlot)
+        self._compaction_thread.start()
+
+    def _compactionCompletedSlot(self):
+        """
+        Slot called when the compacted journal has been written.
+        The records added in the meantime are appended to it
+        before it replaces the current journal.
+        """
+
+        self._compaction_thread = None
+        path = self._path + ".tmp"
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.writelines(self._compaction_backlog)
+            self._file.close()
+            os.replace(path, self._path)
+            self._file = open(self._path, "a", encoding="utf-8")
+        except OSError as e:
+            log.warning("could not compact the topology journal {}: {}".format(self._path, e))
+            if self._file.closed:
+                self._file = open(self._path, "a", encoding="utf-8")
+        else:
+            self._record_count = len(self._records)
+        self._compaction_backlog = []
+
+    def _compactionErrorSlot(self, message):
+        """
+        Slot called when the compacted journal could not be written.
+
+        :param message: error message
+        """
+
+        log.warning("could not compact the topology journal {}: {}".format(self._path, message))
+        self._compaction_thread = None
+        self._compaction_backlog = []
+        # try again after as many records as the journal currently has
+        self._record_count = len(self._records)
+
+    @staticmethod
+    def read(project_path):
+        """
+        Reads the journal of a topology file.
+
+        :param project_path: path to the topology file
+
+        :returns: list of records
+        """
+
+        path = TopologyJournal.journalPath(project_path)
+        if not os.path.isfile(path):
+            return []
+
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # most likely the last record was being written when the application stopped
+                    log.warning("ignoring invalid record on line {} of the topology journal {}".format(line_number, path))
+        log.info("{} records read from the topology journal {}".format(len(records), path))
+        return records
+
+    @staticmethod
+    def replay(sections, records):
+        """
+        Applies journal records to a topology read section by section.
+
+        :param sections: iterable of (path, value) tuples (see JSONStreamReader)
+        :param records: journal records (see read())
+
+        :returns: iterator of (path, value) tuples
+        """
+
+        objects = OrderedDict()
+        for record in records:
+            key = TopologyJournal._key(record)
+            objects.pop(key, None)
+            objects[key] = record
+
+        link_ids = []
+        drawing_positions = {}
+        for path, value in sections:
+            if len(path) == 2 and path[0] == "topology":
+                section = path[1]
+                if section in ("nodes", "links"):
+                    if TopologyJournal._key({"section": section, "data": value}) in objects:
+                        # replaced or removed by the journal
+                        continue
+                    if section == "links":
+                        link_ids.append(value["id"])
+                elif section in ("notes", "rectangles", "ellipses"):
+                    position = drawing_positions.get(section, 0)
+                    drawing_positions[section] = position + 1
+                    if (section, position) in objects:
+                        # replaced or removed by the journal
+                        continue
+                    value = dict(value, drawing_id=position)
+            yield path, value
+
+        # link IDs recorded in the journal may be used by links of the topology file
+        next_link_id = max(link_ids, default=0) + 1
+        servers = set()
+        for key, record in objects.items():
+            if record["operation"] == "remove":
+                continue
+            section = record["section"]
+            if section == "nodes":
+                # server IDs are not persistent, the node server is part of the record
+                server = record["server"]
+                if server.get("local"):
+                    server_id = "journal-local"
+                else:
+                    server_id = "journal-{}:{}".format(server["host"], server["port"])
+                if server_id not in servers:
+                    servers.add(server_id)
+                    yield ("topology", "servers"), dict(server, id=server_id)
+                yield ("topology", "nodes"), dict(record["data"], server_id=server_id)
+            elif section == "links":
+                yield ("topology", "links"), dict(record["data"], id=next_link_id)
+                next_link_id += 1
+            else:
+                yield ("topology", section), dict(record["data"], drawing_id=record["drawing_id"])
+
+
+class JournalCompactionThread(QtCore.QThread):
+    """
+    Thread to write a compacted journal without blocking the GUI.
+
+    :param path: path to the compacted journal file
+    :param records: records to write
+    """
+
+    error = QtCore.pyqtSignal(str)
+    completed = QtCore.pyqtSignal()
+
+    def __init__(self, path, records):
+
+        QtCore.QThread.__init__(self)
+        self._path = path
+        self._records = records
+
+    def run(self):
+        """
+        Thread starting point.
+        """
+
+        try:
+            with open(self._path, "w", encoding="utf-8") as f:
+                for record in self._records:
+                    f.write(json.dumps(record, sort_keys=True) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            self.error.emit(str(e))
+            return
+        self.completed.emit()
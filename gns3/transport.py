@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Binary encoding of the JSON-RPC messages exchanged with a server
+supporting it (negotiated as a WebSocket subprotocol).
+
+A message is sent as a binary frame: one flags byte followed by the
+payload, deflated if the COMPRESSED flag is set. The payload is
+a JSON header (prefixed by its length) and the raw content of the
+base64 values, each prefixed by its length. In the header, the value of
+a key ending with "_base64" is replaced by {"$blob": <blob index>}, the
+receiving side gives the application the base64 string back.
+"""
+
+import json
+import zlib
+import struct
+import base64
+import binascii
+
+# WebSocket subprotocol offered to the servers
+BINARY_PROTOCOL = "gns3-binary-1"
+
+# flags
+COMPRESSED = 0x01
+
+# payloads smaller than this are not worth compressing
+COMPRESSION_THRESHOLD = 256
+
+BLOB_KEY = "$blob"
+BASE64_SUFFIX = "_base64"
+
+_length = struct.Struct("!I")
+
+
+def _extractBlobs(value, blobs):
+    """
+    Replaces the base64 values by blob references.
+
+    :param value: JSON value
+    :param blobs: list to add the blobs to
+
+    :returns: JSON value
+    """
+
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if isinstance(item, str) and key.endswith(BASE64_SUFFIX):
+                try:
+                    blob = base64.b64decode(item.encode("ascii"), validate=True)
+                except (ValueError, binascii.Error):
+                    result[key] = item
+                    continue
+                result[key] = {BLOB_KEY: len(blobs)}
+                blobs.append(blob)
+            else:
+                result[key] = _extractBlobs(item, blobs)
+        return result
+    if isinstance(value, list):
+        return [_extractBlobs(item, blobs) for item in value]
+    return value
+
+
+def _restoreBlobs(value, blobs):
+    """
+    Replaces the blob references by base64 values.
+
+    :param value: JSON value
+    :param blobs: list of blobs
+
+    :returns: JSON value
+    """
+
+    if isinstance(value, dict):
+        if len(value) == 1 and BLOB_KEY in value:
+            return base64.b64encode(blobs[value[BLOB_KEY]]).decode("ascii")
+        return {key: _restoreBlobs(item, blobs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restoreBlobs(item, blobs) for item in value]
+    return value
+
+
+def encode(message):
+    """
+    Encodes a JSON-RPC message (or batch) in binary.
+
+    :param message: JSON-RPC message as Python objects
+
+    :returns: bytes
+    """
+
+    blobs = []
+    header = json.dumps(_extractBlobs(message, blobs), separators=(",", ":")).encode("utf-8")
+    parts = [_length.pack(len(header)), header]
+    for blob in blobs:
+        parts.append(_length.pack(len(blob)))
+        parts.append(blob)
+    payload = b"".join(parts)
+
+    if len(payload) >= COMPRESSION_THRESHOLD:
+        return bytes([COMPRESSED]) + zlib.compress(payload, 6)
+    return bytes([0]) + payload
+
+
+def decode(data):
+    """
+    Decodes a binary JSON-RPC message (or batch).
+
+    :param data: bytes
+
+    :returns: JSON-RPC message as Python objects
+    """
+
+    if not data:
+        raise ValueError("Empty binary message")
+    flags = data[0]
+    payload = data[1:]
+    if flags & COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    offset = 0
+    chunks = []
+    while offset < len(payload):
+        if offset + _length.size > len(payload):
+            raise ValueError("Truncated binary message")
+        length = _length.unpack_from(payload, offset)[0]
+        offset += _length.size
+        if offset + length > len(payload):
+            raise ValueError("Truncated binary message")
+        chunks.append(payload[offset:offset + length])
+        offset += length
+
+    if not chunks:
+        raise ValueError("Binary message without header")
+    message = json.loads(chunks[0].decode("utf-8"))
+    return _restoreBlobs(message, chunks[1:])
@@ -113,6 +113,25 @@ class Ui_GeneralPreferencesPageWidget(object):
         self.uiSlowStartAllSpinBox.setMaximum(10000)
         self.uiSlowStartAllSpinBox.setObjectName(_fromUtf8("uiSlowStartAllSpinBox"))
         self.gridLayout_2.addWidget(self.uiSlowStartAllSpinBox, 4, 0, 1, 2)
+        self.uiStartAllServerConcurrencyLabel = QtGui.QLabel(self.uiGeneralMiscGroupBox)
+        self.uiStartAllServerConcurrencyLabel.setObjectName(_fromUtf8("uiStartAllServerConcurrencyLabel"))
+        self.gridLayout_2.addWidget(self.uiStartAllServerConcurrencyLabel, 5, 0, 1, 1)
+        self.uiStartAllServerConcurrencySpinBox = QtGui.QSpinBox(self.uiGeneralMiscGroupBox)
+        self.uiStartAllServerConcurrencySpinBox.setMinimum(1)
+        self.uiStartAllServerConcurrencySpinBox.setMaximum(1000)
+        self.uiStartAllServerConcurrencySpinBox.setObjectName(_fromUtf8("uiStartAllServerConcurrencySpinBox"))
+        self.gridLayout_2.addWidget(self.uiStartAllServerConcurrencySpinBox, 5, 1, 1, 1)
+        self.uiStartAllNodeTypeConcurrencyLabel = QtGui.QLabel(self.uiGeneralMiscGroupBox)
+        self.uiStartAllNodeTypeConcurrencyLabel.setObjectName(_fromUtf8("uiStartAllNodeTypeConcurrencyLabel"))
+        self.gridLayout_2.addWidget(self.uiStartAllNodeTypeConcurrencyLabel, 6, 0, 1, 1)
+        self.uiStartAllNodeTypeConcurrencySpinBox = QtGui.QSpinBox(self.uiGeneralMiscGroupBox)
+        self.uiStartAllNodeTypeConcurrencySpinBox.setMaximum(1000)
+        self.uiStartAllNodeTypeConcurrencySpinBox.setObjectName(_fromUtf8("uiStartAllNodeTypeConcurrencySpinBox"))
+        self.gridLayout_2.addWidget(self.uiStartAllNodeTypeConcurrencySpinBox, 6, 1, 1, 1)
+        self.uiStartAllWaitForStartedCheckBox = QtGui.QCheckBox(self.uiGeneralMiscGroupBox)
+        self.uiStartAllWaitForStartedCheckBox.setChecked(True)
+        self.uiStartAllWaitForStartedCheckBox.setObjectName(_fromUtf8("uiStartAllWaitForStartedCheckBox"))
+        self.gridLayout_2.addWidget(self.uiStartAllWaitForStartedCheckBox, 7, 0, 1, 2)
         self.uiLinkManualModeCheckBox = QtGui.QCheckBox(self.uiGeneralMiscGroupBox)
         self.uiLinkManualModeCheckBox.setChecked(True)
         self.uiLinkManualModeCheckBox.setObjectName(_fromUtf8("uiLinkManualModeCheckBox"))
@@ -282,8 +301,12 @@ class Ui_GeneralPreferencesPageWidget(object):
         self.uiConfigurationFileLabel.setText(_translate("GeneralPreferencesPageWidget", "Unknown location", None))
         self.uiGeneralMiscGroupBox.setTitle(_translate("GeneralPreferencesPageWidget", "Miscellaneous", None))
         self.uiCheckForUpdateCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Automatically check for update", None))
-        self.uiSlowStartAllLabel.setText(_translate("GeneralPreferencesPageWidget", "Delay between each device start when starting all devices:", None))
+        self.uiSlowStartAllLabel.setText(_translate("GeneralPreferencesPageWidget", "Delay between each group of devices started when starting all devices:", None))
         self.uiSlowStartAllSpinBox.setSuffix(_translate("GeneralPreferencesPageWidget", " seconds", None))
+        self.uiStartAllServerConcurrencyLabel.setText(_translate("GeneralPreferencesPageWidget", "Maximum devices starting at once on a server:", None))
+        self.uiStartAllNodeTypeConcurrencySpinBox.setSpecialValueText(_translate("GeneralPreferencesPageWidget", "Unlimited", None))
+        self.uiStartAllNodeTypeConcurrencyLabel.setText(_translate("GeneralPreferencesPageWidget", "Maximum devices of the same type starting at once on a server:", None))
+        self.uiStartAllWaitForStartedCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Wait for devices to be started before starting the next ones", None))
         self.uiLinkManualModeCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Always use manual mode when adding links", None))
         self.uiRestoreDefaultsPushButton.setText(_translate("GeneralPreferencesPageWidget", "Restore defaults", None))
         self.uiTabWidget.setTabText(self.uiTabWidget.indexOf(self.uiGeneralTab), _translate("GeneralPreferencesPageWidget", "General", None))
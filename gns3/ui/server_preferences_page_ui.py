@@ -106,18 +106,69 @@ class Ui_ServerPreferencesPageWidget(object):
         self.uiDeleteRemoteServerPushButton.setEnabled(False)
         self.uiDeleteRemoteServerPushButton.setObjectName(_fromUtf8("uiDeleteRemoteServerPushButton"))
         self.horizontalLayout_3.addWidget(self.uiDeleteRemoteServerPushButton)
-        self.gridLayout_2.addLayout(self.horizontalLayout_3, 5, 0, 1, 1)
+        self.gridLayout_2.addLayout(self.horizontalLayout_3, 7, 0, 1, 1)
         spacerItem2 = QtGui.QSpacerItem(206, 20, QtGui.QSizePolicy.Expanding, QtGui.QSizePolicy.Minimum)
-        self.gridLayout_2.addItem(spacerItem2, 5, 1, 1, 1)
+        self.gridLayout_2.addItem(spacerItem2, 7, 1, 1, 1)
         spacerItem3 = QtGui.QSpacerItem(390, 12, QtGui.QSizePolicy.Minimum, QtGui.QSizePolicy.Expanding)
-        self.gridLayout_2.addItem(spacerItem3, 6, 0, 1, 2)
+        self.gridLayout_2.addItem(spacerItem3, 8, 0, 1, 2)
         self.uiRemoteServerPortSpinBox = QtGui.QSpinBox(self.uiRemoteTabWidget)
         self.uiRemoteServerPortSpinBox.setSuffix(_fromUtf8(" TCP"))
         self.uiRemoteServerPortSpinBox.setMaximum(65535)
         self.uiRemoteServerPortSpinBox.setProperty("value", 8000)
         self.uiRemoteServerPortSpinBox.setObjectName(_fromUtf8("uiRemoteServerPortSpinBox"))
         self.gridLayout_2.addWidget(self.uiRemoteServerPortSpinBox, 4, 0, 1, 2)
+        self.uiRemoteServerWeightLabel = QtGui.QLabel(self.uiRemoteTabWidget)
+        self.uiRemoteServerWeightLabel.setObjectName(_fromUtf8("uiRemoteServerWeightLabel"))
+        self.gridLayout_2.addWidget(self.uiRemoteServerWeightLabel, 5, 0, 1, 1)
+        self.uiRemoteServerWeightDoubleSpinBox = QtGui.QDoubleSpinBox(self.uiRemoteTabWidget)
+        self.uiRemoteServerWeightDoubleSpinBox.setDecimals(1)
+        self.uiRemoteServerWeightDoubleSpinBox.setMinimum(0.1)
+        self.uiRemoteServerWeightDoubleSpinBox.setMaximum(100.0)
+        self.uiRemoteServerWeightDoubleSpinBox.setSingleStep(0.5)
+        self.uiRemoteServerWeightDoubleSpinBox.setProperty("value", 1.0)
+        self.uiRemoteServerWeightDoubleSpinBox.setObjectName(_fromUtf8("uiRemoteServerWeightDoubleSpinBox"))
+        self.gridLayout_2.addWidget(self.uiRemoteServerWeightDoubleSpinBox, 6, 0, 1, 2)
         self.uiTabWidget.addTab(self.uiRemoteTabWidget, _fromUtf8(""))
+        self.uiAdvancedTabWidget = QtGui.QWidget()
+        self.uiAdvancedTabWidget.setObjectName(_fromUtf8("uiAdvancedTabWidget"))
+        self.gridLayout_3 = QtGui.QGridLayout(self.uiAdvancedTabWidget)
+        self.gridLayout_3.setObjectName(_fromUtf8("gridLayout_3"))
+        self.uiBatchRequestsCheckBox = QtGui.QCheckBox(self.uiAdvancedTabWidget)
+        self.uiBatchRequestsCheckBox.setObjectName(_fromUtf8("uiBatchRequestsCheckBox"))
+        self.gridLayout_3.addWidget(self.uiBatchRequestsCheckBox, 0, 0, 1, 2)
+        self.uiBinaryTransportCheckBox = QtGui.QCheckBox(self.uiAdvancedTabWidget)
+        self.uiBinaryTransportCheckBox.setChecked(True)
+        self.uiBinaryTransportCheckBox.setObjectName(_fromUtf8("uiBinaryTransportCheckBox"))
+        self.gridLayout_3.addWidget(self.uiBinaryTransportCheckBox, 1, 0, 1, 2)
+        self.uiHeartbeatIntervalLabel = QtGui.QLabel(self.uiAdvancedTabWidget)
+        self.uiHeartbeatIntervalLabel.setObjectName(_fromUtf8("uiHeartbeatIntervalLabel"))
+        self.gridLayout_3.addWidget(self.uiHeartbeatIntervalLabel, 2, 0, 1, 1)
+        self.uiHeartbeatIntervalSpinBox = QtGui.QSpinBox(self.uiAdvancedTabWidget)
+        self.uiHeartbeatIntervalSpinBox.setMinimum(1)
+        self.uiHeartbeatIntervalSpinBox.setMaximum(3600)
+        self.uiHeartbeatIntervalSpinBox.setProperty("value", 5)
+        self.uiHeartbeatIntervalSpinBox.setObjectName(_fromUtf8("uiHeartbeatIntervalSpinBox"))
+        self.gridLayout_3.addWidget(self.uiHeartbeatIntervalSpinBox, 2, 1, 1, 1)
+        self.uiRequestTimeoutLabel = QtGui.QLabel(self.uiAdvancedTabWidget)
+        self.uiRequestTimeoutLabel.setObjectName(_fromUtf8("uiRequestTimeoutLabel"))
+        self.gridLayout_3.addWidget(self.uiRequestTimeoutLabel, 3, 0, 1, 1)
+        self.uiRequestTimeoutSpinBox = QtGui.QSpinBox(self.uiAdvancedTabWidget)
+        self.uiRequestTimeoutSpinBox.setMaximum(3600)
+        self.uiRequestTimeoutSpinBox.setProperty("value", 60)
+        self.uiRequestTimeoutSpinBox.setObjectName(_fromUtf8("uiRequestTimeoutSpinBox"))
+        self.gridLayout_3.addWidget(self.uiRequestTimeoutSpinBox, 3, 1, 1, 1)
+        self.uiAllocationPolicyLabel = QtGui.QLabel(self.uiAdvancedTabWidget)
+        self.uiAllocationPolicyLabel.setObjectName(_fromUtf8("uiAllocationPolicyLabel"))
+        self.gridLayout_3.addWidget(self.uiAllocationPolicyLabel, 4, 0, 1, 1)
+        self.uiAllocationPolicyComboBox = QtGui.QComboBox(self.uiAdvancedTabWidget)
+        self.uiAllocationPolicyComboBox.setObjectName(_fromUtf8("uiAllocationPolicyComboBox"))
+        self.gridLayout_3.addWidget(self.uiAllocationPolicyComboBox, 4, 1, 1, 1)
+        self.uiOptimizePlacementCheckBox = QtGui.QCheckBox(self.uiAdvancedTabWidget)
+        self.uiOptimizePlacementCheckBox.setObjectName(_fromUtf8("uiOptimizePlacementCheckBox"))
+        self.gridLayout_3.addWidget(self.uiOptimizePlacementCheckBox, 5, 0, 1, 2)
+        spacerItem4 = QtGui.QSpacerItem(390, 12, QtGui.QSizePolicy.Minimum, QtGui.QSizePolicy.Expanding)
+        self.gridLayout_3.addItem(spacerItem4, 9, 0, 1, 2)
+        self.uiTabWidget.addTab(self.uiAdvancedTabWidget, _fromUtf8(""))
         self.vboxlayout.addWidget(self.uiTabWidget)
 
         self.retranslateUi(ServerPreferencesPageWidget)
@@ -139,10 +190,22 @@ class Ui_ServerPreferencesPageWidget(object):
         self.uiTabWidget.setTabText(self.uiTabWidget.indexOf(self.uiLocalTabWidget), _translate("ServerPreferencesPageWidget", "Local server", None))
         self.uiRemoteServersTreeWidget.headerItem().setText(0, _translate("ServerPreferencesPageWidget", "Host", None))
         self.uiRemoteServersTreeWidget.headerItem().setText(1, _translate("ServerPreferencesPageWidget", "Port", None))
+        self.uiRemoteServersTreeWidget.headerItem().setText(2, _translate("ServerPreferencesPageWidget", "Weight", None))
         self.uiRemoteServerHostLabel.setText(_translate("ServerPreferencesPageWidget", "Host:", None))
         self.uiRemoteServerPortLineEdit.setText(_translate("ServerPreferencesPageWidget", "192.168.56.101", None))
         self.uiRemoteServerPortLabel.setText(_translate("ServerPreferencesPageWidget", "Port:", None))
+        self.uiRemoteServerWeightLabel.setText(_translate("ServerPreferencesPageWidget", "Weight:", None))
         self.uiAddRemoteServerPushButton.setText(_translate("ServerPreferencesPageWidget", "Add", None))
         self.uiDeleteRemoteServerPushButton.setText(_translate("ServerPreferencesPageWidget", "Delete", None))
         self.uiTabWidget.setTabText(self.uiTabWidget.indexOf(self.uiRemoteTabWidget), _translate("ServerPreferencesPageWidget", "Remote servers", None))
+        self.uiBatchRequestsCheckBox.setText(_translate("ServerPreferencesPageWidget", "Send the requests to a server in batches", None))
+        self.uiBinaryTransportCheckBox.setText(_translate("ServerPreferencesPageWidget", "Use the binary transport when the server supports it", None))
+        self.uiHeartbeatIntervalLabel.setText(_translate("ServerPreferencesPageWidget", "Heartbeat interval:", None))
+        self.uiHeartbeatIntervalSpinBox.setSuffix(_translate("ServerPreferencesPageWidget", " seconds", None))
+        self.uiRequestTimeoutLabel.setText(_translate("ServerPreferencesPageWidget", "Request timeout:", None))
+        self.uiRequestTimeoutSpinBox.setSpecialValueText(_translate("ServerPreferencesPageWidget", "None", None))
+        self.uiRequestTimeoutSpinBox.setSuffix(_translate("ServerPreferencesPageWidget", " seconds", None))
+        self.uiAllocationPolicyLabel.setText(_translate("ServerPreferencesPageWidget", "Remote server allocation:", None))
+        self.uiOptimizePlacementCheckBox.setText(_translate("ServerPreferencesPageWidget", "Move linked nodes to the same remote server when loading a topology", None))
+        self.uiTabWidget.setTabText(self.uiTabWidget.indexOf(self.uiAdvancedTabWidget), _translate("ServerPreferencesPageWidget", "Advanced", None))
 
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Incremental reader for large JSON documents (e.g. topology files).
+The file is read by chunks and values are decoded one at a time so
+they can be processed before the whole document has been parsed.
+"""
+
+import os
+import json
+import codecs
+
+WHITESPACE = " \t\n\r"
+
+
+class JSONStreamReader(object):
+    """
+    Reads a JSON object section by section.
+
+    Iterating over the reader yields (path, value) tuples. Members of the
+    top-level object are yielded with a path of one key, e.g. ("version",).
+    Objects whose key is listed in expand are not decoded at once: their
+    members are yielded with a path of two keys and, when a member is an
+    array, each element is yielded separately, e.g. ("topology", "nodes").
+
+    :param path: path to the JSON file
+    :param expand: keys of top-level objects to read member by member
+    :param chunk_size: number of bytes to read at a time
+    """
+
+    def __init__(self, path, expand=("topology",), chunk_size=65536):
+
+        self._path = path
+        self._expand = expand
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._text_decoder = None
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._size = 0
+        self._read_size = 0
+
+    def progress(self):
+        """
+        Returns the parsing progress.
+
+        :returns: percentage of the file that has been read (integer)
+        """
+
+        if not self._size:
+            return 100
+        return min(100, int(self._read_size * 100 / self._size))
+
+    def _read(self, chunk_size=None):
+        """
+        Reads a new chunk from the file.
+
+        :param chunk_size: number of bytes to read (default is the reader chunk size)
+
+        :returns: False if the end of the file has been reached
+        """
+
+        if self._eof:
+            return False
+
+        # drop the data that has already been decoded
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+        chunk = self._file.read(chunk_size or self._chunk_size)
+        self._read_size += len(chunk)
+        if not chunk:
+            self._eof = True
+            self._buffer += self._text_decoder.decode(b"", final=True)
+            return False
+        self._buffer += self._text_decoder.decode(chunk)
+        return True
+
+    def _peek(self):
+        """
+        Returns the next non-whitespace character without consuming it.
+
+        :returns: character or empty string at the end of the file
+        """
+
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return ""
+
+    def _expect(self, characters):
+        """
+        Consumes the next non-whitespace character.
+
+        :param characters: accepted characters
+
+        :returns: the consumed character
+        """
+
+        character = self._peek()
+        if not character or character not in characters:
+            raise ValueError("Expecting one of '{}' at position {} of {}".format(characters, self._pos, self._path))
+        self._pos += 1
+        return character
+
+    def _value(self):
+        """
+        Decodes the next JSON value.
+
+        :returns: decoded value
+        """
+
+        self._peek()
+        chunk_size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # the value is probably incomplete, read more data
+                # (bigger chunks each time to limit the decoding attempts)
+                if not self._read(chunk_size):
+                    raise
+                chunk_size *= 2
+                continue
+            if end == len(self._buffer) and self._read():
+                # a number at the end of the buffer may be truncated
+                continue
+            self._pos = end
+            return value
+
+    def _members(self):
+        """
+        Iterates over the members of an object
+        (the opening brace must have been consumed).
+
+        :returns: iterator of member keys, the values must be consumed by the caller
+        """
+
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid object key in {}".format(self._path))
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def _elements(self):
+        """
+        Iterates over the elements of an array
+        (the opening bracket must have been consumed).
+
+        :returns: iterator of decoded elements
+        """
+
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def __iter__(self):
+
+        with open(self._path, "rb") as f:
+            self._file = f
+            self._text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self._buffer = ""
+            self._pos = 0
+            self._eof = False
+            self._read_size = 0
+            self._size = os.fstat(f.fileno()).st_size
+            self._expect("{")
+            for key in self._members():
+                if key in self._expand and self._peek() == "{":
+                    self._pos += 1
+                    for member in self._members():
+                        if self._peek() == "[":
+                            self._pos += 1
+                            for element in self._elements():
+                                yield (key, member), element
+                        else:
+                            yield (key, member), self._value()
+                else:
+                    yield (key, ), self._value()
+            if self._peek():
+                raise ValueError("Extra data after the JSON object in {}".format(self._path))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2014 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+SVG renderers shared by all the items using the same symbol.
+"""
+
+from ..qt import QtCore, QtGui, QtSvg
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class SvgRendererCache(object):
+    """
+    Parses each symbol once: the items with the same symbol
+    share its renderer, which is forgotten once no item uses it.
+
+    The symbols can also be rasterized, once per size, for
+    items drawn as pixmaps (e.g. when the view is zoomed out).
+    """
+
+    def __init__(self):
+
+        # symbol path -> [QSvgRenderer instance, number of users]
+        self._renderers = {}
+        # (symbol path, width, height) -> QPixmap instance
+        self._pixmaps = {}
+
+    def acquire(self, path):
+        """
+        Returns the renderer of a symbol, parsed if needed.
+        Each call must be matched by a call to release().
+
+        :param path: path to the symbol (file or resource)
+
+        :returns: QSvgRenderer instance (check it is valid)
+        """
+
+        entry = self._renderers.get(path)
+        if entry is None:
+            renderer = QtSvg.QSvgRenderer(path)
+            if not renderer.isValid():
+                log.warning("could not load symbol {}".format(path))
+            entry = self._renderers[path] = [renderer, 0]
+        entry[1] += 1
+        return entry[0]
+
+    def release(self, path):
+        """
+        Releases the renderer of a symbol returned by acquire().
+
+        :param path: path to the symbol (file or resource)
+        """
+
+        entry = self._renderers.get(path)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            # the renderer is deleted once the last item referencing it is
+            del self._renderers[path]
+            for key in [key for key in self._pixmaps if key[0] == path]:
+                del self._pixmaps[key]
+
+    def references(self, path):
+        """
+        Returns the number of users of a symbol.
+
+        :param path: path to the symbol (file or resource)
+
+        :returns: integer
+        """
+
+        entry = self._renderers.get(path)
+        return entry[1] if entry else 0
+
+    def pixmap(self, path, size):
+        """
+        Returns a symbol rasterized at a given size,
+        the symbol must have been acquired.
+
+        :param path: path to the symbol (file or resource)
+        :param size: QSize instance
+
+        :returns: QPixmap instance or None if the symbol is not acquired
+        """
+
+        key = (path, size.width(), size.height())
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            entry = self._renderers.get(path)
+            if entry is None or size.isEmpty():
+                return None
+            pixmap = QtGui.QPixmap(size)
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            entry[0].render(painter)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of SvgRendererCache.
+
+        :returns: instance of SvgRendererCache
+        """
+
+        if not hasattr(SvgRendererCache, "_instance"):
+            SvgRendererCache._instance = SvgRendererCache()
+        return SvgRendererCache._instance
@@ -51,12 +51,14 @@ class WaitForConnectionThread(QtCore.QThread):
         self._is_running = True
         connection_success = False
         begin = time.time()
+        delay = 0.05
 
-        # try to connect for 30 seconds
+        # try to connect for 30 seconds, waiting twice as long after each attempt
         while (time.time() - begin < 30.0):
             if not self._is_running:
                 return
-            time.sleep(0.01)
+            time.sleep(delay)
+            delay = min(1.0, delay * 2)
             sock = None
             try:
                 sock = socket.create_connection((self._host, self._port), timeout=10)
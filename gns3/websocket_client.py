@@ -20,18 +20,59 @@ Non-blocking Websocket client with JSON-RPC support to connect to GNS3 servers.
 Based on the ws4py websocket client.
 """
 
+import os
 import json
+import time
+import errno
+import select
 import socket
+import ipaddress
+import itertools
+import threading
+import zlib
 import urllib.request
 
 from .version import __version__
 from . import jsonrpc
+from . import transport
+from .request_manager import RequestManager
 from ws4py.client import WebSocketBaseClient
-from .qt import QtCore
+from ws4py.exc import HandshakeError
+from ws4py.messaging import PingControlMessage
+from .qt import QtCore, QtNetwork
 
 import logging
 log = logging.getLogger(__name__)
 
+# seconds to wait for a server to accept a connection
+CONNECTION_TIMEOUT = 10
+
+# connect_ex() codes for a connection in progress (10035 is WSAEWOULDBLOCK)
+CONNECTION_IN_PROGRESS = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, 10035)
+
+# seconds a checked server version is trusted without asking again
+VERSION_CACHE_TTL = 600
+
+# connection loss reason when the server has closed the connection
+CLOSED_BY_SERVER = "connection closed by the server"
+
+
+class WebSocketClientSignals(QtCore.QObject):
+    """
+    Signals emitted by a WebSocket client (which is not a QObject).
+    """
+
+    # connection results, the error signal gives the socket error
+    # number (0 for other errors) and the error message.
+    connected_signal = QtCore.Signal()
+    connection_error_signal = QtCore.Signal(int, str)
+
+    # the connection has been lost (not closed on purpose), with the reason
+    disconnected_signal = QtCore.Signal(str)
+
+    # a pong has been received, with its payload
+    pong_signal = QtCore.Signal(bytes)
+
 
 class WebSocketClient(WebSocketBaseClient):
     """
@@ -41,6 +82,13 @@ class WebSocketClient(WebSocketBaseClient):
     """
 
     _instance_count = 1
+    _network_manager = None
+
+    # notification handlers by method prefix (e.g. "dynamips")
+    _notification_handlers = {}
+
+    # checked versions by "host:port": (version, time)
+    _server_versions = {}
 
     def __init__(self, url, protocols=None, extensions=None, heartbeat_freq=None,
                  ssl_options=None, headers=None):
@@ -52,20 +100,37 @@ class WebSocketClient(WebSocketBaseClient):
                                      ssl_options,
                                      headers)
 
-        self.callbacks = {}
+        self._offered_protocols = protocols
+        self._binary_transport = False
+        self._binary = False
+        self._requests = RequestManager(self._sendRequest)
+        # JSON-RPC request IDs only need to be unique for this connection
+        self._request_ids = itertools.count(1)
         self._connected = False
         self._local = False
         self._version = ""
-        self._fd_notifier = None
+        self._reader = None
+        self._write_lock = threading.Lock()
+        self._batch_requests = False
+        self._batch_depth = 0
+        self._pending_requests = []
+
+        # asynchronous connection state
+        self._signals = WebSocketClientSignals()
+        self._connecting = False
+        self._queued_messages = []
+        self._connect_notifier = None
+        self._handshake_notifier = None
+        self._handshake_response = b""
+        self._version_reply = None
+        self._connection_timer = QtCore.QTimer(self._signals)
+        self._connection_timer.setSingleShot(True)
+        self._connection_timer.timeout.connect(self._connectionTimeoutSlot)
 
         # create an unique ID
         self._id = WebSocketClient._instance_count
         WebSocketClient._instance_count += 1
 
-        # set a default timeout of 10 seconds
-        # for connecting to a server
-        socket.setdefaulttimeout(10)
-
     def id(self):
         """
         Returns this WebSocket identifier.
@@ -84,6 +149,18 @@ class WebSocketClient(WebSocketBaseClient):
 
         return self._version
 
+    @classmethod
+    def registerNotificationHandler(cls, prefix, handler):
+        """
+        Registers the handler of the notifications whose method
+        starts with a prefix followed by a dot.
+
+        :param prefix: method prefix (e.g. "vpcs")
+        :param handler: callable taking the method, the params and the server
+        """
+
+        cls._notification_handlers[prefix] = handler
+
     @classmethod
     def reset(cls):
         """
@@ -92,6 +169,15 @@ class WebSocketClient(WebSocketBaseClient):
 
         cls._instance_count = 1
 
+    def signals(self):
+        """
+        Returns the object emitting the signals of this client.
+
+        :returns: WebSocketClientSignals instance
+        """
+
+        return self._signals
+
     def setLocal(self, value):
         """
         Sets either this is a connection to a local server or not.
@@ -110,6 +196,63 @@ class WebSocketClient(WebSocketBaseClient):
 
         return self._local
 
+    def setBatchRequests(self, value):
+        """
+        Sets either the requests sent during the same event loop
+        iteration are grouped in one JSON-RPC batch or not.
+
+        :param value: boolean
+        """
+
+        self._batch_requests = value
+
+    def setBinaryTransport(self, value):
+        """
+        Sets either the binary transport is offered to the server
+        on the next connections (JSON text is used if the server
+        does not select it).
+
+        :param value: boolean
+        """
+
+        self._binary_transport = value
+
+    def binaryTransport(self):
+        """
+        Returns either the binary transport is used on this connection.
+
+        :returns: boolean
+        """
+
+        return self._binary
+
+    def batchRequests(self):
+        """
+        Returns either the requests are sent in JSON-RPC batches or not.
+
+        :returns: boolean
+        """
+
+        return self._batch_requests
+
+    def beginBatch(self):
+        """
+        Starts grouping the messages in one JSON-RPC batch
+        until endBatch() is called. Calls can be nested.
+        """
+
+        self._batch_depth += 1
+
+    def endBatch(self):
+        """
+        Sends the messages grouped since beginBatch().
+        """
+
+        if self._batch_depth:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._sendBatch()
+
     def opened(self):
         """
         Called when the connection with the server is successful.
@@ -118,12 +261,16 @@ class WebSocketClient(WebSocketBaseClient):
         log.info("connected to {}:{}".format(self.host, self.port))
         self._connected = True
 
+        # send the requests kept since the connection was lost
+        self._requests.reconnected()
+
     def connect(self):
         """
         Connects to the server.
         """
 
         try:
+            self.sock.settimeout(CONNECTION_TIMEOUT)
             WebSocketBaseClient.connect(self)
         except OSError:
             raise
@@ -131,22 +278,321 @@ class WebSocketClient(WebSocketBaseClient):
             log.error("could to connect {}: {}".format(self.url, e))
             raise OSError("Websocket exception {}: {}".format(type(e), e))
 
+        version = self._cachedVersion()
+        if version:
+            self._version = version
+            return
+
         # once connected, get the GNS3 server version (over classic HTTP)
         url = "http://{host}:{port}/version".format(host=self.host, port=self.port)
-        content = urllib.request.urlopen(url).read()
+        content = urllib.request.urlopen(url, timeout=CONNECTION_TIMEOUT).read()
+        self._setVersion(content)
+
+        error = self._checkVersion()
+        if error:
+            self.close_connection()
+            raise OSError(error)
+        self._server_versions[self._versionKey()] = (self._version, time.time())
+
+    def _versionKey(self):
+        """
+        Returns the key of this server in the version cache.
+
+        :returns: "host:port" string
+        """
+
+        return "{host}:{port}".format(host=self.host, port=self.port)
+
+    def _cachedVersion(self):
+        """
+        Returns the version checked during a previous connection to the
+        same server, to reconnect (e.g. after a network drop) without
+        asking it again.
+
+        :returns: version (string) or None
+        """
+
+        cached = self._server_versions.get(self._versionKey())
+        if cached is None:
+            return None
+        version, checked = cached
+        if time.time() - checked > VERSION_CACHE_TTL:
+            return None
+        return version
+
+    def forgetVersion(self):
+        """
+        Forgets the cached version of this server, it is asked
+        again on the next connection (e.g. the server process
+        has been restarted or is not compatible).
+        """
+
+        if self._server_versions.pop(self._versionKey(), None):
+            log.debug("cached version of server {}:{} forgotten".format(self.host, self.port))
+
+    def _setVersion(self, content):
+        """
+        Sets the server version from the reply to a /version request.
+
+        :param content: reply content (bytes)
+        """
+
         try:
             json_data = json.loads(content.decode("utf-8"))
-            self._version = json_data.get("version")
+            self._version = json_data.get("version") or ""
         except ValueError as e:
             log.error("could not get the server version: {}".format(e))
 
+    def _checkVersion(self):
+        """
+        Checks the server version is the same as the GUI version.
+
+        :returns: error message or None
+        """
+
         #FIXME: temporary version check
         if self._version != __version__:
+            self.forgetVersion()
             if not self._version:
-                raise OSError("Could not determine the server version")
+                return "Could not determine the server version"
+            return "GUI version {} differs with the server version: {}".format(__version__, self._version)
+        return None
+
+    def isConnecting(self):
+        """
+        Returns either a connection to the server is in progress.
+
+        :returns: boolean
+        """
+
+        return self._connecting
+
+    def connectAsync(self):
+        """
+        Connects to the server without blocking: the socket connection,
+        the WebSocket handshake and the version check are driven by the Qt
+        event loop. The result is reported by the connected_signal or
+        connection_error_signal signals. Messages sent in the meantime
+        are queued until the connection is established.
+        """
+
+        if self._connected or self._connecting:
+            return
+
+        log.info("connecting to {}:{}".format(self.host, self.port))
+        self._connecting = True
+        self._handshake_response = b""
+        self._binary = False
+        protocols = list(self._offered_protocols or [])
+        if self._binary_transport:
+            protocols.append(transport.BINARY_PROTOCOL)
+
+        # a socket cannot be reused after a connection attempt
+        WebSocketBaseClient.__init__(self,
+                                     self.url,
+                                     protocols or None,
+                                     self.extensions,
+                                     self.heartbeat_freq,
+                                     self.ssl_options,
+                                     self.extra_headers)
+
+        try:
+            self._checkLocalAddress()
+            self.sock.setblocking(False)
+            error = self.sock.connect_ex(self.bind_addr)
+        except OSError as e:
+            self._connectionFailed(e.errno or 0, str(e))
+            return
+
+        if error not in CONNECTION_IN_PROGRESS:
+            self._connectionFailed(error, os.strerror(error))
+            return
+
+        self._connection_timer.start(CONNECTION_TIMEOUT * 1000)
+        self._connect_notifier = QtCore.QSocketNotifier(self.sock.fileno(), QtCore.QSocketNotifier.Write, self._signals)
+        self._connect_notifier.activated.connect(self._socketConnectedSlot)
+
+    def _socketConnectedSlot(self, fd):
+        """
+        Slot called when the socket connection has completed (or failed).
+        Sends the WebSocket handshake request.
+
+        :param fd: socket file descriptor
+        """
+
+        self._connect_notifier.setEnabled(False)
+        self._connect_notifier = None
+        error = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            self._connectionFailed(error, os.strerror(error))
+            return
+
+        try:
+            # the following writes may block but not longer than the timeout
+            self.sock.settimeout(CONNECTION_TIMEOUT)
+            self._write(self.handshake_request)
+        except OSError as e:
+            self._connectionFailed(e.errno or 0, str(e))
+            return
+
+        self._handshake_notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read, self._signals)
+        self._handshake_notifier.activated.connect(self._handshakeDataSlot)
+
+    def _handshakeDataSlot(self, fd):
+        """
+        Slot called when the WebSocket handshake response is being received.
+        Requests the server version once the handshake is done.
+
+        :param fd: socket file descriptor
+        """
+
+        try:
+            data = self.sock.recv(4096)
+        except OSError as e:
+            self._connectionFailed(e.errno or 0, str(e))
+            return
+
+        if not data:
+            self._connectionFailed(0, "Invalid WebSocket handshake response")
+            return
+
+        self._handshake_response += data
+        if b"\r\n\r\n" not in self._handshake_response:
+            # wait for the end of the headers
+            return
+
+        self._handshake_notifier.setEnabled(False)
+        self._handshake_notifier = None
+        headers, _, body = self._handshake_response.partition(b"\r\n\r\n")
+        response_line, _, headers = headers.partition(b"\r\n")
+        try:
+            self.process_response_line(response_line)
+            self.protocols, self.extensions = self.process_handshake_header(headers)
+        except HandshakeError as e:
+            # not the server which version has been checked
+            self.forgetVersion()
+            self._connectionFailed(0, "WebSocket handshake error: {}".format(e))
+            return
+
+        # servers which do not know the binary transport do not select it
+        self._binary = transport.BINARY_PROTOCOL in self._selectedProtocols(headers)
+
+        # data received right after the handshake
+        self._handshake_response = body
+
+        version = self._cachedVersion()
+        if version:
+            # already checked during a previous connection
+            self._version = version
+            self._connectionEstablished()
+            return
+
+        # get the GNS3 server version (over classic HTTP)
+        if not WebSocketClient._network_manager:
+            WebSocketClient._network_manager = QtNetwork.QNetworkAccessManager()
+        url = QtCore.QUrl("http://{host}:{port}/version".format(host=self.host, port=self.port))
+        self._version_reply = WebSocketClient._network_manager.get(QtNetwork.QNetworkRequest(url))
+        self._version_reply.finished.connect(self._versionReceivedSlot)
+
+    @staticmethod
+    def _selectedProtocols(headers):
+        """
+        Returns the subprotocols selected by the server.
+
+        :param headers: handshake response headers (bytes)
+
+        :returns: list of subprotocols
+        """
+
+        protocols = []
+        for header_line in headers.split(b"\r\n"):
+            header, _, value = header_line.partition(b":")
+            if header.strip().lower() == b"sec-websocket-protocol":
+                protocols.extend(protocol.strip() for protocol in value.decode("ascii", "replace").split(","))
+        return protocols
+
+    def _versionReceivedSlot(self):
+        """
+        Slot called when the server version has been received.
+        Completes the connection if it is the expected version.
+        """
+
+        reply = self._version_reply
+        self._version_reply = None
+        reply.deleteLater()
+        if reply.error() != QtNetwork.QNetworkReply.NoError:
+            self._connectionFailed(0, "Could not get the server version: {}".format(reply.errorString()))
+            return
+
+        self._setVersion(bytes(reply.readAll()))
+        error = self._checkVersion()
+        if error:
+            self._connectionFailed(0, error)
+            return
+
+        self._server_versions[self._versionKey()] = (self._version, time.time())
+        self._connectionEstablished()
+
+    def _connectionEstablished(self):
+        """
+        Completes an asynchronous connection.
+        """
+
+        self._connection_timer.stop()
+        self._connecting = False
+        data = self._handshake_response
+        self._handshake_response = b""
+        self.handshake_ok(data)
+
+        # send the messages queued while connecting
+        messages = self._queued_messages
+        self._queued_messages = []
+        for message in messages:
+            if self._batch_requests:
+                self._queueMessage(message)
             else:
-                raise OSError("GUI version {} differs with the server version: {}".format(__version__, self._version))
-            self.close_connection()
+                self._write_message(message)
+
+        self._signals.connected_signal.emit()
+
+    def _connectionTimeoutSlot(self):
+        """
+        Slot called when the server did not accept the connection in time.
+        """
+
+        if self._connecting:
+            self._connectionFailed(errno.ETIMEDOUT, "Connection timed out")
+
+    def _connectionFailed(self, error_number, message):
+        """
+        Aborts a connection attempt.
+
+        :param error_number: socket error number (0 for other errors)
+        :param message: error message
+        """
+
+        log.warning("could not connect to {}:{}: {}".format(self.host, self.port, message))
+        self._connecting = False
+        self._connection_timer.stop()
+        for notifier in (self._connect_notifier, self._handshake_notifier):
+            if notifier:
+                notifier.setEnabled(False)
+        self._connect_notifier = None
+        self._handshake_notifier = None
+        if self._version_reply:
+            self._version_reply.finished.disconnect(self._versionReceivedSlot)
+            self._version_reply.abort()
+            self._version_reply = None
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+        # the queued requests will never be answered
+        self._queued_messages = []
+        self._requests.failOutstanding("Could not connect to server {}:{}: {}".format(self.host, self.port, message))
+
+        self._signals.connection_error_signal.emit(error_number, message)
 
     def reconnect(self):
         """
@@ -161,13 +607,29 @@ class WebSocketClient(WebSocketBaseClient):
                                      self.ssl_options,
                                      self.extra_headers)
 
-        if self._local:
-            # check the local host address is still valid
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.bind((self.host, 0))
-
+        self._checkLocalAddress()
         self.connect()
 
+    def _checkLocalAddress(self):
+        """
+        Checks the address of a local server is still assigned to this host
+        (e.g. the interface is down), loopback addresses always are.
+
+        :raises OSError: if the address cannot be used
+        """
+
+        if not self._local:
+            return
+        try:
+            if ipaddress.ip_address(self.host).is_loopback:
+                return
+        except ValueError:
+            # a host name
+            if self.host == "localhost":
+                return
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((self.host, 0))
+
     def connected(self):
         """
         Returns if the client is connected.
@@ -177,17 +639,33 @@ class WebSocketClient(WebSocketBaseClient):
 
         return self._connected
 
-    def handshake_ok(self):
+    def handshake_ok(self, data=b""):
         """
-        Called when the connection has been established with the server and
-        monitors the connection using the QSocketNotifier.
+        Called when the connection has been established with the server,
+        starts the thread reading the messages from the server.
+
+        :param data: data received with the handshake response
         """
 
-        fd = self.connection.fileno()
-        # we are interested in all data received.
-        self._fd_notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read)
-        self._fd_notifier.activated.connect(self.data_received)
+        self._reader = WebSocketReaderThread(self)
+        self._reader.reply_signal.connect(self._replyReceivedSlot, QtCore.Qt.QueuedConnection)
+        self._reader.connection_lost_signal.connect(self.connectionLost, QtCore.Qt.QueuedConnection)
         self.opened()
+        if data:
+            # processed before the reader thread starts using the stream
+            self.process(data)
+        self._reader.start()
+
+    def _write(self, data):
+        """
+        Writes data to the socket, the reader thread
+        writes too (e.g. pong answers to pings).
+
+        :param data: bytes to write
+        """
+
+        with self._write_lock:
+            WebSocketBaseClient._write(self, data)
 
     def closed(self, code, reason):
         """
@@ -202,43 +680,66 @@ class WebSocketClient(WebSocketBaseClient):
 
     def received_message(self, message):
         """
-        Called when a new message has been received from the server.
+        Called by the reader thread when a new message has been received
+        from the server. The message is decoded in the reader thread and
+        processed in the GUI thread.
 
         :param message: message instance
         """
 
-        # TODO: WSAEWOULDBLOCK on Windows
-        if not message.is_text:
-            log.warning("received data is not text")
-            return
+        if message.is_binary:
+            try:
+                reply = transport.decode(message.data)
+            except (ValueError, zlib.error) as e:
+                log.warning("received binary data is not valid: {}".format(e))
+                return
+        else:
+            try:
+                reply = json.loads(message.data.decode("utf-8"))
+            except:
+                log.warning("received data is not valid JSON")
+                return
+
+        self._reader.reply_signal.emit(reply)
+
+    def _replyReceivedSlot(self, reply):
+        """
+        Slot called in the GUI thread with a decoded message.
 
-        try:
-            reply = json.loads(message.data.decode("utf-8"))
-        except:
-            log.warning("received data is not valid JSON")
-            return
+        :param reply: JSON-RPC message or batch
+        """
+
+        if isinstance(reply, list):
+            # This is a JSON-RPC batch reply
+            for batch_reply in reply:
+                self._processReply(batch_reply)
+        else:
+            self._processReply(reply)
+
+    def _processReply(self, reply):
+        """
+        Processes a JSON-RPC result, error or notification
+        received from the server.
+
+        :param reply: JSON-RPC message (dictionary)
+        """
 
         if "result" in reply:
         # This is a JSON-RPC result
             request_id = reply.get("id")
             result = reply.get("result")
-            if request_id in self.callbacks:
-                self.callbacks[request_id](result)
-                if request_id in self.callbacks:  #FIXME: strange bug with cloud device setup callback, the request is received twice, bug in Qt?
-                    del self.callbacks[request_id]
-                else:
-                    log.warning("JSON-RPC reply received twice: {}".format(reply))
-            else:
-                log.warning("unknown JSON-RPC request ID received {}".format(request_id))
+            callback = self._requests.complete(request_id)
+            if callback:
+                callback(result)
 
         elif "error" in reply:
             # This is a JSON-RPC error
             error_message = reply["error"].get("message")
             error_code = reply["error"].get("code")
             request_id = reply.get("id")
-            if request_id in self.callbacks:
-                self.callbacks[request_id](reply["error"], True)
-                del self.callbacks[request_id]
+            callback = self._requests.complete(request_id) if request_id is not None else None
+            if callback:
+                callback(reply["error"], True)
             else:
                 log.warning("received JSON-RPC error {}: {} for request ID {}".format(error_code,
                                                                                       error_message,
@@ -249,29 +750,44 @@ class WebSocketClient(WebSocketBaseClient):
             params = reply.get("params")
 
             # let the responsible module know about the notification
-            from .modules import MODULES
-            for module in MODULES:
-                if method.startswith(module.__name__.lower()):
-                    instance = module.instance()
-                    instance.notification(method, params)
-                    break
+            handler = self._notification_handlers.get(method.split(".", 1)[0])
+            if handler:
+                handler(method, params, self)
+            else:
+                log.warning("no handler for notification {}".format(method))
 
-    def send_message(self, destination, params, callback):
+    def send_message(self, destination, params, callback, timeout=None):
         """
         Sends a message to the server.
 
         :param destination: server destination method
         :param params: params to send (dictionary)
         :param callback: callback method to call when the server replies.
+        :param timeout: seconds to wait for the reply (default depends on the method)
+
+        :returns: request ID (to cancel the request) or None if not sent
         """
 
-        if not self.connected():
+        if not self.connected() and not self._connecting:
             log.warning("connection with server {}:{} is down".format(self.host, self.port))
-            return
+            return None
 
-        request = jsonrpc.JSONRPCRequest(destination, params)
-        self.callbacks[request.id] = callback
-        self.send(str(request))
+        request = jsonrpc.JSONRPCRequest(destination, params, next(self._request_ids))
+        return self._requests.add(request, callback, timeout)
+
+    def _sendRequest(self, request):
+        """
+        Sends a request released by the request manager.
+
+        :param request: JSONRPCRequest instance
+        """
+
+        if self._connecting:
+            self._queued_messages.append(request)
+        elif self._batch_requests or self._batch_depth:
+            self._queueMessage(request)
+        else:
+            self._write_message(request)
 
     def send_notification(self, destination, params=None):
         """
@@ -281,37 +797,175 @@ class WebSocketClient(WebSocketBaseClient):
         :param params: params to send (dictionary)
         """
 
-        if not self.connected():
+        if not self.connected() and not self._connecting:
             log.warning("connection with server {}:{} is down".format(self.host, self.port))
             return
 
         request = jsonrpc.JSONRPCNotification(destination, params)
-        self.send(str(request))
+        if self._connecting:
+            self._queued_messages.append(request)
+        elif self._batch_requests or self._batch_depth:
+            # notifications are queued too in order to keep the message order
+            self._queueMessage(request)
+        else:
+            self._write_message(request)
+
+    def _queueMessage(self, message):
+        """
+        Queues a message to be sent in the next JSON-RPC batch.
+
+        :param message: JSONRPCRequest or JSONRPCNotification instance
+        """
+
+        if not self._pending_requests:
+            # the batch is sent once control returns to the event loop
+            QtCore.QTimer.singleShot(0, self._sendBatch)
+        self._pending_requests.append(message)
+
+    def _sendBatch(self):
+        """
+        Sends all the queued messages in one JSON-RPC batch.
+        """
+
+        messages = self._pending_requests
+        self._pending_requests = []
+        if not messages:
+            return
+
+        if not self.connected():
+            log.warning("connection with server {}:{} is down, {} queued messages dropped".format(self.host,
+                                                                                                  self.port,
+                                                                                                  len(messages)))
+            return
+
+        if len(messages) == 1:
+            self._write_message(messages[0])
+        else:
+            log.debug("sending a batch of {} messages to server {}:{}".format(len(messages), self.host, self.port))
+            self._write_message(messages)
+
+    def _write_message(self, message):
+        """
+        Sends a message to the server, in binary if negotiated with the
+        server or as JSON text. A write error means the connection is lost.
+
+        :param message: JSON-RPC message or list of messages (batch)
+        """
+
+        if isinstance(message, list):
+            payload = [batch_message() for batch_message in message]
+        else:
+            payload = message()
+
+        try:
+            if self._binary:
+                self.send(transport.encode(payload), binary=True)
+            else:
+                self.send(json.dumps(payload))
+        except (OSError, RuntimeError) as e:
+            self.connectionLost(str(e))
+
+    def ping(self, data):
+        """
+        Sends a WebSocket ping, the server answers with a pong
+        reported by the pong_signal signal.
+
+        :param data: ping payload (bytes)
+        """
+
+        if self.connected():
+            try:
+                self.send(PingControlMessage(data))
+            except (OSError, RuntimeError) as e:
+                self.connectionLost(str(e))
+
+    def ponged(self, pong):
+        """
+        Called when a pong has been received from the server.
+
+        :param pong: PongControlMessage instance
+        """
+
+        self._signals.pong_signal.emit(bytes(pong.data))
+
+    def requestManager(self):
+        """
+        Returns the manager of the requests sent to the server.
+
+        :returns: RequestManager instance
+        """
+
+        return self._requests
+
+    def setRequestTimeout(self, timeout):
+        """
+        Sets the time to wait for a reply for most requests.
+
+        :param timeout: seconds (0 means no timeout)
+        """
+
+        self._requests.setDefaultTimeout(timeout)
+
+    def cancelRequest(self, request_id):
+        """
+        Cancels a request, its callback will not be called.
+
+        :param request_id: request ID returned by send_message()
+        """
+
+        self._requests.cancel(request_id)
+
+    def cancelRequests(self, receiver):
+        """
+        Cancels the requests whose callback is a method of an object.
+
+        :param receiver: object
+        """
+
+        self._requests.cancelFor(receiver)
+
+    def expireRequests(self):
+        """
+        Sends again or fails the requests without a reply in time.
+
+        :returns: number of failed requests
+        """
+
+        return self._requests.expire()
+
+    def connectionLost(self, reason):
+        """
+        Closes a connection which is no longer working, the requests
+        waiting for a reply are failed or kept to be sent again.
+
+        :param reason: reason of the connection loss
+        """
+
+        if not self._connected:
+            return
+
+        log.warning("lost connection with server {}:{}: {}".format(self.host, self.port, reason))
+        self.close_connection()
+        self._requests.connectionLost("Connection with server {}:{} lost: {}".format(self.host, self.port, reason))
+        self._signals.disconnected_signal.emit(reason)
 
     def close_connection(self):
         """
-        Closes the connection to the server and remove the monitoring by
-        the QSocketNotifier.
+        Closes the connection to the server and stops the reader thread.
         """
 
         self._connected = False
         self._version = ""
+        self._pending_requests.clear()
+        reader = self._reader
+        self._reader = None
+        if reader:
+            reader.stop()
         WebSocketBaseClient.close_connection(self)
-        if self._fd_notifier:
-            self._fd_notifier.setEnabled(False)
-            self._fd_notifier = None
+        if reader:
+            reader.wait()
         log.info("connection closed with server {}:{}".format(self.host, self.port))
 
-    def data_received(self, fd):
-        """
-        Callback called when data is received from the server.
-        """
-
-        # read the data, if successful received_message() is called by once()
-        if self.once() == False:
-            log.warning("lost connection with server {}:{}".format(self.host, self.port))
-            self.close_connection()
-
     def dump(self):
         """
         Returns a representation of this server.
@@ -323,3 +977,52 @@ class WebSocketClient(WebSocketBaseClient):
                 "host": self.host,
                 "port": self.port,
                 "local": self._local}
+
+
+class WebSocketReaderThread(QtCore.QThread):
+    """
+    Thread reading the WebSocket frames sent by a server and decoding
+    the JSON-RPC messages, so large replies do not block the GUI.
+
+    :param client: WebSocketClient instance
+    """
+
+    # decoded JSON-RPC message or batch
+    reply_signal = QtCore.Signal(object)
+    connection_lost_signal = QtCore.Signal(str)
+
+    def __init__(self, client):
+
+        QtCore.QThread.__init__(self)
+        self._client = client
+        self._sock = client.sock
+        self._running = True
+
+    def stop(self):
+        """
+        Stops reading, the socket must be closed by the caller.
+        """
+
+        self._running = False
+
+    def run(self):
+        """
+        Thread starting point.
+        """
+
+        reason = CLOSED_BY_SERVER
+        try:
+            while self._running:
+                # wait with a timeout to check if the thread must stop
+                readable, _, _ = select.select([self._sock], [], [], 0.5)
+                if not self._running:
+                    return
+                # once() calls received_message() when a message is complete
+                if readable and not self._client.once():
+                    break
+        except (OSError, ValueError, AttributeError) as e:
+            # most likely the socket has been closed in the meantime
+            reason = str(e)
+
+        if self._running:
+            self.connection_lost_signal.emit(reason)
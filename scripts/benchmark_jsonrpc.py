@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""
+Micro-benchmark of the JSON-RPC message encoding: compares the current
+encoding with the previous one (introspection with dir() and an UUID
+for each request).
+"""
+
+import os
+import sys
+import json
+import uuid
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gns3 import jsonrpc
+
+
+class LegacyRequest(object):
+    """
+    Request as built by the previous implementation.
+    """
+
+    def __init__(self, method, params=None):
+        self.id = str(uuid.uuid4())
+        self.method = method
+        if params:
+            self.params = params
+
+    def __str__(self):
+        return json.dumps(self, cls=LegacyEncoder)
+
+
+class LegacyEncoder(json.JSONEncoder):
+    """
+    Encoder of the previous implementation.
+    """
+
+    def default(self, obj):
+        message = {"jsonrpc": 2.0}
+        for field in dir(obj):
+            if not field.startswith('_'):
+                message[field] = getattr(obj, field)
+        return message
+
+
+PARAMS = {"id": 42, "port": 1, "port_id": 2, "nio": "NIO_UDP", "lport": 20000, "rhost": "127.0.0.1", "rport": 20001}
+BATCH_SIZE = 100
+
+
+def legacy():
+    return str(LegacyRequest("dynamips.vm.add_nio", PARAMS))
+
+
+def current():
+    return str(jsonrpc.JSONRPCRequest("dynamips.vm.add_nio", PARAMS))
+
+
+def legacy_batch():
+    messages = [LegacyRequest("vpcs.start", {"id": i}) for i in range(BATCH_SIZE)]
+    return json.dumps(messages, cls=LegacyEncoder)
+
+
+def current_batch():
+    messages = [jsonrpc.JSONRPCRequest("vpcs.start", {"id": i}) for i in range(BATCH_SIZE)]
+    return json.dumps([message() for message in messages])
+
+
+def main():
+    number = 20000
+    for name, old, new, count in (("single request", legacy, current, number),
+                                  ("batch of {} requests".format(BATCH_SIZE), legacy_batch, current_batch, number // BATCH_SIZE)):
+        old_time = min(timeit.repeat(old, number=count, repeat=3))
+        new_time = min(timeit.repeat(new, number=count, repeat=3))
+        print("{}: previous {:.2f} us, current {:.2f} us per call ({:.1f}x faster)".format(name,
+                                                                                          old_time / count * 1e6,
+                                                                                          new_time / count * 1e6,
+                                                                                          old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
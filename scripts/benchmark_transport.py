@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark of the binary transport against JSON text on the messages of
+a config-heavy project (exporting and importing router configs), with
+the estimated transfer time over WAN links to a remote server.
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gns3 import transport
+from gns3.jsonrpc import JSONRPCRequest, JSONRPCResponse
+
+ROUTERS = 100
+
+# link speeds in bits per second
+WAN_LINKS = [("2 Mbit/s", 2e6), ("10 Mbit/s", 10e6), ("100 Mbit/s", 100e6)]
+
+
+def router_config(index):
+    """
+    Returns an IOS startup-config of a few KB.
+    """
+
+    lines = ["!", "hostname R{}".format(index), "!", "ip cef", "no ip domain lookup", "!"]
+    for interface in range(random.randint(8, 24)):
+        lines.extend(["interface FastEthernet{}/{}".format(interface // 2, interface % 2),
+                      " description link to R{}".format(random.randint(1, ROUTERS)),
+                      " ip address 10.{}.{}.1 255.255.255.0".format(index % 256, interface),
+                      " ip ospf cost {}".format(random.randint(1, 100)),
+                      " duplex auto",
+                      " speed auto",
+                      "!"])
+    lines.extend(["router ospf 1", " network 10.0.0.0 0.255.255.255 area 0", "!"])
+    for acl in range(random.randint(10, 40)):
+        lines.append("access-list {} permit tcp any host 192.168.{}.{} eq {}".format(100 + acl % 50,
+                                                                                  random.randint(0, 255),
+                                                                                  random.randint(1, 254),
+                                                                                  random.choice([22, 23, 80, 443])))
+    lines.extend(["!", "line con 0", " exec-timeout 0 0", " privilege level 15", " logging synchronous", "!", "end"])
+    return "\n".join(lines).encode("ascii")
+
+
+def messages():
+    """
+    Returns the messages of a config export and import for all the routers.
+    """
+
+    random.seed(1)
+    result = []
+    for index in range(1, ROUTERS + 1):
+        startup_config = base64.b64encode(router_config(index)).decode("ascii")
+        private_config = base64.b64encode(os.urandom(256)).decode("ascii")
+        result.append(JSONRPCRequest("dynamips.vm.export_config", {"id": index}, index)())
+        result.append(JSONRPCResponse({"id": index,
+                                       "startup_config_base64": startup_config,
+                                       "private_config_base64": private_config}, index)())
+        result.append(JSONRPCRequest("dynamips.vm.update", {"id": index,
+                                                            "startup_config_base64": startup_config,
+                                                            "private_config_base64": private_config}, ROUTERS + index)())
+    return result
+
+
+def main():
+    all_messages = messages()
+
+    start = time.perf_counter()
+    text_frames = [json.dumps(message).encode("utf-8") for message in all_messages]
+    text_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    binary_frames = [transport.encode(message) for message in all_messages]
+    binary_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for frame in binary_frames:
+        transport.decode(frame)
+    decode_time = time.perf_counter() - start
+
+    text_size = sum(len(frame) for frame in text_frames)
+    binary_size = sum(len(frame) for frame in binary_frames)
+    print("{} messages for {} routers".format(len(all_messages), ROUTERS))
+    print("JSON text: {:.1f} KB, encoded in {:.1f} ms".format(text_size / 1024, text_time * 1000))
+    print("binary: {:.1f} KB ({:.0f}% of JSON text), encoded in {:.1f} ms, decoded in {:.1f} ms".format(binary_size / 1024,
+                                                                                                      binary_size * 100 / text_size,
+                                                                                                      binary_time * 1000,
+                                                                                                      decode_time * 1000))
+    for name, speed in WAN_LINKS:
+        print("{}: JSON text {:.2f} s, binary {:.2f} s".format(name, text_size * 8 / speed, binary_size * 8 / speed))
+
+
+if __name__ == '__main__':
+    main()
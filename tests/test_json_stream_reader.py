@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from gns3.utils.json_stream_reader import JSONStreamReader
+
+
+class TestJSONStreamReader(TestCase):
+    def setUp(self):
+        self.topology = {
+            "name": "test",
+            "resources_type": "local",
+            "type": "topology",
+            "version": "1.0",
+            "topology": {
+                "links": [{"id": i, "description": "link é{}".format(i)} for i in range(50)],
+                "nodes": [{"id": i, "x": -12.5, "properties": {"ram": 256, "slots": [None, "NM-1FE-TX"]}} for i in range(100)],
+                "servers": [{"id": 1, "local": True}],
+                "notes": [],
+            }
+        }
+        fd, self.path = tempfile.mkstemp(suffix=".gns3")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.topology, f, sort_keys=True, indent=4)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_sections(self):
+        # a small chunk size forces values to span several reads
+        reader = JSONStreamReader(self.path, chunk_size=7)
+        sections = list(reader)
+        self.assertIn((("version", ), "1.0"), sections)
+        self.assertIn((("resources_type", ), "local"), sections)
+        nodes = [value for path, value in sections if path == ("topology", "nodes")]
+        links = [value for path, value in sections if path == ("topology", "links")]
+        self.assertEqual(nodes, self.topology["topology"]["nodes"])
+        self.assertEqual(links, self.topology["topology"]["links"])
+        self.assertNotIn(("topology", "notes"), [path for path, value in sections])
+        self.assertEqual(reader.progress(), 100)
+
+    def test_invalid_file(self):
+        with open(self.path, "w") as f:
+            f.write('{"topology": {"nodes": [{"id": 1}, ')
+        with self.assertRaises(ValueError):
+            list(JSONStreamReader(self.path))
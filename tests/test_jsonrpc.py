@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import json
+from unittest import TestCase
+
+from gns3 import jsonrpc
+
+
+class TestJSONRPC(TestCase):
+    def test_request(self):
+        request = jsonrpc.JSONRPCRequest("vpcs.start", {"id": 1}, request_id=42)
+        self.assertEqual(json.loads(str(request)), {"jsonrpc": 2.0, "id": 42, "method": "vpcs.start", "params": {"id": 1}})
+        # empty params are not sent
+        request = jsonrpc.JSONRPCRequest("qemu.qemu_list", {})
+        self.assertNotIn("params", request())
+
+    def test_request_ids(self):
+        first = jsonrpc.JSONRPCRequest("vpcs.start")
+        second = jsonrpc.JSONRPCRequest("vpcs.start")
+        self.assertNotEqual(first.id, second.id)
+
+    def test_batch(self):
+        messages = [jsonrpc.JSONRPCRequest("vpcs.start", request_id=1), jsonrpc.JSONRPCNotification("vpcs.echo")]
+        self.assertEqual(json.loads(json.dumps(messages, cls=jsonrpc.JSONRPCEncoder)),
+                         [{"jsonrpc": 2.0, "id": 1, "method": "vpcs.start"}, {"jsonrpc": 2.0, "method": "vpcs.echo"}])
+
+    def test_error(self):
+        error = jsonrpc.JSONRPCCustomError(-3200, "error", request_id=1)
+        self.assertEqual(error(), {"jsonrpc": 2.0, "id": 1, "error": {"code": -3200, "message": "error"}})
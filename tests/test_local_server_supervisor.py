@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import unittest
+
+from gns3.local_server_supervisor import processStats, physicalMemory
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "requires /proc")
+class TestLocalServerSupervisor(unittest.TestCase):
+    def test_process_stats(self):
+        rss, cpu_time = processStats(os.getpid())
+        self.assertGreater(rss, 1024 * 1024)
+        self.assertGreaterEqual(cpu_time, 0)
+        self.assertLess(rss, physicalMemory())
+
+    def test_unknown_process(self):
+        # process IDs are lower than 2^22 on Linux
+        self.assertIsNone(processStats(2 ** 22 + 1))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from gns3.modules.module import Module
+
+
+class FakeSignal(object):
+    def connect(self, slot):
+        pass
+
+    def disconnect(self, slot):
+        pass
+
+
+class FakeNode(object):
+    def __init__(self, server, node_id, name):
+        self._server = server
+        self._id = node_id
+        self._name = name
+        self.created_signal = FakeSignal()
+        self.updated_signal = FakeSignal()
+        self.deleted_signal = FakeSignal()
+
+    def server(self):
+        return self._server
+
+    def id(self):
+        return self._id
+
+    def name(self):
+        return self._name
+
+
+class TestModule(TestCase):
+    def setUp(self):
+        self.module = Module()
+
+    def test_find_node_per_server(self):
+        server1 = object()
+        server2 = object()
+        node1 = FakeNode(server1, 1, "PC1")
+        node2 = FakeNode(server2, 1, "PC2")
+        self.module._indexNode(node1)
+        self.module._indexNode(node2)
+
+        self.assertIs(self.module._findNode(server1, "id", 1), node1)
+        self.assertIs(self.module._findNode(server2, "id", 1), node2)
+        self.assertIs(self.module._findNode(server2, "name", "PC2"), node2)
+        self.assertIsNone(self.module._findNode(server1, "name", "PC2"))
+
+    def test_node_renamed_and_deleted(self):
+        server = object()
+        node = FakeNode(server, 1, "PC1")
+        self.module._indexNode(node)
+        self.module.sender = lambda: node
+
+        node._name = "PC2"
+        self.module._nodeIndexSlot()
+        self.assertIsNone(self.module._findNode(server, "name", "PC1"))
+        self.assertIs(self.module._findNode(server, "name", "PC2"), node)
+
+        self.module._nodeUnindexSlot()
+        self.assertIsNone(self.module._findNode(server, "id", 1))
+        self.assertIsNone(self.module._findNode(server, "name", "PC2"))
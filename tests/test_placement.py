@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gns3.placement import placeNodes, crossLinks, detectCommunities
+
+
+def clique(nodes):
+    return [(a, b) for index, a in enumerate(nodes) for b in nodes[index + 1:]]
+
+
+class TestPlacement(unittest.TestCase):
+    def test_two_clusters(self):
+        # two clusters of 4 nodes joined by one link, interleaved on two servers
+        links = clique([1, 2, 3, 4]) + clique([5, 6, 7, 8]) + [(4, 5)]
+        interleaved = {node: "A" if node % 2 else "B" for node in range(1, 9)}
+        self.assertEqual(crossLinks(interleaved, links), 9)
+        self.assertEqual(detectCommunities(list(range(1, 9)), links), [[1, 2, 3, 4], [5, 6, 7, 8]])
+
+        assignment = placeNodes(list(range(1, 9)), links, {"A": 1, "B": 1})
+        self.assertEqual(crossLinks(assignment, links), 1)
+        self.assertEqual(sorted(assignment.values()).count("A"), 4)
+
+        # already well placed: nothing moves
+        current = {node: "B" if node < 5 else "A" for node in range(1, 9)}
+        self.assertEqual(placeNodes(list(range(1, 9)), links, {"A": 1, "B": 1}, current=current), current)
+
+    def test_capacity_and_weights(self):
+        # a chain of 12 nodes on servers with a 2:1 weight
+        links = [(node, node + 1) for node in range(11)]
+        assignment = placeNodes(list(range(12)), links, {"A": 2, "B": 1}, balance=1.0)
+        self.assertEqual(list(assignment.values()).count("A"), 8)
+        self.assertEqual(crossLinks(assignment, links), 1)
+
+    def test_fixed_nodes(self):
+        # node 1 cannot be moved, its neighbors follow it
+        links = clique([1, 2, 3]) + [(4, 5)]
+        assignment = placeNodes([2, 3, 4, 5], links, {"A": 1, "B": 1}, fixed={1: "B"})
+        self.assertNotIn(1, assignment)
+        self.assertEqual(assignment[2], "B")
+        self.assertEqual(assignment[3], "B")
+        assignment[1] = "B"
+        self.assertEqual(crossLinks(assignment, links), 0)
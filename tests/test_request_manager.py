@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from gns3.jsonrpc import JSONRPCRequest
+from gns3.request_manager import RequestManager, REQUEST_TIMEOUT_CODE, CONNECTION_ERROR_CODE
+
+
+class TestRequestManager(TestCase):
+    def setUp(self):
+        self.sent = []
+        self.replies = []
+        self.manager = RequestManager(self.sent.append, default_timeout=60, max_outstanding=2)
+
+    def callback(self, result, error=False):
+        self.replies.append((result, error))
+
+    def test_max_outstanding(self):
+        request_ids = [self.manager.add(JSONRPCRequest("vpcs.create"), self.callback) for _ in range(3)]
+        self.assertEqual(len(self.sent), 2)
+        self.manager.complete(request_ids[0])(None)
+        self.assertEqual(len(self.sent), 3)
+
+    def test_retry_idempotent(self):
+        self.manager.add(JSONRPCRequest("vpcs.start"), self.callback, timeout=1)
+        self.manager.add(JSONRPCRequest("vpcs.create"), self.callback, timeout=1)
+        for pending in self.manager.pendingRequests():
+            pending.sent -= 2
+        self.assertEqual(self.manager.expire(), 1)
+        self.assertEqual(self.replies[0][0]["code"], REQUEST_TIMEOUT_CODE)
+        # the idempotent request has been sent again
+        self.assertEqual([request.method for request in self.sent], ["vpcs.start", "vpcs.create", "vpcs.start"])
+
+    def test_connection_lost(self):
+        self.manager.add(JSONRPCRequest("vpcs.stop"), self.callback)
+        self.manager.add(JSONRPCRequest("vpcs.delete"), self.callback)
+        self.manager.connectionLost("lost")
+        self.assertEqual(self.replies, [({"code": CONNECTION_ERROR_CODE, "message": "lost"}, True)])
+        self.manager.reconnected()
+        self.assertEqual(self.sent[-1].method, "vpcs.stop")
+
+    def test_cancel(self):
+        request_id = self.manager.add(JSONRPCRequest("vpcs.start"), self.callback)
+        self.assertTrue(self.manager.cancel(request_id))
+        self.assertIsNone(self.manager.complete(request_id))
+        self.assertEqual(self.replies, [])
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from gns3.utils.svg_renderer_cache import SvgRendererCache
+
+
+SYMBOL = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect width="10" height="10"/></svg>'
+
+
+class TestSvgRendererCache(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".svg")
+        with os.fdopen(fd, "w") as f:
+            f.write(SYMBOL)
+        self.cache = SvgRendererCache()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_shared_renderer(self):
+        renderer = self.cache.acquire(self.path)
+        self.assertTrue(renderer.isValid())
+        self.assertIs(self.cache.acquire(self.path), renderer)
+        self.assertEqual(self.cache.references(self.path), 2)
+
+        self.cache.release(self.path)
+        self.cache.release(self.path)
+        self.assertEqual(self.cache.references(self.path), 0)
+        self.assertIsNot(self.cache.acquire(self.path), renderer)
+
+    def test_invalid_symbol(self):
+        self.assertFalse(self.cache.acquire(self.path + ".missing").isValid())
@@ -5,6 +5,90 @@ from gns3.topology import Topology
 from gns3.main_window import MainWindow
 
 
+class FakeItem(object):
+    def __init__(self, item_id):
+        self._id = item_id
+
+    def id(self):
+        return self._id
+
+
+class FakeSignal(object):
+    def connect(self, slot):
+        pass
+
+    def disconnect(self, slot):
+        pass
+
+
+class FakeServer(FakeItem):
+    host = "127.0.0.1"
+    port = 8000
+
+    def dump(self):
+        return {"id": self._id, "local": True}
+
+
+class FakePort(FakeItem):
+    def __init__(self, port_id):
+        FakeItem.__init__(self, port_id)
+        self.link_id = None
+
+    def dump(self):
+        return {"id": self._id, "link_id": self.link_id}
+
+
+class FakeNode(FakeItem):
+    server_instance = FakeServer(1)
+
+    def __init__(self, node_id, ports=()):
+        FakeItem.__init__(self, node_id)
+        self.created_signal = FakeSignal()
+        self.updated_signal = FakeSignal()
+        self.ports = list(ports)
+
+    def name(self):
+        return "node{}".format(self._id)
+
+    def server(self):
+        return self.server_instance
+
+    def settings(self):
+        return {}
+
+    def saveConfig(self):
+        pass
+
+    def dump(self):
+        return {"id": self._id, "ports": [port.dump() for port in self.ports]}
+
+
+class FakeLink(FakeItem):
+    def __init__(self, link_id, source_node, source_port, destination_node, destination_port):
+        FakeItem.__init__(self, link_id)
+        self._ends = (source_node, source_port, destination_node, destination_port)
+        self.add_link_signal = FakeSignal()
+
+    def dump(self):
+        return {"id": self._id,
+                "source_node_id": self._ends[0].id(),
+                "source_port_id": self._ends[1].id(),
+                "destination_node_id": self._ends[2].id(),
+                "destination_port_id": self._ends[3].id()}
+
+    def sourceNode(self):
+        return self._ends[0]
+
+    def sourcePort(self):
+        return self._ends[1]
+
+    def destinationNode(self):
+        return self._ends[2]
+
+    def destinationPort(self):
+        return self._ends[3]
+
+
 class TestTopology(TestCase):
     def setUp(self):
         self.t = Topology.instance()
@@ -51,6 +135,62 @@ class TestTopology(TestCase):
         self.assertEqual(len(self.t._initialized_nodes), 0)
         self.assertEqual(self.t._resources_type, 'local')
 
+    def test_indexes(self):
+        node1 = FakeNode(1)
+        node2 = FakeNode(2)
+        link = FakeLink(1, node1, FakeItem(10), node2, FakeItem(20))
+        self.t.addNode(node1)
+        self.t.addNode(node2)
+        self.t.addLink(link)
+        self.assertIs(self.t.getNode(2), node2)
+        self.assertIs(self.t.getLink(1), link)
+        self.assertEqual(self.t.getNodeLinks(1), [link])
+        self.assertIs(self.t.getPortLink(20), link)
+
+        self.t.removeLink(link)
+        self.assertIsNone(self.t.getLink(1))
+        self.assertEqual(self.t.getNodeLinks(2), [])
+        self.assertIsNone(self.t.getPortLink(10))
+        self.t.removeNode(node1)
+        self.assertIsNone(self.t.getNode(1))
+        self.assertEqual(self.t.nodes(), [node2])
+
+        self.t.reset()
+        self.assertIsNone(self.t.getNode(2))
+
+    def test_link_ports_dumped(self):
+        MainWindow.instance()._project_settings.update({'project_type': 'local'})
+        source_port = FakePort(10)
+        destination_port = FakePort(20)
+        node1 = FakeNode(1, [source_port])
+        node2 = FakeNode(2, [destination_port])
+        self.t.addNode(node1)
+        self.t.addNode(node2)
+        self.assertEqual(self.t.dump()["topology"]["nodes"][0]["ports"], [{"id": 10, "link_id": None}])
+
+        # the link is attached to the ports of the nodes
+        link = FakeLink(1, node1, source_port, node2, destination_port)
+        source_port.link_id = destination_port.link_id = 1
+        self.t.addLink(link)
+        nodes = self.t.dump()["topology"]["nodes"]
+        self.assertEqual(nodes[0]["ports"], [{"id": 10, "link_id": 1}])
+        self.assertEqual(nodes[1]["ports"], [{"id": 20, "link_id": 1}])
+
+        source_port.link_id = destination_port.link_id = None
+        self.t.removeLink(link)
+        nodes = self.t.dump()["topology"]["nodes"]
+        self.assertEqual(nodes[0]["ports"], [{"id": 10, "link_id": None}])
+        self.assertEqual(nodes[1]["ports"], [{"id": 20, "link_id": None}])
+
+    def test_placeable(self):
+        self.assertTrue(Topology._isPlaceable("VPCSDevice", {}))
+        self.assertTrue(Topology._isPlaceable("EthernetSwitch", {"ports": []}))
+        # the files or VMs may not exist on the other servers
+        self.assertFalse(Topology._isPlaceable("VPCSDevice", {"script_file": "startup.vpc"}))
+        self.assertFalse(Topology._isPlaceable("C7200", {"image": "c7200.image"}))
+        self.assertFalse(Topology._isPlaceable("VirtualBoxVM", {"vmname": "VM1"}))
+        self.assertFalse(Topology._isPlaceable("Cloud", {}))
+
     def test_instances(self):
         self.assertEqual(self.t._instances, [])
         self.t.addInstance(name="My instance", id="xyz", size_id="123", image_id="1234567890")
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from gns3.topology_journal import TopologyJournal
+
+
+class TestTopologyJournal(TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".gns3")
+        os.close(fd)
+        self.sections = [
+            (("version", ), "1.0"),
+            (("topology", "links"), {"id": 1, "source_node_id": 1, "source_port_id": 1, "destination_node_id": 2, "destination_port_id": 2}),
+            (("topology", "nodes"), {"id": 1, "server_id": 1, "x": 0, "y": 0}),
+            (("topology", "nodes"), {"id": 2, "server_id": 1, "x": 0, "y": 0}),
+            (("topology", "notes"), {"text": "old note", "x": 0, "y": 0}),
+            (("topology", "servers"), {"id": 1, "local": True}),
+        ]
+
+    def tearDown(self):
+        for path in (self.path, TopologyJournal.journalPath(self.path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_replay(self):
+        server = {"id": 5, "host": "127.0.0.1", "port": 8000, "local": True}
+        records = [
+            {"operation": "remove", "section": "links", "data": {"id": 3, "source_port_id": 2, "destination_port_id": 1}},
+            {"operation": "remove", "section": "nodes", "data": {"id": 2}},
+            {"operation": "update", "section": "nodes", "data": {"id": 1, "server_id": 5, "x": 10, "y": 20}, "server": server},
+            {"operation": "update", "section": "nodes", "data": {"id": 3, "server_id": 5, "x": 30, "y": 40}, "server": server},
+            {"operation": "update", "section": "links", "data": {"id": 1, "source_node_id": 1, "source_port_id": 1, "destination_node_id": 3, "destination_port_id": 3}},
+            {"operation": "update", "section": "notes", "data": {"text": "old note", "x": 5, "y": 5}, "drawing_id": 0},
+            {"operation": "update", "section": "notes", "data": {"text": "new note", "x": 0, "y": 0}, "drawing_id": "a1"},
+        ]
+
+        sections = list(TopologyJournal.replay(self.sections, records))
+        nodes = {value["id"]: value for path, value in sections if path == ("topology", "nodes")}
+        links = [value for path, value in sections if path == ("topology", "links")]
+        notes = [value for path, value in sections if path == ("topology", "notes")]
+        servers = [value for path, value in sections if path == ("topology", "servers")]
+
+        self.assertEqual(sorted(nodes.keys()), [1, 3])
+        self.assertEqual(nodes[1]["x"], 10)
+        self.assertEqual(len(links), 1)
+        self.assertEqual(links[0]["destination_node_id"], 3)
+        # notes from the topology file are identified by their position
+        self.assertEqual(notes, [{"text": "old note", "x": 5, "y": 5, "drawing_id": 0},
+                                 {"text": "new note", "x": 0, "y": 0, "drawing_id": "a1"}])
+        # nodes from the journal reference a server from the journal
+        self.assertIn(nodes[3]["server_id"], [server["id"] for server in servers])
+
+    def test_read_truncated(self):
+        records = [{"operation": "remove", "section": "nodes", "data": {"id": i}} for i in range(3)]
+        with open(TopologyJournal.journalPath(self.path), "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            # record interrupted by a crash
+            f.write('{"operation": "upd')
+        self.assertEqual(TopologyJournal.read(self.path), records)
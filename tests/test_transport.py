@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import base64
+from unittest import TestCase
+
+from gns3 import transport
+
+
+class TestTransport(TestCase):
+    def test_round_trip(self):
+        config = base64.b64encode(b"hostname R1\n" * 100).decode("ascii")
+        message = {"jsonrpc": 2.0, "id": 1, "method": "dynamips.vm.update",
+                   "params": {"id": 1, "name": "R1", "startup_config_base64": config}}
+        data = transport.encode(message)
+        self.assertTrue(data[0] & transport.COMPRESSED)
+        self.assertLess(len(data), len(config))
+        self.assertEqual(transport.decode(data), message)
+
+    def test_small_batch(self):
+        batch = [{"jsonrpc": 2.0, "id": 1, "method": "vpcs.start", "params": {"id": 1}},
+                 {"jsonrpc": 2.0, "method": "vpcs.echo", "params": {"invalid_base64": "not base64!"}}]
+        data = transport.encode(batch)
+        self.assertFalse(data[0] & transport.COMPRESSED)
+        self.assertEqual(transport.decode(data), batch)
+
+    def test_truncated(self):
+        data = transport.encode({"jsonrpc": 2.0, "id": 1, "result": True})
+        with self.assertRaises(ValueError):
+            transport.decode(data[:-1])
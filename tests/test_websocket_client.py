@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+from unittest import TestCase, mock
+
+from gns3.version import __version__
+from gns3.websocket_client import WebSocketClient, WebSocketBaseClient, VERSION_CACHE_TTL
+
+
+class TestWebSocketClient(TestCase):
+    def setUp(self):
+        WebSocketClient._server_versions.clear()
+        self.client = WebSocketClient("ws://127.0.0.1:8000/")
+
+    def tearDown(self):
+        WebSocketClient._server_versions.clear()
+
+    def _connect(self):
+        with mock.patch.object(WebSocketBaseClient, "connect"):
+            self.client.connect()
+        with mock.patch.object(WebSocketBaseClient, "close_connection"):
+            # the connection drops
+            self.client.close_connection()
+
+    @mock.patch("urllib.request.urlopen")
+    def test_reconnect_cached_version(self, urlopen):
+        urlopen.return_value.read.return_value = json.dumps({"version": __version__}).encode("utf-8")
+
+        self._connect()
+        self._connect()
+        # the version is not asked again when reconnecting
+        self.assertEqual(urlopen.call_count, 1)
+
+        with mock.patch("time.time", return_value=time.time() + VERSION_CACHE_TTL + 1):
+            self._connect()
+        self.assertEqual(urlopen.call_count, 2)
+
+        # e.g. the local server process has been restarted
+        self.client.forgetVersion()
+        self._connect()
+        self.assertEqual(urlopen.call_count, 3)
+
+    @mock.patch("urllib.request.urlopen")
+    def test_other_version(self, urlopen):
+        urlopen.return_value.read.return_value = json.dumps({"version": "0.1"}).encode("utf-8")
+
+        with mock.patch.object(WebSocketBaseClient, "connect"), mock.patch.object(WebSocketBaseClient, "close_connection"):
+            with self.assertRaises(OSError):
+                self.client.connect()
+        self.assertEqual(WebSocketClient._server_versions, {})